@@ -1,6 +1,5 @@
 from typing import Optional
 from sfai.platform.registry import PLATFORM_REGISTRY
-from sfai.context.manager import ContextManager
 from sfai.core.response_models import BaseResponse
 from sfai.app.utils.helpers import determine_platform_and_environment
 
@@ -16,8 +15,6 @@ def delete(
         environment: Environment to delete from (uses active environment if None)
     """
     try:
-        ctx_mgr = ContextManager()
-
         # determine the platform and environment to use
         response = determine_platform_and_environment(platform, environment)
         if not response.success:
@@ -25,17 +22,7 @@ def delete(
 
         active_platform = response.platform
         active_environment = response.environment
-
-        # Read the updated context for the determined platform and environment
-        context = ctx_mgr.read_context(active_platform, active_environment)
-        if not context:
-            return BaseResponse(
-                success=False,
-                error=(
-                    f"Failed to read context for platform '{active_platform}' "
-                    f"and environment '{active_environment}'"
-                ),
-            )
+        context = response.context
         provider = PLATFORM_REGISTRY.get(active_platform)
 
         if not provider:
@@ -1,9 +1,18 @@
-from typing import Any, Optional
-from sfai.context.manager import ContextManager
+import time
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from sfai.platform.registry import PLATFORM_REGISTRY
+from sfai.platform.build import build_fingerprint
+from sfai.platform.streaming import prefixed_output
+from sfai.platform.switch import environment_error
+from sfai.context.manager import ContextManager
 from sfai.core.response_models import BaseResponse
 from sfai.app.utils.helpers import determine_platform_and_environment
 
+# number of targets deployed at the same time
+DEFAULT_DEPLOY_CONCURRENCY = 4
+
 
 def deploy(
     path: str = ".",
@@ -24,8 +33,6 @@ def deploy(
         Dictionary with deployment status and details
     """
     try:
-        ctx_mgr = ContextManager()
-
         # determine the platform and environment to use
         response = determine_platform_and_environment(platform, environment)
         if not response.success:
@@ -33,17 +40,7 @@ def deploy(
 
         active_platform = response.platform
         active_environment = response.environment
-
-        # Read the updated context for the determined platform and environment
-        context = ctx_mgr.read_context(active_platform, active_environment)
-        if not context:
-            return BaseResponse(
-                success=False,
-                error=(
-                    f"Failed to read context for platform '{active_platform}' "
-                    f"and environment '{active_environment}'"
-                ),
-            )
+        context = response.context
 
         provider = PLATFORM_REGISTRY.get(active_platform)
         if not provider:
@@ -59,3 +56,164 @@ def deploy(
         )
     except ValueError as e:
         return BaseResponse(success=False, error=f"Context validation error: {e!s}")
+
+
+def parse_targets(targets: List[str]) -> List[Tuple[str, str]]:
+    """
+    Parse deploy targets written as platform[:environment].
+
+    Args:
+        targets: Targets, comma-separated values are split
+
+    Returns:
+        The (platform, environment) pairs in order without duplicates, the
+        environment is "default" when omitted
+
+    Raises:
+        ValueError: If a target has no platform or environment name
+    """
+    pairs: List[Tuple[str, str]] = []
+    for value in targets:
+        for target in value.split(","):
+            target = target.strip()
+            if not target:
+                continue
+            platform, _, environment = target.partition(":")
+            platform, environment = platform.strip(), environment.strip()
+            if not platform or (":" in target and not environment):
+                raise ValueError(
+                    f"Invalid target '{target}', use platform or platform:environment"
+                )
+            pair = (platform, environment or "default")
+            if pair not in pairs:
+                pairs.append(pair)
+    return pairs
+
+
+def deploy_targets(
+    targets: List[Tuple[str, str]],
+    path: str = ".",
+    concurrency: int = DEFAULT_DEPLOY_CONCURRENCY,
+    on_done: Optional[Callable[[Dict[str, Any]], None]] = None,
+    **kwargs: Any,
+) -> BaseResponse:
+    """
+    Deploy an application to several platform environments at once.
+
+    The build fingerprint of the app is computed once and shared by every
+    target, so providers reuse the image they already built for it. Each
+    target deploys with its own copy of its environment context and never
+    becomes the active environment. While several targets run, each line
+    they print is prefixed with the target, e.g. "[heroku:prod] ".
+
+    Args:
+        targets: (platform, environment) pairs, see parse_targets
+        path: Path to the application directory
+        concurrency: Number of targets deployed at the same time
+        on_done: Called with the result of each target as it finishes
+        kwargs: Passed on to the deploy of each provider
+
+    Returns:
+        BaseResponse with results listing target, platform, environment,
+        success, public_url, error and elapsed per target, success is True
+        if every target was deployed
+    """
+    ctx_mgr = ContextManager()
+    try:
+        app_context = ctx_mgr.load_context()
+    except ValueError as e:
+        return BaseResponse(success=False, error=f"Context validation error: {e!s}")
+    if not app_context:
+        return BaseResponse(
+            success=False,
+            error="No app context found. Run `sfai init` to initialize an app.",
+        )
+
+    results: List[Dict[str, Any]] = []
+    jobs = []
+    for platform, environment in targets:
+        context = ctx_mgr.environment_context(app_context, platform, environment)
+        provider = PLATFORM_REGISTRY.get(platform) if context else None
+        if not context:
+            status = ctx_mgr.check_platform_environment(platform, environment)
+            error = environment_error(platform, environment, status)
+        elif not provider:
+            error = f"Unsupported provider: {platform}"
+        else:
+            jobs.append((platform, environment, provider, context))
+            continue
+        result = _target_result(platform, environment, error=error)
+        results.append(result)
+        if on_done:
+            on_done(result)
+
+    if jobs:
+        kwargs["fingerprint"] = kwargs.get("fingerprint") or build_fingerprint(path)
+        kwargs["activate"] = False
+        prefix = len(jobs) > 1
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            futures = [
+                pool.submit(_deploy_target, *job, path=path, prefix=prefix, **kwargs)
+                for job in jobs
+            ]
+            for future in as_completed(futures):
+                results.append(future.result())
+                if on_done:
+                    on_done(results[-1])
+
+    order = {target: index for index, target in enumerate(targets)}
+    results.sort(key=lambda result: order[(result["platform"], result["environment"])])
+    deployed = sum(1 for result in results if result["success"])
+    return BaseResponse(
+        success=deployed == len(results),
+        message=f"Deployed to {deployed} of {len(results)} targets",
+        app_name=app_context.app_name,
+        results=results,
+    )
+
+
+def _deploy_target(
+    platform: str,
+    environment: str,
+    provider: Any,
+    context: Dict[str, Any],
+    path: str,
+    prefix: bool = False,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    start = time.monotonic()
+    output = (
+        prefixed_output(f"[{platform}:{environment}] ") if prefix else nullcontext()
+    )
+    try:
+        with output:
+            response = provider.deploy(context=context, path=path, **kwargs)
+    except Exception as e:
+        response = BaseResponse(success=False, error=str(e))
+    return _target_result(
+        platform,
+        environment,
+        success=response.success,
+        public_url=getattr(response, "public_url", None),
+        error=response.error,
+        elapsed=round(time.monotonic() - start, 3),
+    )
+
+
+def _target_result(
+    platform: str,
+    environment: str,
+    success: bool = False,
+    public_url: Optional[str] = None,
+    error: Optional[str] = None,
+    elapsed: Optional[float] = None,
+) -> Dict[str, Any]:
+    return {
+        "target": f"{platform}:{environment}",
+        "platform": platform,
+        "environment": environment,
+        "success": success,
+        "public_url": public_url,
+        "error": error,
+        "elapsed": elapsed,
+    }
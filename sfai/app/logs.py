@@ -1,26 +1,33 @@
 from sfai.platform.registry import PLATFORM_REGISTRY
-from sfai.context.manager import ContextManager
 from sfai.core.response_models import BaseResponse
 from typing import Optional
 from sfai.app.utils.helpers import determine_platform_and_environment
 
 
 def logs(
-    platform: Optional[str] = None, environment: Optional[str] = None
+    platform: Optional[str] = None,
+    environment: Optional[str] = None,
+    follow: bool = False,
+    since: Optional[str] = None,
+    tail: Optional[int] = None,
 ) -> BaseResponse:
     """
     Show logs for the current app.
 
+    Lines are streamed as they are produced; with follow=True the call keeps
+    streaming new lines until interrupted with Ctrl+C.
+
     Args:
         platform: Platform to show logs for
         environment: Environment to show logs for (uses active environment if None)
+        follow: Keep streaming new log lines
+        since: Only show logs newer than a relative duration (e.g. 10m, 1h)
+        tail: Number of most recent lines to show (all lines if None)
 
     Returns:
         BaseResponse: Response object containing logs
     """
     try:
-        ctx_mgr = ContextManager()
-
         # Determine which platform and environment to use
         response = determine_platform_and_environment(platform, environment)
         if not response.success:
@@ -28,17 +35,7 @@ def logs(
 
         active_platform = response.platform
         active_environment = response.environment
-
-        # Read the updated context for the determined platform and environment
-        context = ctx_mgr.read_context(active_platform, active_environment)
-        if not context:
-            return BaseResponse(
-                success=False,
-                error=(
-                    f"Failed to read context for platform '{active_platform}' "
-                    f"and environment '{active_environment}'"
-                ),
-            )
+        context = response.context
 
         provider = PLATFORM_REGISTRY.get(active_platform)
 
@@ -47,7 +44,9 @@ def logs(
                 success=False, error=f"Unsupported provider: {active_platform}"
             )
 
-        logs_response = provider.logs(context=context)
+        logs_response = provider.logs(
+            context=context, follow=follow, since=since, tail=tail
+        )
 
         return logs_response.with_update(
             app_name=context.get("app_name"),
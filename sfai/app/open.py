@@ -1,4 +1,3 @@
-from sfai.context.manager import ContextManager
 from sfai.platform.registry import PLATFORM_REGISTRY
 from sfai.core.response_models import BaseResponse
 from typing import Optional
@@ -27,9 +26,6 @@ def open(
         A dictionary containing the result of the open operation
     """
     try:
-        # Load current context
-        ctx_mgr = ContextManager()
-
         # Determine the platform and environment to use
         response = determine_platform_and_environment(platform, environment)
         if not response.success:
@@ -38,17 +34,7 @@ def open(
         # Validate platform provider
         active_platform = response.platform
         active_environment = response.environment
-
-        # Read the updated context for the determined platform and environment
-        context = ctx_mgr.read_context(active_platform, active_environment)
-        if not context:
-            return BaseResponse(
-                success=False,
-                error=(
-                    f"Failed to read context for platform '{active_platform}' "
-                    f"and environment '{active_environment}'"
-                ),
-            )
+        context = response.context
 
         provider = PLATFORM_REGISTRY.get(active_platform)
         if not provider:
@@ -1,6 +1,6 @@
 from typing import Optional
 from sfai.context.manager import ContextManager
-from sfai.platform.switch import switch
+from sfai.platform.switch import environment_error
 from sfai.core.response_models import BaseResponse
 
 
@@ -10,45 +10,60 @@ def determine_platform_and_environment(
     """
     Determine the platform and environment to use, switching if necessary.
 
+    The context is loaded once; the active environment is only written back
+    when it actually changes.
+
     Args:
         platform: Desired platform (optional)
         environment: Desired environment (optional)
 
     Returns:
-        A BaseResponse object containing the active platform, active environment,
-        and indicating the success or failure of any switch operation.
+        A BaseResponse object containing the active platform, active environment
+        and the context of that environment, or the reason the switch failed.
     """
     ctx_mgr = ContextManager()
-    context = ctx_mgr.read_context()
-    if not context:
+    app_context = ctx_mgr.load_context()
+    if not app_context:
         return BaseResponse(
             success=False,
             error="No app context found. Run `sfai init` to initialize an app.",
         )
 
-    current_platform = context.get("active_platform")
-    current_environment = context.get("active_environment")
+    current_platform = app_context.active_platform
+    current_environment = app_context.active_environment
 
     if platform:
         if environment is None:
-            platform_context = ctx_mgr.read_context(platform)
-            if platform_context:
-                environment = platform_context.get("active_environment", "default")
+            # keep the active environment name if the platform has it
+            platform_environments = app_context.platform.get(platform) or {}
+            if current_environment in platform_environments:
+                environment = current_environment
             else:
                 environment = "default"
-
-        if platform != current_platform or environment != current_environment:
-            switch_result = switch(platform, environment)
-            if not switch_result.success:
-                return switch_result
-            context = ctx_mgr.read_context(platform, environment)
-    elif environment is not None and current_environment != environment:
-        switch_result = switch(current_platform, environment)
-        if not switch_result.success:
-            return switch_result
-        context = ctx_mgr.read_context(current_platform, environment)
     else:
-        environment = current_environment
+        platform = current_platform
+        if environment is None:
+            environment = current_environment
+
+    if platform != current_platform or environment != current_environment:
+        status = ctx_mgr.check_platform_environment(platform, environment)
+        if not status["exists"]:
+            return BaseResponse(
+                success=False,
+                error=environment_error(platform, environment, status),
+            )
+        ctx_mgr.set_active_environment(platform, environment)
+
+    context = ctx_mgr.environment_context(app_context, platform, environment)
+    if not context:
+        return BaseResponse(
+            success=False,
+            error=(
+                f"Failed to read context for platform '{platform}' "
+                f"and environment '{environment}'"
+            ),
+        )
 
-    active_platform = context.get("active_platform")
-    return BaseResponse(success=True, platform=active_platform, environment=environment)
+    return BaseResponse(
+        success=True, platform=platform, environment=environment, context=context
+    )
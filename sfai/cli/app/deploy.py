@@ -1,13 +1,20 @@
 import typer
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from rich.console import Console
+from rich.table import Table
 from sfai.constants import (
     ROCKET_EMOJI,
     CELEBRATE_EMOJI,
     ERROR_EMOJI,
     ERROR_COLOR,
+    SUCCESS_EMOJI,
+)
+from sfai.app.deploy import (
+    DEFAULT_DEPLOY_CONCURRENCY,
+    deploy,
+    deploy_targets,
+    parse_targets,
 )
-from sfai.app.deploy import deploy
 
 console = Console()
 
@@ -25,6 +32,23 @@ def deploy_cmd(
     path: str = typer.Option(
         ".", help="Path to the app folder (default: current directory)"
     ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Rebuild the image without cached layers"
+    ),
+    targets: Optional[List[str]] = typer.Option(
+        None,
+        "--targets",
+        help=(
+            "Deploy to several platform:environment targets at once, "
+            "comma-separated or repeated"
+        ),
+    ),
+    concurrency: int = typer.Option(
+        DEFAULT_DEPLOY_CONCURRENCY,
+        "--concurrency",
+        min=1,
+        help="Number of targets deployed at the same time with --targets",
+    ),
     # k8s options
     values_path: Optional[str] = typer.Option(None, help="Path to Helm values file"),
     set_values: Optional[str] = typer.Option(
@@ -44,6 +68,12 @@ def deploy_cmd(
             Environment to deploy to (defaults to "default")
         path: str
             Path to the app folder
+        no_cache: bool
+            Rebuild the image without cached layers
+        targets: Optional[List[str]]
+            platform:environment targets to deploy to instead of one platform
+        concurrency: int
+            Number of targets deployed at the same time
         values_path: Optional[str]
             Path to Helm values file
         set_values: Optional[str]
@@ -56,12 +86,26 @@ def deploy_cmd(
         None
     """
 
+    if targets:
+        _deploy_targets(
+            targets,
+            path=path,
+            concurrency=concurrency,
+            no_cache=no_cache,
+            values_path=values_path,
+            set_values=set_values,
+            commit_message=commit_message,
+            branch=branch,
+        )
+        return
+
     console.print(f"{ROCKET_EMOJI} Deploying application...")
 
     result = deploy(
         platform=platform,
         environment=environment,
         path=path,
+        no_cache=no_cache,
         values_path=values_path,
         set_values=set_values,
         commit_message=commit_message,
@@ -72,3 +116,46 @@ def deploy_cmd(
         console.print(f"{CELEBRATE_EMOJI} {result.message}")
     else:
         console.print(f"{ERROR_EMOJI} [{ERROR_COLOR}]{result.error}[/]")
+
+
+def _deploy_targets(targets: List[str], **kwargs: Any) -> None:
+    """Deploy to several targets, printing each one as it finishes."""
+    try:
+        pairs = parse_targets(targets)
+    except ValueError as e:
+        console.print(f"{ERROR_EMOJI} [{ERROR_COLOR}]{e}[/]")
+        raise typer.Exit(code=1) from None
+
+    console.print(
+        f"{ROCKET_EMOJI} Deploying application to "
+        f"{', '.join(f'{p}:{e}' for p, e in pairs)}..."
+    )
+
+    def _print_done(target: Dict[str, Any]) -> None:
+        if target["success"]:
+            console.print(f"{SUCCESS_EMOJI} {target['target']} deployed")
+        else:
+            console.print(
+                f"{ERROR_EMOJI} [{ERROR_COLOR}]{target['target']} failed: "
+                f"{target['error']}[/]"
+            )
+
+    result = deploy_targets(pairs, on_done=_print_done, **kwargs)
+    if not result.success and not getattr(result, "results", None):
+        console.print(f"{ERROR_EMOJI} [{ERROR_COLOR}]{result.error}[/]")
+        raise typer.Exit(code=1)
+
+    table = Table("Target", "Status", "URL", "Time (s)", "Error", title="Deploy")
+    for target in result.results:
+        table.add_row(
+            target["target"],
+            SUCCESS_EMOJI if target["success"] else ERROR_EMOJI,
+            target["public_url"] or "",
+            f"{target['elapsed']:.1f}" if target["elapsed"] is not None else "",
+            target["error"] or "",
+        )
+    console.print(table)
+    style = "bold green" if result.success else "bold red"
+    console.print(f"[{style}]{result.message}[/]")
+    if not result.success:
+        raise typer.Exit(code=1)
@@ -15,6 +15,15 @@ def logs_cmd(
     environment: Optional[str] = typer.Option(
         None, help="Environment to show logs from"
     ),
+    follow: bool = typer.Option(
+        False, "--follow", "-f", help="Keep streaming new log lines"
+    ),
+    since: Optional[str] = typer.Option(
+        None, help="Only show logs newer than a relative duration (e.g. 10m, 1h)"
+    ),
+    tail: Optional[int] = typer.Option(
+        None, help="Number of most recent lines to show"
+    ),
 ) -> None:
     """
     Show logs for the current app.
@@ -24,9 +33,21 @@ def logs_cmd(
             Platform to show logs from
         environment: str
             Environment to show logs from (defaults to "default")
+        follow: bool
+            Keep streaming new log lines until interrupted
+        since: Optional[str]
+            Only show logs newer than a relative duration
+        tail: Optional[int]
+            Number of most recent lines to show
     """
 
-    result = logs(platform=platform, environment=environment)
+    result = logs(
+        platform=platform,
+        environment=environment,
+        follow=follow,
+        since=since,
+        tail=tail,
+    )
     if not result.success:
         console.print(
             f"{ERROR_EMOJI} [{ERROR_COLOR}] unable to fetch logs: {result.error}[/]"
@@ -1,7 +1,8 @@
 import typer
 from typing import Optional, List
 from rich.console import Console
-from sfai.integrations.mulesoft.publish_cli import publish_cli
+from sfai.integrations.mulesoft.publish import DEFAULT_PUBLISH_CONCURRENCY
+from sfai.integrations.mulesoft.publish_cli import publish_all_cli, publish_cli
 
 app = typer.Typer(help="Publish assets and APIs to MuleSoft")
 console = Console()
@@ -27,6 +28,35 @@ def publish_cmd(
     skip_confirm: bool = typer.Option(
         False, "-y", "--yes", help="Skip confirmation of default values"
     ),
+    wait: bool = typer.Option(
+        False, "--wait", help="Wait until the gateway has applied the deployed API"
+    ),
+    profile_stages: bool = typer.Option(
+        False, "--profile-stages", help="Print how long each publish stage took"
+    ),
+    force_upload: bool = typer.Option(
+        False,
+        "--force-upload",
+        help="Upload a new Exchange version even if the spec is unchanged",
+    ),
+    spec_format: Optional[str] = typer.Option(
+        None,
+        "--spec-format",
+        help="Generate openapi.yaml (yaml) or openapi.json (json), defaults to "
+        "the format last published",
+    ),
+    all_apps: bool = typer.Option(
+        False, "--all", help="Publish every app in the global registry"
+    ),
+    apps: Optional[List[str]] = typer.Option(
+        None, "--apps", help="Registered apps to publish, repeat or comma-separate"
+    ),
+    concurrency: int = typer.Option(
+        DEFAULT_PUBLISH_CONCURRENCY,
+        "--concurrency",
+        min=1,
+        help="Number of apps published at the same time with --all/--apps",
+    ),
 ) -> None:
     if not service:
         console.print(
@@ -35,7 +65,17 @@ def publish_cmd(
         )
         return
 
-    if service == "mulesoft":
+    if service == "mulesoft" and (all_apps or apps):
+        publish_all_cli(
+            apps=None if all_apps else apps,
+            profile=profile,
+            concurrency=concurrency,
+            skip_confirm=skip_confirm,
+            wait=wait,
+            force_upload=force_upload,
+            spec_format=spec_format,
+        )
+    elif service == "mulesoft":
         publish_cli(
             profile=profile,
             name=name,
@@ -50,4 +90,8 @@ def publish_cmd(
             gateway_version=gateway_version,
             interactive=interactive,
             skip_confirm=skip_confirm,
+            wait=wait,
+            profile_stages=profile_stages,
+            force_upload=force_upload,
+            spec_format=spec_format,
         )
@@ -0,0 +1,76 @@
+import importlib
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, Type
+
+import click
+import typer
+from typer.core import TyperGroup
+
+
+class LazyTyperGroup(TyperGroup):
+    """
+    Typer group whose subcommands are imported only when they are resolved.
+
+    ``lazy_commands`` maps a command name to an ``"module:attribute"`` import
+    path and its short help. The attribute may be a ``typer.Typer`` app or a
+    plain command function; it is imported and converted to a click command
+    the first time the subcommand is looked up, so ``sfai --help`` and
+    unrelated commands never pay for its imports. Listing the group's help
+    uses the short help only.
+    """
+
+    lazy_commands: ClassVar[Dict[str, Tuple[str, str]]] = {}
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._listing_help = False
+
+    def list_commands(self, ctx: Any) -> List[str]:
+        names = list(self.lazy_commands)
+        names.extend(name for name in super().list_commands(ctx) if name not in names)
+        return names
+
+    def format_help(self, ctx: Any, formatter: Any) -> None:
+        self._listing_help = True
+        try:
+            super().format_help(ctx, formatter)
+        finally:
+            self._listing_help = False
+
+    def get_command(self, ctx: Any, cmd_name: str) -> Optional[Any]:
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            import_path, short_help = self.lazy_commands[cmd_name]
+            if self._listing_help:
+                # stands in for the command in the list, nothing is imported
+                return click.Command(cmd_name, help=short_help, short_help=short_help)
+            self.add_command(_load_command(cmd_name, import_path), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+def lazy_group(commands: Dict[str, Tuple[str, str]]) -> Type[LazyTyperGroup]:
+    """
+    Create a group class resolving the given subcommands on demand.
+
+    Args:
+        commands: Dict[str, Tuple[str, str]]
+            Command names mapped to ``"module:attribute"`` import paths and
+            the short help listed by ``--help``
+
+    Returns:
+        Type[LazyTyperGroup]
+            A group class to pass as ``cls`` to ``typer.Typer``
+    """
+    return type("LazyTyperGroup", (LazyTyperGroup,), {"lazy_commands": commands})
+
+
+def _load_command(name: str, import_path: str) -> Any:
+    module_name, attr = import_path.split(":", 1)
+    target = getattr(importlib.import_module(module_name), attr)
+    if isinstance(target, typer.Typer):
+        command = typer.main.get_group(target)
+    else:
+        # plain command function, wrap it so typer builds a single command
+        wrapper = typer.Typer(add_completion=False)
+        wrapper.command(name=name)(target)
+        command = typer.main.get_command(wrapper)
+    command.name = name
+    return command
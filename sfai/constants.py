@@ -4,6 +4,12 @@ CONTEXT_DIR = Path(".sfai")
 CONTEXT_FILE = CONTEXT_DIR / "context.json"
 
 GLOBAL_APPS_FILE = Path.home() / ".sfai/apps.json"
+GLOBAL_APPS_DB = Path.home() / ".sfai/apps.db"
+BUILD_CACHE_DIR = Path.home() / ".sfai/cache/buildx"
+MULESOFT_TOKEN_CACHE_DIR = Path.home() / ".sfai/cache/mulesoft/tokens"
+OPENAPI_CACHE_DIR = Path.home() / ".sfai/cache/openapi"
+# set while an app is imported only to extract its OpenAPI spec
+SPEC_EXTRACTION_ENV = "SFAI_SPEC_EXTRACTION"
 CHARTS_PATH = (
     Path(__file__).parent
     / "platform"
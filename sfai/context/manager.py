@@ -1,13 +1,33 @@
 from __future__ import annotations
 
+import copy
 import json
+import threading
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-from pydantic import ValidationError
+from contextlib import ExitStack, contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+from pydantic import BaseModel, ValidationError
 
-from sfai.constants import CONTEXT_FILE, CONTEXT_DIR, GLOBAL_APPS_FILE
+from sfai.constants import (
+    CONTEXT_FILE,
+    CONTEXT_DIR,
+    GLOBAL_APPS_DB,
+    GLOBAL_APPS_FILE,
+)
 from sfai.core.response_models import BaseResponse
 from sfai.constants import SUCCESS_EMOJI, ERROR_EMOJI
+from sfai.context.registry import AppRegistry
+from sfai.context.storage import atomic_write_text, file_lock
 from sfai.context.models import (
     ApplicationContext,
     GlobalContext,
@@ -15,21 +35,133 @@ from sfai.context.models import (
     PlatformContext,
 )
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Parsed and validated context models shared by every ContextManager in the
+# process, keyed by (absolute file path, model name). Each entry remembers the
+# (st_mtime_ns, st_size) of the file it was loaded from and is discarded as
+# soon as the file changes on disk.
+_MODEL_CACHE: Dict[Tuple[str, str], Tuple[Tuple[int, int], BaseModel]] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def clear_context_cache() -> None:
+    """Drop every cached context model."""
+    with _MODEL_CACHE_LOCK:
+        _MODEL_CACHE.clear()
+
+
+class _StagedFile:
+    """Pending changes to one context file inside a transaction."""
+
+    def __init__(self, file: Path, model: Type[BaseModel], base: Dict[str, Any]):
+        self.file = file
+        self.model = model
+        self.base = base
+        self.data = copy.deepcopy(base)
+        self.operations: List[Callable[[Dict[str, Any]], Any]] = []
+        self.models: Dict[str, BaseModel] = {}
+
+
+class _Transaction:
+    """
+    Context mutations staged in memory and written once on commit.
+
+    Mutations are recorded as operations and applied to an in-memory copy
+    of each file. On commit every touched file is locked, the operations
+    are replayed on the current on-disk data if another process changed it
+    in the meantime, and the result is validated and written atomically.
+    No lock is held while the transaction is open.
+    """
+
+    def __init__(self, manager: "ContextManager"):
+        self.manager = manager
+        self.files: Dict[str, _StagedFile] = {}
+
+    def staged(self, file: Path) -> Optional[_StagedFile]:
+        return self.files.get(str(file.resolve()))
+
+    def apply(
+        self,
+        file: Path,
+        model: Type[BaseModel],
+        operation: Callable[[Dict[str, Any]], Any],
+    ) -> Any:
+        staged = self.staged(file)
+        if staged is None:
+            staged = _StagedFile(file, model, self.manager._load_json(file))
+            self.files[str(file.resolve())] = staged
+
+        data = copy.deepcopy(staged.data)
+        result = operation(data)
+        if data != staged.data:
+            staged.data = data
+            staged.operations.append(operation)
+            staged.models.clear()
+        return result
+
+    def commit(self) -> None:
+        pending = {
+            path: staged for path, staged in self.files.items() if staged.operations
+        }
+        with ExitStack() as stack:
+            # lock in a stable order so concurrent commits cannot deadlock
+            for path in sorted(pending):
+                stack.enter_context(file_lock(pending[path].file))
+
+            # validate every file before writing any of them
+            payloads = []
+            for staged in pending.values():
+                data = self.manager._load_json(staged.file)
+                if data != staged.base:
+                    for operation in staged.operations:
+                        operation(data)
+                else:
+                    data = staged.data
+                payloads.append((staged.file, staged.model(**data).model_dump()))
+
+            for file, data in payloads:
+                self.manager._save_json(file, data)
+
+
+_TRANSACTIONS = threading.local()
+
+
+def _current_transaction() -> Optional[_Transaction]:
+    return getattr(_TRANSACTIONS, "current", None)
+
 
 class ContextManager:
-    def __init__(self):
+    def __init__(self, app_path: Optional[str] = None):
         """
         Initialize the ContextManager.
 
         Args:
-            None
+            app_path: Optional[str]
+                Directory of the app whose context is managed, the current
+                directory if None
 
         Returns:
             None
         """
-        self.context_file = CONTEXT_FILE
-        self.context_dir = CONTEXT_DIR
+        if app_path:
+            self.context_dir = Path(app_path) / CONTEXT_DIR
+            self.context_file = self.context_dir / CONTEXT_FILE.name
+        else:
+            self.context_file = CONTEXT_FILE
+            self.context_dir = CONTEXT_DIR
         self.global_context_file = GLOBAL_APPS_FILE
+        self.apps_db_file = GLOBAL_APPS_DB
+        self._app_registry: Optional[AppRegistry] = None
+
+    @property
+    def app_registry(self) -> AppRegistry:
+        """The global app registry, migrated from apps.json on first use."""
+        registry = self._app_registry
+        if registry is None or registry.db_file != Path(self.apps_db_file):
+            registry = AppRegistry(self.apps_db_file, self.global_context_file)
+            self._app_registry = registry
+        return registry
 
     def _load_json(self, file: Path) -> Dict[str, Any]:
         """
@@ -47,7 +179,7 @@ class ContextManager:
 
     def _save_json(self, file: Path, data: Dict[str, Any]) -> None:
         """
-        Save dictionary data to a JSON file.
+        Save dictionary data to a JSON file atomically.
 
         Args:
             file: Path
@@ -58,8 +190,140 @@ class ContextManager:
         Returns:
             None
         """
-        file.parent.mkdir(parents=True, exist_ok=True)
-        file.write_text(json.dumps(data, indent=2, default=str))
+        atomic_write_text(file, json.dumps(data, indent=2, default=str))
+        self._invalidate(file)
+
+    @staticmethod
+    def _cache_key(file: Path, model: Type[BaseModel]) -> Tuple[str, str]:
+        return str(file.resolve()), model.__name__
+
+    def _invalidate(self, file: Path) -> None:
+        path = str(file.resolve())
+        with _MODEL_CACHE_LOCK:
+            for key in [key for key in _MODEL_CACHE if key[0] == path]:
+                del _MODEL_CACHE[key]
+
+    def _load_model(self, file: Path, model: Type[ModelT]) -> Optional[ModelT]:
+        """
+        Load and validate a JSON file, reusing the cached model when unchanged.
+
+        The returned model is shared between callers and must not be mutated.
+
+        Args:
+            file: Path
+                Path to the JSON file
+            model: Type[ModelT]
+                Pydantic model to validate the data with
+
+        Returns:
+            Optional[ModelT]
+                The validated model, or None if the file is missing or empty
+        """
+        transaction = _current_transaction()
+        staged = transaction.staged(file) if transaction is not None else None
+        if staged is not None:
+            if not staged.data:
+                return None
+            instance = staged.models.get(model.__name__)
+            if instance is None:
+                instance = model(**staged.data)
+                staged.models[model.__name__] = instance
+            return instance
+
+        try:
+            stat = file.stat()
+        except FileNotFoundError:
+            return None
+
+        # The signature is taken before reading, so a concurrent write can
+        # only make the entry look stale and trigger one more read.
+        signature = (stat.st_mtime_ns, stat.st_size)
+        key = self._cache_key(file, model)
+        cached = _MODEL_CACHE.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        data = self._load_json(file)
+        if not data:
+            return None
+        instance = model(**data)
+        with _MODEL_CACHE_LOCK:
+            _MODEL_CACHE[key] = (signature, instance)
+        return instance
+
+    def _mutate(
+        self,
+        file: Path,
+        model: Type[BaseModel],
+        operation: Callable[[Dict[str, Any]], Any],
+    ) -> Any:
+        """
+        Apply a read-modify-write operation to a context file.
+
+        The operation receives the file's raw data and modifies it in place.
+        Outside a transaction the file is locked, updated, validated and
+        saved immediately; inside one the change is staged until commit.
+        Nothing is written when the operation leaves the data unchanged.
+
+        Args:
+            file: Path
+                Path to the JSON file
+            model: Type[BaseModel]
+                Pydantic model validating the file
+            operation: Callable[[Dict[str, Any]], Any]
+                Function modifying the data in place
+
+        Returns:
+            Any
+                The operation's return value
+        """
+        transaction = _current_transaction()
+        if transaction is not None:
+            return transaction.apply(file, model, operation)
+
+        with file_lock(file):
+            data = self._load_json(file)
+            original = copy.deepcopy(data)
+            result = operation(data)
+            if data != original:
+                self._save_json(file, model(**data).model_dump())
+            return result
+
+    @contextmanager
+    def transaction(self) -> Iterator["ContextManager"]:
+        """
+        Batch context updates into a single validated write per file.
+
+        Inside the block reads are served from memory and mutations are
+        staged; on a clean exit every changed file is validated once and
+        written atomically, on an exception all staged changes are
+        discarded. The transaction is per thread and shared by every
+        ContextManager, nested blocks join the outermost one.
+
+        Returns:
+            Iterator[ContextManager]
+                This context manager
+        """
+        if _current_transaction() is not None:
+            yield self
+            return
+
+        transaction = _Transaction(self)
+        _TRANSACTIONS.current = transaction
+        try:
+            yield self
+        finally:
+            _TRANSACTIONS.current = None
+        try:
+            transaction.commit()
+        except ValidationError as e:
+            raise ValueError(f"{ERROR_EMOJI} Invalid context data: {e}") from e
+
+    def _load_global_context(self) -> GlobalContext:
+        """Load the global context, empty if the registry file does not exist."""
+        return self._load_model(self.global_context_file, GlobalContext) or (
+            GlobalContext()
+        )
 
     @staticmethod
     def _deep_merge(target: Dict[str, Any], source: Dict[str, Any]) -> None:
@@ -88,40 +352,75 @@ class ContextManager:
                 The context data containing app_name, active_platform, and
                 platform-specific data, or None if no context exists
         """
-        try:
-            data = self._load_json(self.context_file)
-            if not data:
-                return None
+        context = self.load_context()
+        if context is None:
+            return None
+        return self.environment_context(context, platform, environment)
 
-            context = ApplicationContext(**data)
+    def load_context(self) -> Optional[ApplicationContext]:
+        """
+        Load the validated application context.
 
-            # get platform data from context
-            platform = platform or context.active_platform
-            environment = environment or context.active_environment
-            if platform not in context.platform:
-                return None
-            platform_environments = context.platform.get(platform, {})
-            if environment not in platform_environments:
-                return None
+        The model is shared with other readers and must not be modified, use
+        the update methods to change the context.
 
-            # Get the environment-specific data
-            environment_data = platform_environments.get(environment, {})
-            if isinstance(environment_data, PlatformContext):
-                environment_data = environment_data.dict()
+        Returns:
+            Optional[ApplicationContext]
+                The application context, or None if no context exists
+        """
+        try:
+            return self._load_model(self.context_file, ApplicationContext)
+        except ValidationError as e:
+            raise ValueError(f"{ERROR_EMOJI} Invalid context data: {e}") from e
 
-            result = {
-                "app_name": context.app_name,
-                "active_platform": platform,
-                "active_environment": environment,
-                **environment_data,
-            }
+    @staticmethod
+    def environment_context(
+        context: ApplicationContext,
+        platform: Optional[str] = None,
+        environment: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Build the flat context of one platform environment.
 
-            if context.integrations:
-                result["integrations"] = context.integrations
+        Args:
+            context: ApplicationContext
+                Application context returned by load_context
+            platform: Optional[str]
+                Platform name, uses the active platform if None
+            environment: Optional[str]
+                Environment name, uses the active environment if None
 
-            return result
-        except ValidationError as e:
-            raise ValueError(f"{ERROR_EMOJI} Invalid context data: {e}") from e
+        Returns:
+            Optional[Dict[str, Any]]
+                The app name, platform, environment and environment data, or
+                None if the platform environment does not exist
+        """
+        platform = platform or context.active_platform
+        environment = environment or context.active_environment
+        if platform not in context.platform:
+            return None
+        platform_environments = context.platform.get(platform, {})
+        if environment not in platform_environments:
+            return None
+
+        # Get the environment-specific data, copied so callers can
+        # modify it without touching the cached context
+        environment_data = platform_environments.get(environment, {})
+        if isinstance(environment_data, PlatformContext):
+            environment_data = environment_data.model_dump()
+        environment_data = copy.deepcopy(environment_data)
+
+        result = {
+            "app_name": context.app_name,
+            "active_platform": platform,
+            "active_environment": environment,
+            **environment_data,
+        }
+
+        if context.integrations:
+            result["integrations"] = copy.deepcopy(context.integrations)
+
+        return result
 
     def update_platform(
         self,
@@ -129,6 +428,7 @@ class ContextManager:
         values: Dict[str, Any],
         environment: str = "default",
         app_name: Optional[str] = None,
+        activate: bool = True,
     ) -> None:
         """
         Update platform values in the context.
@@ -142,13 +442,14 @@ class ContextManager:
                 Environment name to update
             app_name: Optional[str]
                 App name to update
+            activate: bool
+                Also make the environment the active one
 
         Returns:
             None
         """
-        try:
-            data = self._load_json(self.context_file)
 
+        def _update(data: Dict[str, Any]) -> None:
             # update app name if provided
             if app_name:
                 data["app_name"] = app_name
@@ -161,14 +462,15 @@ class ContextManager:
             if environment not in data["platform"][platform]:
                 data["platform"][platform][environment] = {}
 
-            self._deep_merge(data["platform"][platform][environment], values)
-            data["active_platform"] = platform
-            data["active_environment"] = environment
-
-            context = ApplicationContext(**data)
+            self._deep_merge(
+                data["platform"][platform][environment], copy.deepcopy(values)
+            )
+            if activate:
+                data["active_platform"] = platform
+                data["active_environment"] = environment
 
-            # save the updated context
-            self._save_json(self.context_file, context.dict())
+        try:
+            self._mutate(self.context_file, ApplicationContext, _update)
         except ValidationError as e:
             raise ValueError(f"{ERROR_EMOJI} Invalid context data: {e}") from e
 
@@ -186,8 +488,8 @@ class ContextManager:
             environment: str
                 Environment name to clear
         """
-        try:
-            data = self._load_json(self.context_file)
+
+        def _clear(data: Dict[str, Any]) -> None:
             if (
                 "platform" not in data
                 or platform not in data["platform"]
@@ -198,8 +500,38 @@ class ContextManager:
             for key in keys:
                 data["platform"][platform][environment].pop(key, None)
 
-            context = ApplicationContext(**data)
-            self._save_json(self.context_file, context.dict())
+        try:
+            self._mutate(self.context_file, ApplicationContext, _clear)
+        except ValidationError as e:
+            raise ValueError(f"{ERROR_EMOJI} Invalid context data: {e}") from e
+
+    def set_active_environment(self, platform: str, environment: str) -> None:
+        """
+        Make an existing platform environment the active one.
+
+        Nothing is written when it is already active.
+
+        Args:
+            platform: str
+                Platform name to activate
+            environment: str
+                Environment name to activate
+
+        Returns:
+            None
+        """
+
+        def _activate(data: Dict[str, Any]) -> None:
+            if environment not in data.get("platform", {}).get(platform, {}):
+                raise ValueError(
+                    f"Environment '{environment}' not found for platform "
+                    f"'{platform}'"
+                )
+            data["active_platform"] = platform
+            data["active_environment"] = environment
+
+        try:
+            self._mutate(self.context_file, ApplicationContext, _activate)
         except ValidationError as e:
             raise ValueError(f"{ERROR_EMOJI} Invalid context data: {e}") from e
 
@@ -219,24 +551,7 @@ class ContextManager:
             None
         """
         try:
-            data = self._load_json(self.global_context_file)
-            abs_path = str(Path(path).resolve())
-
-            # check if app already exists
-            existing_apps = data.get("applications", [])
-            if not any(app["path"] == abs_path for app in existing_apps):
-                new_app = RegisteredApp(
-                    app_name=app_name,
-                    path=abs_path,
-                    **kwargs,
-                )
-
-                if "applications" not in data:
-                    data["applications"] = []
-                data["applications"].append(new_app.dict())
-
-                global_context = GlobalContext(**data)
-                self._save_json(self.global_context_file, global_context.dict())
+            self.app_registry.register(app_name, str(Path(path).resolve()), **kwargs)
         except ValidationError as e:
             raise ValueError(f"{ERROR_EMOJI} Invalid app registration data: {e}") from e
 
@@ -252,30 +567,46 @@ class ContextManager:
             BaseResponse
                 Response indicating success or failure
         """
-        try:
-            data = self._load_json(self.global_context_file)
-            original = len(data.get("applications", []))
-            data["applications"] = [
-                app
-                for app in data.get("applications", [])
-                if app["app_name"] != app_name
-            ]
-            if len(data["applications"]) < original:
-                global_context = GlobalContext(**data)
-                self._save_json(self.global_context_file, global_context.dict())
-                return BaseResponse(
-                    success=True,
-                    message=f"{SUCCESS_EMOJI} App '{app_name}' unregistered",
-                )
-            else:
-                return BaseResponse(
-                    success=False, error=f"{ERROR_EMOJI} App '{app_name}' not found"
-                )
-        except ValidationError as e:
+        if self.app_registry.unregister(app_name):
+            return BaseResponse(
+                success=True,
+                message=f"{SUCCESS_EMOJI} App '{app_name}' unregistered",
+            )
+        else:
             return BaseResponse(
-                success=False, error=f"{ERROR_EMOJI} Invalid app registration data: {e}"
+                success=False, error=f"{ERROR_EMOJI} App '{app_name}' not found"
             )
 
+    def get_app(self, path: str) -> Optional[RegisteredApp]:
+        """
+        Get the app registered at the given path.
+
+        Args:
+            path: str
+                Path to the application directory
+
+        Returns:
+            Optional[RegisteredApp]
+                The registered app, or None if the path is not registered
+        """
+        return self.app_registry.get_by_path(str(Path(path).resolve()))
+
+    def list_apps(self, app_name: Optional[str] = None) -> List[RegisteredApp]:
+        """
+        List the registered apps.
+
+        Args:
+            app_name: Optional[str]
+                Only list apps registered under this name
+
+        Returns:
+            List[RegisteredApp]
+                Registered apps in registration order
+        """
+        if app_name:
+            return self.app_registry.find(app_name)
+        return self.app_registry.list()
+
     def add_service_profile(
         self, service: str, profile_name: str, config: dict
     ) -> None:
@@ -290,13 +621,13 @@ class ContextManager:
             raise ValueError(f"{ERROR_EMOJI} service name is required")
         if not profile_name.strip():
             raise ValueError(f"{ERROR_EMOJI} profile name is required")
-        try:
-            data = self._load_json(self.global_context_file)
+
+        def _add(data: Dict[str, Any]) -> None:
             profiles = data.setdefault("service_profiles", {})
-            profiles.setdefault(service, {})[profile_name] = config
+            profiles.setdefault(service, {})[profile_name] = copy.deepcopy(config)
 
-            global_context = GlobalContext(**data)
-            self._save_json(self.global_context_file, global_context.dict())
+        try:
+            self._mutate(self.global_context_file, GlobalContext, _add)
         except ValidationError as e:
             raise ValueError(f"{ERROR_EMOJI} Invalid service profile data: {e}") from e
 
@@ -310,17 +641,18 @@ class ContextManager:
             service: str
                 The name of the service
         """
-        try:
-            data = self._load_json(self.global_context_file)
+
+        def _update(data: Dict[str, Any]) -> None:
             service_profiles = data.setdefault("service_profiles", {})
             profiles = service_profiles.setdefault(service, {})
 
             if profile_name not in profiles:
                 raise ValueError(f"Profile '{profile_name}' not found for '{service}'")
 
-            profiles[profile_name].update(updates)
-            global_context = GlobalContext(**data)
-            self._save_json(self.global_context_file, global_context.dict())
+            profiles[profile_name].update(copy.deepcopy(updates))
+
+        try:
+            self._mutate(self.global_context_file, GlobalContext, _update)
         except ValidationError as e:
             raise ValueError(f"{ERROR_EMOJI} Invalid service profile data: {e}") from e
 
@@ -335,9 +667,9 @@ class ContextManager:
                 The name of the service
         """
         try:
-            data = self._load_json(self.global_context_file)
-            global_context = GlobalContext(**data)
-            return global_context.service_profiles.get(service, {}).get(profile_name)
+            global_context = self._load_global_context()
+            profile = global_context.service_profiles.get(service, {}).get(profile_name)
+            return copy.deepcopy(profile)
         except ValidationError as e:
             raise ValueError(f"{ERROR_EMOJI} Invalid global context data: {e}") from e
 
@@ -354,8 +686,7 @@ class ContextManager:
                 A list of all service profiles for the given service
         """
         try:
-            data = self._load_json(self.global_context_file)
-            global_context = GlobalContext(**data)
+            global_context = self._load_global_context()
             return list(global_context.service_profiles.get(service, {}).keys())
         except ValidationError as e:
             raise ValueError(f"{ERROR_EMOJI} Invalid global context data: {e}") from e
@@ -368,13 +699,14 @@ class ContextManager:
             service: str
                 The name of the service
         """
-        try:
-            data = self._load_json(self.global_context_file)
+
+        def _delete(data: Dict[str, Any]) -> None:
             profiles = data.get("service_profiles", {}).get(service, {})
             if profile_name in profiles:
                 del profiles[profile_name]
-            global_context = GlobalContext(**data)
-            self._save_json(self.global_context_file, global_context.dict())
+
+        try:
+            self._mutate(self.global_context_file, GlobalContext, _delete)
         except ValidationError as e:
             raise ValueError(f"{ERROR_EMOJI} Invalid global context data: {e}") from e
 
@@ -395,8 +727,8 @@ class ContextManager:
                 Status information including exists, available_environments, etc.
         """
         try:
-            data = self._load_json(self.context_file)
-            if not data:
+            context = self._load_model(self.context_file, ApplicationContext)
+            if context is None:
                 return {
                     "exists": False,
                     "platform_exists": False,
@@ -404,8 +736,6 @@ class ContextManager:
                     "error": "No app context found",
                 }
 
-            context = ApplicationContext(**data)
-
             # Check if platform exists
             if platform not in context.platform:
                 return {
@@ -0,0 +1,309 @@
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from sfai.context.models import RegisteredApp
+
+# Bumped whenever the schema changes; 0 is a database that was never set up
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY,
+    app_name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE UNIQUE INDEX IF NOT EXISTS applications_path ON applications (path);
+CREATE INDEX IF NOT EXISTS applications_app_name ON applications (app_name);
+CREATE TABLE IF NOT EXISTS removed_applications (
+    path TEXT PRIMARY KEY,
+    removed_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS legacy_import (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+"""
+
+_COLUMNS = "app_name, path, created_at, updated_at, extra"
+
+
+class AppRegistry:
+    """
+    Global registry of initialized apps backed by a SQLite database.
+
+    Apps are indexed by path (unique) and by name, so registering, looking up
+    and removing an app does not depend on how many apps are registered.
+    Apps listed in the legacy ``apps.json`` registry are imported whenever
+    that file changed since the last import, so apps registered by older
+    sfai versions keep showing up. The file itself is left untouched for
+    those versions.
+
+    Args:
+        db_file: Path
+            Path to the SQLite database (e.g. ``~/.sfai/apps.db``)
+        legacy_file: Optional[Path]
+            Path to the JSON registry to migrate from, if any
+    """
+
+    def __init__(self, db_file: Path, legacy_file: Optional[Path] = None):
+        self.db_file = Path(db_file)
+        self.legacy_file = Path(legacy_file) if legacy_file else None
+        self._ready = False
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        if not self._ready:
+            self._setup()
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _setup(self) -> None:
+        with self._lock:
+            if self._ready:
+                return
+            self.db_file.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version < SCHEMA_VERSION:
+                    self._migrate(conn)
+                self._sync_legacy(conn)
+            finally:
+                conn.close()
+            self._ready = True
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        # BEGIN IMMEDIATE serializes concurrent first runs
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+                conn.execute("ROLLBACK")
+                return
+            for statement in _SCHEMA.strip().split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _sync_legacy(self, conn: sqlite3.Connection) -> None:
+        signature = self._legacy_signature()
+        if signature is None or self._imported_signature(conn) == signature:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # another process may have imported it while we waited
+            if self._imported_signature(conn) == signature:
+                conn.execute("ROLLBACK")
+                return
+            self._import_legacy(conn)
+            conn.execute(
+                "INSERT OR REPLACE INTO legacy_import (id, mtime_ns, size) "
+                "VALUES (1, ?, ?)",
+                signature,
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _legacy_signature(self) -> Optional[Tuple[int, int]]:
+        if self.legacy_file is None:
+            return None
+        try:
+            stat = self.legacy_file.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _imported_signature(conn: sqlite3.Connection) -> Optional[Tuple[int, int]]:
+        row = conn.execute("SELECT mtime_ns, size FROM legacy_import").fetchone()
+        return tuple(row) if row else None
+
+    def _import_legacy(self, conn: sqlite3.Connection) -> None:
+        try:
+            data = json.loads(self.legacy_file.read_text())
+        except (OSError, ValueError):
+            return
+        apps = data.get("applications") if isinstance(data, dict) else None
+        removed = dict(
+            conn.execute("SELECT path, removed_at FROM removed_applications")
+        )
+        stamped, unstamped = [], []
+        for app in apps or []:
+            try:
+                row = _to_row(RegisteredApp(**app))
+            except (TypeError, ValidationError):
+                continue
+            # apps removed here after the older version last saved them stay
+            # removed, entries without a timestamp never count as newer
+            if row[1] in removed and "updated_at" not in app:
+                continue
+            if row[3] > removed.get(row[1], ""):
+                (stamped if "updated_at" in app else unstamped).append(row)
+        # only entries updated after the database's copy replace it
+        conn.executemany(
+            f"INSERT INTO applications ({_COLUMNS}) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (path) DO UPDATE SET app_name = excluded.app_name, "
+            "created_at = excluded.created_at, updated_at = excluded.updated_at, "
+            "extra = excluded.extra "
+            "WHERE excluded.updated_at > applications.updated_at",
+            stamped,
+        )
+        # entries without a timestamp can't be newer than the database's
+        conn.executemany(
+            f"INSERT OR IGNORE INTO applications ({_COLUMNS}) "
+            "VALUES (?, ?, ?, ?, ?)",
+            unstamped,
+        )
+
+    def register(self, app_name: str, path: str, **kwargs) -> bool:
+        """
+        Register an app unless its path is already registered.
+
+        Args:
+            app_name: str
+                Name of the application
+            path: str
+                Absolute path to the application directory
+            **kwargs
+                Additional values to store with the app
+
+        Returns:
+            bool
+                True if the app was added, False if the path was known
+        """
+        row = _to_row(RegisteredApp(app_name=app_name, path=path, **kwargs))
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"INSERT OR IGNORE INTO applications ({_COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?)",
+                row,
+            )
+            if cursor.rowcount == 0:
+                return False
+            conn.execute("DELETE FROM removed_applications WHERE path = ?", (row[1],))
+            return True
+
+    def unregister(self, app_name: str) -> int:
+        """
+        Remove every app registered under the given name.
+
+        Args:
+            app_name: str
+                Name of the application
+
+        Returns:
+            int
+                Number of removed entries
+        """
+        removed_at = datetime.utcnow().isoformat()
+        with self._connect() as conn:
+            # remembered so the import from apps.json doesn't bring them back
+            conn.execute(
+                "INSERT OR REPLACE INTO removed_applications (path, removed_at) "
+                "SELECT path, ? FROM applications WHERE app_name = ?",
+                (removed_at, app_name),
+            )
+            cursor = conn.execute(
+                "DELETE FROM applications WHERE app_name = ?", (app_name,)
+            )
+            return cursor.rowcount
+
+    def get_by_path(self, path: str) -> Optional[RegisteredApp]:
+        """
+        Look up the app registered at a path.
+
+        Args:
+            path: str
+                Absolute path to the application directory
+
+        Returns:
+            Optional[RegisteredApp]
+                The registered app, or None if the path is unknown
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {_COLUMNS} FROM applications WHERE path = ?", (path,)
+            ).fetchone()
+        return _from_row(row) if row else None
+
+    def find(self, app_name: str) -> List[RegisteredApp]:
+        """
+        Look up the apps registered under a name.
+
+        Args:
+            app_name: str
+                Name of the application
+
+        Returns:
+            List[RegisteredApp]
+                Matching apps in registration order
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM applications WHERE app_name = ? ORDER BY id",
+                (app_name,),
+            ).fetchall()
+        return [_from_row(row) for row in rows]
+
+    def list(self) -> List[RegisteredApp]:
+        """
+        List every registered app.
+
+        Returns:
+            List[RegisteredApp]
+                All apps in registration order
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM applications ORDER BY id"
+            ).fetchall()
+        return [_from_row(row) for row in rows]
+
+
+def _to_row(app: RegisteredApp) -> tuple:
+    data = app.model_dump()
+    extra: Dict[str, Any] = {
+        key: value
+        for key, value in data.items()
+        if key not in ("app_name", "path", "created_at", "updated_at")
+    }
+    return (
+        app.app_name,
+        app.path,
+        app.created_at.isoformat(),
+        app.updated_at.isoformat(),
+        json.dumps(extra, default=str),
+    )
+
+
+def _from_row(row: tuple) -> RegisteredApp:
+    app_name, path, created_at, updated_at, extra = row
+    return RegisteredApp(
+        app_name=app_name,
+        path=path,
+        created_at=datetime.fromisoformat(created_at),
+        updated_at=datetime.fromisoformat(updated_at),
+        **json.loads(extra),
+    )
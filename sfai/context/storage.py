@@ -0,0 +1,168 @@
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class _PathLock:
+    """Reentrant lock for one file, held across threads and processes."""
+
+    def __init__(self, lock_file: Path):
+        self.lock_file = lock_file
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> None:
+        self._thread_lock.acquire()
+        try:
+            if self._depth == 0 and fcntl is not None:
+                self.lock_file.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o600)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                except BaseException:
+                    os.close(fd)
+                    raise
+                self._fd = fd
+            self._depth += 1
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+    def release(self) -> None:
+        try:
+            self._depth -= 1
+            if self._depth == 0 and self._fd is not None:
+                fd, self._fd = self._fd, None
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                finally:
+                    os.close(fd)
+        finally:
+            self._thread_lock.release()
+
+
+_PATH_LOCKS: Dict[str, _PathLock] = {}
+_PATH_LOCKS_GUARD = threading.Lock()
+
+
+def _get_path_lock(file: Path) -> _PathLock:
+    path = str(Path(file).resolve())
+    with _PATH_LOCKS_GUARD:
+        lock = _PATH_LOCKS.get(path)
+        if lock is None:
+            lock = _PathLock(Path(path + ".lock"))
+            _PATH_LOCKS[path] = lock
+        return lock
+
+
+@contextmanager
+def file_lock(file: Path) -> Iterator[None]:
+    """
+    Hold an exclusive lock on a file for a read-modify-write cycle.
+
+    The lock is advisory: an in-process reentrant lock combined with
+    ``fcntl.flock`` on a ``<file>.lock`` sidecar, so concurrent sfai
+    processes and threads serialize on it. Nested use from the same thread
+    is allowed. On platforms without ``fcntl`` only threads are serialized.
+
+    Args:
+        file: Path
+            The file to protect
+
+    Returns:
+        Iterator[None]
+    """
+    lock = _get_path_lock(file)
+    lock.acquire()
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+def atomic_write_text(file: Path, text: str, mode: Optional[int] = None) -> None:
+    """
+    Replace a file's content so readers see either the old or the new data.
+
+    The text is written to a temporary file in the same directory, flushed
+    to disk and renamed over the target, so a crash never leaves a
+    truncated file behind.
+
+    Args:
+        file: Path
+            Path to write
+        text: str
+            Content to write
+        mode: Optional[int]
+            Permission bits for the file (e.g. 0o600), default keeps umask
+
+    Returns:
+        None
+    """
+    file = Path(file)
+    file.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=file.parent, prefix=f".{file.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+        # mkstemp creates 0600 files, restore the usual permissions
+        os.chmod(tmp_name, mode if mode is not None else 0o666 & ~_umask())
+        os.replace(tmp_name, file)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_dir(file.parent)
+
+
+@lru_cache(maxsize=None)
+def _umask() -> int:
+    """Return the process umask without changing it, as os.umask would."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    # no procfs, the mode of a new file shows which bits the umask clears
+    probe_dir = tempfile.mkdtemp()
+    try:
+        probe = os.path.join(probe_dir, "probe")
+        os.close(os.open(probe, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+        return 0o666 & ~os.stat(probe).st_mode & 0o777
+    finally:
+        shutil.rmtree(probe_dir, ignore_errors=True)
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Persist a rename by syncing its directory, where supported."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -2,9 +2,13 @@
 AgentForce decorators and metadata classes for FastAPI applications.
 """
 
+import os
+
 from pydantic import BaseModel
 from typing import ClassVar, Callable, Optional
 
+from sfai.constants import SPEC_EXTRACTION_ENV
+
 
 class AgentForceMetadata:
     """
@@ -59,3 +63,17 @@ def agentforce_action(
     if callable(_fn):
         return decorator(_fn)
     return decorator
+
+
+def is_spec_extraction() -> bool:
+    """
+    Tell whether the app is only being imported to extract its OpenAPI spec.
+
+    `sfai app publish` imports the app in a separate process to generate the
+    spec. Apps can check this at import time to skip loading models, opening
+    database connections and other startup work the spec doesn't need.
+
+    Returns:
+        True while the spec is being extracted, False otherwise
+    """
+    return os.environ.get(SPEC_EXTRACTION_ENV) == "1"
@@ -62,6 +62,135 @@ def agentforce_action(
     return decorator
 
 
+class _EndpointMetadata:
+    """AgentForce metadata of an endpoint, read once from its signature."""
+
+    __slots__ = ("action", "params", "returns")
+
+    def __init__(self, fn: Callable):
+        route_meta = getattr(fn, AgentForceActionRouteMetadata.ATTRIBUTE_NAME, None)
+        self.action: Optional[dict[str, Any]] = (
+            route_meta.model_dump(exclude_none=True) if route_meta else None
+        )
+        sig = inspect.signature(fn)
+        # (parameter name, metadata) of the annotated parameters
+        self.params: list[tuple[str, list[AgentForceMetadata]]] = []
+        for param in sig.parameters.values():
+            extras = _metadata_extras(param.annotation)
+            if extras:
+                self.params.append((param.name, extras))
+        self.returns = _metadata_extras(sig.return_annotation)
+
+
+def _metadata_extras(annotation: Any) -> list[AgentForceMetadata]:
+    if get_origin(annotation) is not Annotated:
+        return []
+    _, *extras = get_args(annotation)
+    return [ex for ex in extras if isinstance(ex, AgentForceMetadata)]
+
+
+def _action_flags(meta: AgentForceMetadata) -> dict[str, bool]:
+    action: dict[str, bool] = {}
+    if meta.is_user_input is not None:
+        action["isUserInput"] = meta.is_user_input
+    if meta.is_displayable is not None:
+        action["isDisplayable"] = meta.is_displayable
+    return action
+
+
+def _action_block(schema: dict[str, Any]) -> dict[str, Any]:
+    return (
+        schema.setdefault("x-sfdc", {}).setdefault("agent", {}).setdefault("action", {})
+    )
+
+
+def _set_action_flags(schema: dict[str, Any], meta: AgentForceMetadata) -> None:
+    action = _action_flags(meta)
+    if action:
+        _action_block(schema).update(action)
+
+
+def _prepare_schema(
+    schema: dict[str, Any], inliner: "SchemaInliner", is_action: bool
+) -> dict[str, Any]:
+    """Inline a body or response schema and add the AgentForce defaults."""
+    schema = inliner.inline(schema)
+    schema.pop("title", None)
+    ensure_descriptions(schema)
+    schema.setdefault("additionalProperties", False)
+    if is_action:
+        action_block = _action_block(schema)
+        action_block.setdefault("isUserInput", True)
+        action_block.setdefault("isDisplayable", True)
+    return schema
+
+
+def _process_operation(
+    op: dict[str, Any], endpoint: _EndpointMetadata, inliner: "SchemaInliner"
+) -> None:
+    """Apply the AgentForce metadata of an endpoint to one of its operations."""
+    if "description" not in op or not op["description"].strip():
+        op["description"] = op.get("summary", "No description provided")
+    if len(op["description"]) < 10:
+        op["description"] += " - extended"
+
+    # 1) operation-level metadata
+    if endpoint.action:
+        op["x-sfdc"] = {"agent": {"action": dict(endpoint.action)}}
+
+    # 2) inline all $ref in requestBody & responses
+    if endpoint.action and "requestBody" in op:
+        op["requestBody"].setdefault("description", "Request payload for agent action")
+        body = op["requestBody"]["content"]["application/json"]
+        body["schema"] = _prepare_schema(body["schema"], inliner, True)
+
+    for resp in op.get("responses", {}).values():
+        if "content" not in resp:
+            resp["content"] = {
+                "application/json": {
+                    "schema": {"type": "object", "additionalProperties": False}
+                }
+            }
+        for media in resp["content"].values():
+            if "schema" in media:
+                media["schema"] = _prepare_schema(
+                    media["schema"], inliner, bool(endpoint.action)
+                )
+
+    # 3) parameter-level metadata → parameters or requestBody.schema.x-sfdc
+    parameters: dict[str, dict[str, Any]] = {}
+    for parameter in op.get("parameters", []):
+        parameters.setdefault(parameter["name"], parameter)
+
+    for name, extras in endpoint.params:
+        parameter = parameters.get(name)
+        if parameter is not None:
+            schema = parameter["schema"]
+            for ex in extras:
+                schema["additionalProperties"] = False
+                parameter["description"] = ex.description
+                _set_action_flags(schema, ex)
+        elif "requestBody" in op:
+            # then it must be a request body object
+            schema = op["requestBody"]["content"]["application/json"]["schema"]
+            if not endpoint.action:
+                # action bodies got their descriptions when inlined
+                ensure_descriptions(schema)
+            for ex in extras:
+                op["requestBody"]["description"] = ex.description
+                if schema.get("type") == "object":
+                    schema["additionalProperties"] = False
+                _set_action_flags(schema, ex)
+
+    # 4) return-type metadata → responses…schema.x-sfdc
+    for ex in endpoint.returns:
+        for resp in op["responses"].values():
+            if "content" in resp and "application/json" in resp["content"]:
+                schema = resp["content"]["application/json"]["schema"]
+                schema["additionalProperties"] = False
+                _set_action_flags(schema, ex)
+
+
 def custom_openapi(app: FastAPI) -> dict[str, Any]:
     if app.openapi_schema:
         return app.openapi_schema
@@ -82,6 +211,7 @@ def custom_openapi(app: FastAPI) -> dict[str, Any]:
                 del responses["422"]
 
     schemas: dict[str, Any] = raw.get("components", {}).get("schemas", {})
+    inliner = SchemaInliner(schemas)
     (
         raw.setdefault("x-sfdc", {})
         .setdefault("agent", {})
@@ -96,179 +226,160 @@ def custom_openapi(app: FastAPI) -> dict[str, Any]:
         )
     )
 
+    # signatures are read once per endpoint, not per route and method
+    endpoints: dict[Callable, _EndpointMetadata] = {}
     for route in app.routes:
         if not hasattr(route, "endpoint") or not getattr(
             route, "include_in_schema", False
         ):
             continue
 
-        path = route.path
+        path_item = raw["paths"].get(route.path)
+        if not path_item:
+            continue
+        fn = route.endpoint
+        endpoint = endpoints.get(fn)
+        if endpoint is None:
+            endpoint = endpoints[fn] = _EndpointMetadata(fn)
+
         for method in route.methods - {"HEAD", "OPTIONS"}:
-            op_name = method.lower()
-            if path not in raw["paths"] or op_name not in raw["paths"][path]:
-                continue
+            op = path_item.get(method.lower())
+            if op is not None:
+                _process_operation(op, endpoint, inliner)
 
-            op = raw["paths"][path][op_name]
-            if "description" not in op or not op["description"].strip():
-                op["description"] = op.get("summary", "No description provided")
-            if len(op["description"]) < 10:
-                op["description"] += " - extended"
+    raw.pop("components", None)
+    app.openapi_schema = raw
+    return raw
 
-            fn = route.endpoint
 
-            # 1) operation-level metadata
-            meta_op = getattr(fn, AgentForceActionRouteMetadata.ATTRIBUTE_NAME, None)
-            if meta_op:
-                action_meta = meta_op.model_dump(exclude_none=True)
-                op["x-sfdc"] = {"agent": {"action": action_meta}}
+# Times a schema may be expanded inside itself before the reference is cut
+MAX_RECURSIVE_EXPANSIONS = 1
 
-            # 2) inline all $ref in requestBody & responses
-            if meta_op and "requestBody" in op:
-                op["requestBody"].setdefault(
-                    "description", "Request payload for agent action"
-                )
-                schema = op["requestBody"]["content"]["application/json"]["schema"]
-                schema = remove_inline_refs(schema, schemas)
-                schema.pop("title", None)
-                op["requestBody"]["content"]["application/json"]["schema"] = schema
-                ensure_descriptions(schema)
-                schema.setdefault("additionalProperties", False)
-                action_block = (
-                    schema.setdefault("x-sfdc", {})
-                    .setdefault("agent", {})
-                    .setdefault("action", {})
-                )
-                action_block.setdefault("isUserInput", True)
-                action_block.setdefault("isDisplayable", True)
-                op["requestBody"]["content"]["application/json"]["schema"] = schema
-
-            # Ensure operation has a description
-            if "description" not in op or not op["description"].strip():
-                op["description"] = op.get("summary", "No description provided")
-            if len(op["description"]) < 10:
-                op["description"] += " - extended"
-
-            for resp in op.get("responses", {}).values():
-                if "content" not in resp:
-                    resp["content"] = {
-                        "application/json": {
-                            "schema": {"type": "object", "additionalProperties": False}
-                        }
-                    }
-                for media in resp["content"].values():
-                    if "schema" in media:
-                        schema = remove_inline_refs(media["schema"], schemas)
-                        schema.pop("title", None)
-                        ensure_descriptions(schema)
-                        schema.setdefault("additionalProperties", False)
-
-                        if meta_op:
-                            action_block = (
-                                schema.setdefault("x-sfdc", {})
-                                .setdefault("agent", {})
-                                .setdefault("action", {})
-                            )
-                            action_block.setdefault("isUserInput", True)
-                            action_block.setdefault("isDisplayable", True)
-                        media["schema"] = schema
-
-            # 3) parameter-level metadata → requestBody.schema.x-sfdc
-            sig = inspect.signature(fn)
-
-            # find body-param metadata
-            for param in sig.parameters.values():
-                possible_parameter = [
-                    p for p in op.get("parameters", []) if p["name"] == param.name
-                ]
-                if not possible_parameter:
-                    # then is must be a request body object
-                    ann = param.annotation
-                    if get_origin(ann) is Annotated:
-                        base, *extras = get_args(ann)
-                        for ex in extras:
-                            if isinstance(ex, AgentForceMetadata):
-                                op["requestBody"]["description"] = ex.description
-                                schema = op["requestBody"]["content"][
-                                    "application/json"
-                                ]["schema"]
-                                ensure_descriptions(schema)
-                                if "type" in schema and schema["type"] == "object":
-                                    schema["additionalProperties"] = False
-                                action: dict[str, bool] = {}
-                                if ex.is_user_input is not None:
-                                    action["isUserInput"] = ex.is_user_input
-                                if ex.is_displayable is not None:
-                                    action["isDisplayable"] = ex.is_displayable
-                                if action:
-                                    (
-                                        schema.setdefault("x-sfdc", {})
-                                        .setdefault("agent", {})
-                                        .setdefault("action", {})
-                                        .update(action)
-                                    )
-                else:
-                    request_parameter = possible_parameter[0]
-                    ann = param.annotation
-                    if get_origin(ann) is Annotated:
-                        base, *extras = get_args(ann)
-                        for ex in extras:
-                            if isinstance(ex, AgentForceMetadata):
-                                schema = request_parameter["schema"]
-                                schema["additionalProperties"] = False
-                                request_parameter["description"] = ex.description
-                                action: dict[str, bool] = {}
-                                if ex.is_user_input is not None:
-                                    action["isUserInput"] = ex.is_user_input
-                                if ex.is_displayable is not None:
-                                    action["isDisplayable"] = ex.is_displayable
-                                if action:
-                                    (
-                                        schema.setdefault("x-sfdc", {})
-                                        .setdefault("agent", {})
-                                        .setdefault("action", {})
-                                        .update(action)
-                                    )
-
-            # 4) return-type metadata → responses…schema.x-sfdc
-            ret = sig.return_annotation
-            if get_origin(ret) is Annotated:
-                _, *extras = get_args(ret)
-                for ex in extras:
-                    if isinstance(ex, AgentForceMetadata):
-                        for resp in op["responses"].values():
-                            if (
-                                "content" in resp
-                                and "application/json" in resp["content"]
-                            ):
-                                schema = resp["content"]["application/json"]["schema"]
-                                schema["additionalProperties"] = False
-                                action: dict[str, bool] = {}
-                                if ex.is_user_input is not None:
-                                    action["isUserInput"] = ex.is_user_input
-                                if ex.is_displayable is not None:
-                                    action["isDisplayable"] = ex.is_displayable
-                                if action:
-                                    (
-                                        schema.setdefault("x-sfdc", {})
-                                        .setdefault("agent", {})
-                                        .setdefault("action", {})
-                                        .update(action)
-                                    )
+_END = object()
 
-    raw.pop("components", None)
-    app.openapi_schema = raw
-    return raw
+
+class _Expansion:
+    """A component being expanded, with whether its expansion was cut short."""
+
+    __slots__ = ("name", "truncated")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.truncated = False
+
+
+class SchemaInliner:
+    """
+    Replace $ref pointers with the schemas they reference.
+
+    Every component is resolved once and the resolved tree is reused for
+    each later reference, so a large shared model is not rebuilt per route.
+    Recursive schemas are expanded MAX_RECURSIVE_EXPANSIONS times, deeper
+    references become a plain object schema. Trees are walked with an
+    explicit stack, so deep nesting cannot hit the recursion limit.
+
+    Resolved components are shared between the returned trees: only the
+    top-level schema, its properties mapping and each property schema are
+    copies that may be changed.
+
+    Args:
+        schemas: dict[str, Any]
+            The components/schemas section of the OpenAPI document
+        max_recursive_expansions: int
+            Times a schema may be expanded inside itself
+    """
+
+    def __init__(
+        self,
+        schemas: dict[str, Any],
+        max_recursive_expansions: int = MAX_RECURSIVE_EXPANSIONS,
+    ):
+        self.schemas = schemas
+        self.max_recursive_expansions = max_recursive_expansions
+        self._resolved: dict[str, Any] = {}
+
+    def inline(self, obj: Any) -> Any:
+        """Return obj with every $ref replaced by the referenced schema."""
+        holder: list[Any] = [None]
+        # (value, container, key, enclosing expansions); an _END value marks
+        # the end of the expansion of the component stored at container[key]
+        stack: list[tuple[Any, Any, Any, tuple[_Expansion, ...]]] = [
+            (obj, holder, 0, ())
+        ]
+        while stack:
+            value, container, key, path = stack.pop()
+            if value is _END:
+                expansion = path[-1]
+                if not expansion.truncated:
+                    self._resolved[expansion.name] = container[key]
+                continue
+
+            if isinstance(value, dict) and "$ref" in value:
+                name = value["$ref"].split("/")[-1]
+                if name in self._resolved:
+                    container[key] = self._resolved[name]
+                    continue
+                depth = sum(1 for enclosing in path if enclosing.name == name)
+                if depth > self.max_recursive_expansions:
+                    # expansions cut short depend on where they started
+                    for enclosing in path:
+                        enclosing.truncated = True
+                    container[key] = _recursive_placeholder(name)
+                    continue
+                expanded = (*path, _Expansion(name))
+                stack.append((_END, container, key, expanded))
+                stack.append((self.schemas[name], container, key, expanded))
+            elif isinstance(value, dict):
+                new = container[key] = dict.fromkeys(value)
+                stack.extend((v, new, k, path) for k, v in value.items())
+            elif isinstance(value, list):
+                new = container[key] = [None] * len(value)
+                stack.extend((v, new, i, path) for i, v in enumerate(value))
+            else:
+                container[key] = value
+        return _detach(holder[0])
 
 
 def remove_inline_refs(obj: Any, schemas: dict[str, Any]) -> Any:
     """Traverse the schema tree to remove schema references and past them
     wherever they are used.
+
+    The result shares no objects with schemas or with itself, use a
+    SchemaInliner to resolve several trees against the same components.
     """
-    if isinstance(obj, dict):
-        if "$ref" in obj:
-            ref = obj["$ref"].split("/")[-1]
-            return remove_inline_refs(schemas[ref], schemas)
-        return {k: remove_inline_refs(v, schemas) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [remove_inline_refs(v, schemas) for v in obj]
-    return obj
+    return _copy_tree(SchemaInliner(schemas).inline(obj))
+
+
+def _recursive_placeholder(name: str) -> dict[str, Any]:
+    return {"type": "object", "description": f"Recursive reference to {name}"}
+
+
+def _detach(schema: Any) -> Any:
+    """Copy the parts of a schema the generator changes in place."""
+    if not isinstance(schema, dict):
+        return schema
+    schema = dict(schema)
+    properties = schema.get("properties")
+    if isinstance(properties, dict):
+        schema["properties"] = {
+            name: dict(field) if isinstance(field, dict) else field
+            for name, field in properties.items()
+        }
+    return schema
+
+
+def _copy_tree(obj: Any) -> Any:
+    """Copy nested dicts and lists without recursion."""
+    holder: list[Any] = [None]
+    stack: list[tuple[Any, Any, Any]] = [(obj, holder, 0)]
+    while stack:
+        value, container, key = stack.pop()
+        if isinstance(value, dict):
+            new = container[key] = dict.fromkeys(value)
+            stack.extend((v, new, k) for k, v in value.items())
+        elif isinstance(value, list):
+            new = container[key] = [None] * len(value)
+            stack.extend((v, new, i) for i, v in enumerate(value))
+        else:
+            container[key] = value
+    return holder[0]
@@ -36,8 +36,14 @@ class BasePlatform(ABC):
         pass
 
     @abstractmethod
-    def logs(self, context: Dict[str, Any]) -> BaseResponse:
-        pass
+    def logs(self, context: Dict[str, Any], **kwargs) -> BaseResponse:
+        """
+        Show the application logs.
+
+        Providers accept the optional keyword arguments ``follow`` (bool,
+        keep streaming new lines), ``since`` (str, relative duration such
+        as "10m") and ``tail`` (int, number of recent lines to show).
+        """
 
 
 class BaseIntegration(ABC):
@@ -0,0 +1,185 @@
+import asyncio
+import inspect
+import random
+import time
+from typing import Any, Awaitable, Callable, Iterator, Optional, TypeVar, Union
+
+T = TypeVar("T")
+
+DEFAULT_TIMEOUT = 300.0
+DEFAULT_INITIAL_INTERVAL = 0.25
+DEFAULT_MAX_INTERVAL = 5.0
+
+
+class PollTimeoutError(TimeoutError):
+    """
+    Raised when a polled operation does not finish before its deadline.
+
+    Args:
+        description: str
+            What was being waited for, used in the message
+        elapsed: float
+            Seconds spent polling
+        attempts: int
+            Number of checks made
+        last_result: Any
+            Result of the last check
+    """
+
+    def __init__(
+        self, description: str, elapsed: float, attempts: int, last_result: Any
+    ):
+        super().__init__(
+            f"Timed out after {elapsed:.0f}s waiting for {description} "
+            f"({attempts} checks)"
+        )
+        self.description = description
+        self.elapsed = elapsed
+        self.attempts = attempts
+        self.last_result = last_result
+
+
+def backoff_intervals(
+    initial: float = DEFAULT_INITIAL_INTERVAL,
+    maximum: float = DEFAULT_MAX_INTERVAL,
+    factor: float = 2.0,
+    jitter: float = 0.1,
+) -> Iterator[float]:
+    """
+    Yield exponentially growing sleep intervals with random jitter.
+
+    Args:
+        initial: float
+            First interval in seconds
+        maximum: float
+            Upper bound of the interval before jitter
+        factor: float
+            Growth factor between intervals
+        jitter: float
+            Fraction of each interval added or removed at random, so
+            concurrent pollers do not hit the server in lockstep
+
+    Returns:
+        Iterator[float]
+            Endless sequence of intervals in seconds
+    """
+    interval = initial
+    while True:
+        yield max(0.0, interval * (1 + random.uniform(-jitter, jitter)))
+        interval = min(interval * factor, maximum)
+
+
+def poll(
+    check: Callable[[], T],
+    done: Callable[[T], bool],
+    description: str = "operation",
+    timeout: float = DEFAULT_TIMEOUT,
+    initial_interval: float = DEFAULT_INITIAL_INTERVAL,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic,
+) -> T:
+    """
+    Call check until done accepts its result or the deadline passes.
+
+    The first check runs immediately, then the interval starts short and
+    grows exponentially, so fast operations return quickly and slow ones are
+    not hammered. The last sleep is cut short to end on the deadline.
+
+    Args:
+        check: Callable[[], T]
+            Fetches the current state, exceptions propagate
+        done: Callable[[T], bool]
+            Returns True once the state is final
+        description: str
+            What is being waited for, used in the timeout error
+        timeout: float
+            Overall deadline in seconds
+        initial_interval: float
+            First sleep in seconds
+        max_interval: float
+            Longest sleep in seconds
+        sleep: Callable[[float], None]
+            Sleep function, replaceable for tests
+        clock: Callable[[], float]
+            Monotonic clock, replaceable for tests
+
+    Returns:
+        T
+            The first result done accepted
+
+    Raises:
+        PollTimeoutError
+            If the deadline passes first
+    """
+    start = clock()
+    deadline = start + timeout
+    intervals = backoff_intervals(initial_interval, max_interval)
+    attempts = 0
+    while True:
+        result = check()
+        attempts += 1
+        if done(result):
+            return result
+        remaining = deadline - clock()
+        if remaining <= 0:
+            raise PollTimeoutError(description, clock() - start, attempts, result)
+        sleep(min(next(intervals), remaining))
+
+
+async def poll_async(
+    check: Callable[[], Union[T, Awaitable[T]]],
+    done: Callable[[T], bool],
+    description: str = "operation",
+    timeout: float = DEFAULT_TIMEOUT,
+    initial_interval: float = DEFAULT_INITIAL_INTERVAL,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+    clock: Optional[Callable[[], float]] = None,
+) -> T:
+    """
+    Asyncio version of poll.
+
+    Coroutine functions are awaited, plain functions run in a worker thread
+    so blocking HTTP calls do not stall the event loop.
+
+    Args:
+        check: Callable[[], Union[T, Awaitable[T]]]
+            Fetches the current state, exceptions propagate
+        done: Callable[[T], bool]
+            Returns True once the state is final
+        description: str
+            What is being waited for, used in the timeout error
+        timeout: float
+            Overall deadline in seconds
+        initial_interval: float
+            First sleep in seconds
+        max_interval: float
+            Longest sleep in seconds
+        clock: Optional[Callable[[], float]]
+            Clock in seconds, the event loop's clock if None
+
+    Returns:
+        T
+            The first result done accepted
+
+    Raises:
+        PollTimeoutError
+            If the deadline passes first
+    """
+    clock = clock or asyncio.get_running_loop().time
+    start = clock()
+    deadline = start + timeout
+    intervals = backoff_intervals(initial_interval, max_interval)
+    attempts = 0
+    while True:
+        if inspect.iscoroutinefunction(check):
+            result = await check()
+        else:
+            result = await asyncio.to_thread(check)
+        attempts += 1
+        if done(result):
+            return result
+        remaining = deadline - clock()
+        if remaining <= 0:
+            raise PollTimeoutError(description, clock() - start, attempts, result)
+        await asyncio.sleep(min(next(intervals), remaining))
@@ -0,0 +1,122 @@
+import sys
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Type
+
+if sys.version_info >= (3, 10):
+    from importlib.metadata import entry_points
+else:
+    from importlib_metadata import entry_points
+
+from sfai.constants import WARNING_EMOJI
+
+
+class LazyRegistry(Mapping):
+    """
+    Registry of plugins discovered through an entry point group.
+
+    Entry points are resolved by name only; a plugin is imported and
+    instantiated the first time it is looked up, so listing the available
+    plugins never imports any of them.
+
+    Args:
+        group: str
+            Entry point group to discover (e.g. "sfai.platforms")
+        kind: str
+            Human readable plugin kind used in warnings (e.g. "platform")
+        base_cls: Optional[Type]
+            Base class every plugin must inherit from, if any
+    """
+
+    def __init__(self, group: str, kind: str, base_cls: Optional[Type] = None):
+        self.group = group
+        self.kind = kind
+        self.base_cls = base_cls
+        self._entry_points: Optional[Dict[str, Any]] = None
+        self._instances: Dict[str, Any] = {}
+        self._failed: set = set()
+        self._lock = threading.RLock()
+
+    def _discover(self) -> Dict[str, Any]:
+        if self._entry_points is None:
+            with self._lock:
+                if self._entry_points is None:
+                    self._entry_points = {
+                        ep.name: ep for ep in entry_points(group=self.group)
+                    }
+        return self._entry_points
+
+    def _load(self, name: str) -> Optional[Any]:
+        entry_point = self._discover().get(name)
+        if entry_point is None:
+            return None
+        try:
+            plugin_cls = entry_point.load()
+            if self.base_cls is not None and not issubclass(plugin_cls, self.base_cls):
+                print(
+                    f"{WARNING_EMOJI} {self.kind.capitalize()} {name} must "
+                    f"inherit from {self.base_cls.__name__}"
+                )
+                return None
+            return plugin_cls()
+        except Exception as e:
+            print(f"{WARNING_EMOJI} Error loading {self.kind} {name}: {e}")
+            return None
+
+    def __getitem__(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            if name not in self._instances and name not in self._failed:
+                instance = self._load(name)
+                if instance is None:
+                    self._failed.add(name)
+                else:
+                    self._instances[name] = instance
+        if name not in self._instances:
+            raise KeyError(name)
+        return self._instances[name]
+
+    def __contains__(self, name: object) -> bool:
+        # plugins that failed to load are missing, as __getitem__ reports
+        if name in self._instances:
+            return True
+        return name not in self._failed and name in self._discover()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names())
+
+    def __len__(self) -> int:
+        return len(self.names())
+
+    def names(self) -> List[str]:
+        """
+        List the registered plugin names without loading any plugin.
+
+        Returns:
+            List[str]
+                Sorted plugin names
+        """
+        return sorted(set(self._discover()) | set(self._instances))
+
+    def register(self, name: str, instance: Any) -> None:
+        """
+        Register an already instantiated plugin under the given name.
+
+        Args:
+            name: str
+                Plugin name
+            instance: Any
+                Plugin instance
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._instances[name] = instance
+            self._failed.discard(name)
+
+    def is_loaded(self, name: str) -> bool:
+        """Return whether the named plugin has already been instantiated."""
+        return name in self._instances
@@ -1,61 +1,368 @@
+import ast
+import hashlib
+import json
 import os
 import sys
+import threading
 import importlib.util
 import yaml
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 from sfai.core.response_models import BaseResponse
-from sfai.core.agentforce.generator import custom_openapi
+from sfai.integrations.mulesoft.spec_extraction import extract_openapi
 from rich.console import Console
 
 console = Console()
 
+# written next to the generated spec, holds the hash it was generated from
+SOURCE_HASH_SUFFIX = ".source-hash"
+# distributions whose version changes the generated spec
+SPEC_GENERATOR_PACKAGES = ("sfai-sdk", "fastapi", "pydantic")
+# sources of the generator itself, for development installs
+SPEC_GENERATOR_FILES = (
+    Path(__file__).resolve().parents[2] / "core" / "agentforce" / "generator.py",
+    Path(__file__).resolve().parents[2] / "core" / "agentforce" / "helper.py",
+)
+
+
+# output formats of generated specs, Exchange accepts both
+SPEC_FORMATS = ("yaml", "json")
+
+# names whose use marks an AgentForce app, however they are imported
+AGENTFORCE_NAMES = ("agentforce_action", "AgentForceMetadata")
+# router/app decorators declaring a route, e.g. @app.get("/path")
+_ROUTE_METHODS = ("get", "post", "put", "patch", "delete", "head", "options")
+
+# Imports and AgentForce usages of each scanned module, keyed by (absolute
+# file path, app directory). Each entry remembers the (st_mtime_ns, st_size)
+# of the file it was parsed from and is discarded as soon as the file changes.
+_SCAN_CACHE: Dict[Tuple[str, str], Tuple[Tuple[int, int], "_ModuleScan"]] = {}
+_SCAN_CACHE_LOCK = threading.Lock()
+
+# the extracted schema only holds JSON types, so the safe dumper is enough and
+# libyaml's emitter is used when PyYAML was built with it
+_SpecDumperBase = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+class _NoAliasDumper(_SpecDumperBase):
+    """YAML dumper writing shared subtrees out in full instead of as aliases."""
+
+    def ignore_aliases(self, data):
+        return True
+
 
 def detect_agentforce_usage(app_file: str) -> bool:
     """
     Detect if a Python file uses AgentForce decorators.
 
+    The app and the local modules it imports are parsed, never imported,
+    see find_agentforce_usages.
+
     Args:
         app_file: Path to the Python application file
 
     Returns:
         True if AgentForce decorators are detected, False otherwise
     """
-    if not os.path.exists(app_file):
-        return False
+    return bool(find_agentforce_usages(app_file))
+
+
+def find_agentforce_usages(app_file: str) -> List[Dict[str, Any]]:
+    """
+    Find the AgentForce decorators and metadata used by an app.
+
+    app_file and the modules below its directory that it imports directly or
+    indirectly are parsed with ast, so names in comments or strings don't
+    count and routers defined in other modules do. Parse results are cached
+    per file until it changes. A module that doesn't parse is searched for
+    the names as text instead.
 
+    Args:
+        app_file: Path to the Python application file
+
+    Returns:
+        One dict per usage with file (relative to the app directory), line,
+        kind ("action", "metadata" or "text"), function and route, e.g.
+        "POST /forecast", the last two None when unknown
+    """
+    if not os.path.isfile(app_file):
+        return []
+
+    app_path = Path(app_file).resolve()
+    app_dir = app_path.parent
+    usages = []
+    for file in _local_modules(app_path, app_dir):
+        relative = Path(os.path.relpath(file, app_dir)).as_posix()
+        for usage in _scan_module(file, app_dir).usages:
+            usages.append({"file": relative, **usage})
+    return usages
+
+
+class _ModuleScan:
+    """Local imports and AgentForce usages found in one module."""
+
+    def __init__(self, imports: List[Path], usages: List[Dict[str, Any]]):
+        self.imports = imports
+        self.usages = usages
+
+
+def _scan_module(file: Path, app_dir: Path) -> _ModuleScan:
+    """Parse a module once per version of the file."""
+    try:
+        stat = file.stat()
+    except OSError:
+        return _ModuleScan([], [])
+
+    # taken before reading, a concurrent write only makes the entry stale
+    signature = (stat.st_mtime_ns, stat.st_size)
+    key = (str(file), str(app_dir))
+    cached = _SCAN_CACHE.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    source = _read_bytes(file) or b""
     try:
-        with open(app_file, "r", encoding="utf-8") as f:
-            content = f.read()
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError) as e:
+        console.print(f"[yellow]Warning: Could not parse {file}: {e}[/]")
+        scan = _ModuleScan([], _text_usages(source))
+    else:
+        imports = []
+        for node in ast.walk(tree):
+            for files in _imported_modules(node, file, app_dir):
+                imports.extend(files)
+        scan = _ModuleScan(imports, _agentforce_usages(tree))
+
+    with _SCAN_CACHE_LOCK:
+        _SCAN_CACHE[key] = (signature, scan)
+    return scan
+
+
+def _agentforce_usages(tree: ast.Module) -> List[Dict[str, Any]]:
+    """Decorated functions and AgentForceMetadata calls of a parsed module."""
+    # local names of the AgentForce names, e.g. "from ... import X as Y"
+    aliases = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if alias.name in AGENTFORCE_NAMES:
+                    aliases[alias.asname or alias.name] = alias.name
+
+    usages = []
+    # (node, enclosing function)
+    pending: List[Tuple[ast.AST, Optional[str]]] = [(tree, None)]
+    while pending:
+        node, function = pending.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            route = _route(node.decorator_list)
+            for decorator in node.decorator_list:
+                target = decorator
+                if isinstance(decorator, ast.Call):
+                    target = decorator.func
+                if _agentforce_name(target, aliases) == "agentforce_action":
+                    usages.append(_usage(decorator, "action", node.name, route))
+            # the signature holds Annotated[..., AgentForceMetadata(...)]
+            children = [node.args, node.returns, *node.body]
+            pending.extend((child, node.name) for child in children if child)
+            continue
+        if isinstance(node, ast.Call):
+            name = _agentforce_name(node.func, aliases)
+            if name == "AgentForceMetadata":
+                usages.append(_usage(node, "metadata", function, None))
+            elif name == "agentforce_action":
+                # applied without decorator syntax, app.post(...)(action(fn))
+                usages.append(_usage(node, "action", function, None))
+        pending.extend((child, function) for child in ast.iter_child_nodes(node))
+    return sorted(usages, key=lambda usage: usage["line"])
+
+
+def _agentforce_name(node: ast.AST, aliases: Dict[str, str]) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        if node.id in aliases:
+            return aliases[node.id]
+        return node.id if node.id in AGENTFORCE_NAMES else None
+    if isinstance(node, ast.Attribute) and node.attr in AGENTFORCE_NAMES:
+        return node.attr
+    return None
+
+
+def _route(decorators: List[ast.expr]) -> Optional[str]:
+    """Return "METHOD /path" of the first route decorator, if any."""
+    for decorator in decorators:
+        if not (
+            isinstance(decorator, ast.Call)
+            and isinstance(decorator.func, ast.Attribute)
+            and decorator.func.attr in _ROUTE_METHODS
+            and decorator.args
+            and isinstance(decorator.args[0], ast.Constant)
+            and isinstance(decorator.args[0].value, str)
+        ):
+            continue
+        return f"{decorator.func.attr.upper()} {decorator.args[0].value}"
+    return None
+
+
+def _usage(
+    node: ast.AST, kind: str, function: Optional[str], route: Optional[str]
+) -> Dict[str, Any]:
+    return {"line": node.lineno, "kind": kind, "function": function, "route": route}
+
+
+def _text_usages(source: bytes) -> List[Dict[str, Any]]:
+    """Lines mentioning the AgentForce names, for modules that don't parse."""
+    usages = []
+    for line, text in enumerate(source.decode("utf-8", "replace").splitlines(), 1):
+        if any(name in text for name in AGENTFORCE_NAMES):
+            usages.append(
+                {"line": line, "kind": "text", "function": None, "route": None}
+            )
+    return usages
 
-        # Quick string search first (fast check)
-        agentforce_indicators = [
-            "agentforce_action",
-            "AgentForceMetadata",
-            "sfai.core.agentforce",
-        ]
 
-        for indicator in agentforce_indicators:
-            if indicator in content:
-                return True
+def spec_output_file(app_file: str, spec_format: str = "yaml") -> str:
+    """Return the path of the spec generated for an app file."""
+    return os.path.join(os.path.dirname(app_file), f"openapi.{spec_format}")
 
-        return False
 
-    except Exception as e:
-        console.print(f"[yellow]Warning: Could not parse {app_file}: {e}[/]")
-        return False
+def spec_format_of(oas_file: str) -> str:
+    """Return the format of a spec file from its extension."""
+    return "json" if oas_file.lower().endswith(".json") else "yaml"
+
+
+def write_openapi_spec(openapi_schema: dict, output_file: str) -> None:
+    """
+    Write an OpenAPI schema as YAML or JSON, depending on the file extension.
+
+    The document is emitted straight into the file rather than built as one
+    string first, inlined specs run to several megabytes.
 
+    Args:
+        openapi_schema: OpenAPI schema holding only JSON types
+        output_file: Path of the .yaml or .json file to write
+    """
+    with open(output_file, "w", encoding="utf-8") as f:
+        if spec_format_of(output_file) == "json":
+            json.dump(openapi_schema, f, indent=2)
+            return
+        # the inlined schemas share resolved components
+        yaml.dump(
+            openapi_schema,
+            f,
+            Dumper=_NoAliasDumper,
+            default_flow_style=False,
+            sort_keys=False,
+        )
 
-def generate_openapi_from_app(app_file: str = "app.py") -> BaseResponse:
+
+def app_source_hash(app_file: str) -> str:
+    """
+    Hash everything the spec generated from an app depends on.
+
+    That is the app file, the local modules it imports directly or
+    indirectly, and the versions of sfai, FastAPI and pydantic.
+
+    Args:
+        app_file: Path to the FastAPI application file
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for package in SPEC_GENERATOR_PACKAGES:
+        try:
+            digest.update(f"{package}=={version(package)}\0".encode())
+        except PackageNotFoundError:
+            digest.update(f"{package}\0".encode())
+    for file in SPEC_GENERATOR_FILES:
+        digest.update(_read_bytes(file) or b"")
+
+    app_dir = Path(app_file).resolve().parent
+    for file in _local_modules(Path(app_file).resolve(), app_dir):
+        relative = Path(os.path.relpath(file, app_dir)).as_posix()
+        digest.update(f"\0{relative}\0".encode())
+        digest.update(_read_bytes(file) or b"")
+    return digest.hexdigest()
+
+
+def _read_bytes(file: Path) -> Optional[bytes]:
+    try:
+        return file.read_bytes()
+    except OSError:
+        return None
+
+
+def _local_modules(app_file: Path, app_dir: Path) -> List[Path]:
+    """Return app_file and the modules below app_dir it imports, sorted."""
+    found = set()
+    pending = [app_file]
+    while pending:
+        file = pending.pop()
+        if file in found:
+            continue
+        found.add(file)
+        pending.extend(_scan_module(file, app_dir).imports)
+    return sorted(found)
+
+
+def _imported_modules(node: ast.AST, file: Path, app_dir: Path) -> List[List[Path]]:
+    if isinstance(node, ast.Import):
+        return [_module_files(app_dir, alias.name) for alias in node.names]
+    if not isinstance(node, ast.ImportFrom):
+        return []
+    base = app_dir
+    if node.level:
+        base = file.parent
+        for _ in range(node.level - 1):
+            base = base.parent
+    module = node.module or ""
+    # "from package import name" may import the submodule package/name
+    names = [f"{module}.{alias.name}".lstrip(".") for alias in node.names]
+    return [_module_files(base, name) for name in [module, *names] if name]
+
+
+def _module_files(base: Path, name: str) -> List[Path]:
+    """Files of a local module and its parent packages, empty if not local."""
+    files = []
+    path = base
+    for part in name.split("."):
+        path = path / part
+        init = path / "__init__.py"
+        if init.is_file():
+            files.append(init)
+    module = path.with_suffix(".py")
+    if module.is_file():
+        files.append(module)
+    elif not (path / "__init__.py").is_file():
+        return []
+    return files
+
+
+def generate_openapi_from_app(
+    app_file: str = "app.py", force: bool = False, spec_format: str = "yaml"
+) -> BaseResponse:
     """
     Generate OpenAPI spec from a FastAPI app with AgentForce decorators.
 
+    The spec is only regenerated when the app, its local imports or the
+    generator changed since it was last written, see app_source_hash.
+
     Args:
         app_file: Path to the FastAPI application file
+        force: Regenerate even if the spec is up to date
+        spec_format: Write openapi.yaml ("yaml") or openapi.json ("json")
 
     Returns:
-        BaseResponse indicating success/failure and generated file path
+        BaseResponse indicating success/failure and generated file path,
+        data.regenerated is False when the existing spec was kept
     """
+    if spec_format not in SPEC_FORMATS:
+        return BaseResponse(
+            success=False,
+            error=f"Unsupported spec format {spec_format}, use yaml or json",
+        )
+
     if not os.path.exists(app_file):
         return BaseResponse(
             success=False, error=f"Application file {app_file} not found"
@@ -70,35 +377,47 @@ def generate_openapi_from_app(app_file: str = "app.py") -> BaseResponse:
             ),
         )
 
-    try:
-        # Import the app module dynamically
-        app_module = _import_app_module(app_file)
-        if not app_module:
-            return BaseResponse(
-                success=False, error=f"Could not import FastAPI app from {app_file}"
-            )
+    output_file = spec_output_file(app_file, spec_format)
+    hash_file = Path(output_file + SOURCE_HASH_SUFFIX)
+    source_hash = app_source_hash(app_file)
+    if (
+        not force
+        and os.path.exists(output_file)
+        and (_read_bytes(hash_file) or b"").decode() == source_hash
+    ):
+        return BaseResponse(
+            success=True,
+            message=f"OpenAPI spec is up to date: {output_file}",
+            data={"openapi_file": output_file, "regenerated": False},
+        )
 
-        # Get the FastAPI app instance
-        app = getattr(app_module, "app", None)
-        if not app:
-            return BaseResponse(
-                success=False, error="No 'app' FastAPI instance found in the module"
-            )
+    # the app is imported in a separate process, or not at all when its
+    # schema is cached
+    extraction = extract_openapi(app_file, source_hash)
+    if not extraction.success:
+        output = (extraction.data or {}).get("output")
+        if output:
+            console.print(output, markup=False, highlight=False)
+        return BaseResponse(
+            success=False,
+            error=f"Failed to generate OpenAPI spec: {extraction.error}",
+        )
+    openapi_schema = extraction.data["openapi"]
 
-        # Generate OpenAPI schema with AgentForce extensions
-        openapi_schema = custom_openapi(app)
+    try:
+        # Save next to the app, the hash is written last so an interrupted
+        # write is regenerated next time
+        hash_file.unlink(missing_ok=True)
+        write_openapi_spec(openapi_schema, output_file)
 
-        # Save to openapi.yaml
-        output_file = "openapi.yaml"
-        with open(output_file, "w", encoding="utf-8") as f:
-            yaml.dump(openapi_schema, f, default_flow_style=False, sort_keys=False)
+        hash_file.write_text(source_hash)
 
         console.print(f"[green]✓ Generated OpenAPI spec: {output_file}[/]")
 
         return BaseResponse(
             success=True,
             message=f"OpenAPI spec generated successfully: {output_file}",
-            data={"openapi_file": output_file},
+            data={"openapi_file": output_file, "regenerated": True},
         )
 
     except Exception as e:
@@ -144,7 +463,7 @@ def validate_generated_openapi(openapi_file: str) -> BaseResponse:
     Validate that the generated OpenAPI file has required AgentForce extensions.
 
     Args:
-        openapi_file: Path to the OpenAPI YAML file
+        openapi_file: Path to the OpenAPI YAML or JSON file
 
     Returns:
         BaseResponse indicating validation result
@@ -156,7 +475,10 @@ def validate_generated_openapi(openapi_file: str) -> BaseResponse:
 
     try:
         with open(openapi_file, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+            if spec_format_of(openapi_file) == "json":
+                data = json.load(f)
+            else:
+                data = yaml.safe_load(f)
 
         # Check for required AgentForce extensions
         if "x-sfdc" not in data:
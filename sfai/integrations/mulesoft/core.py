@@ -1,9 +1,80 @@
-import requests
+import json
+import logging
 import time
-from requests.auth import HTTPBasicAuth
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
 from typing import Any, Optional
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
+
+from sfai.constants import MULESOFT_TOKEN_CACHE_DIR
+from sfai.context.storage import atomic_write_text
+from sfai.core.polling import poll
 from sfai.core.response_models import BaseResponse
 
+# (connect, read) timeouts in seconds for every Anypoint request
+REQUEST_TIMEOUT = (10, 60)
+# Refresh cached tokens this many seconds before they expire
+TOKEN_EXPIRY_MARGIN = 60
+# Concurrent API detail requests when looking up an existing API
+MAX_LOOKUP_WORKERS = 8
+# Seconds to wait for an Exchange publication and a gateway deployment
+PUBLICATION_TIMEOUT = 300.0
+DEPLOYMENT_TIMEOUT = 300.0
+# API Manager statuses of an API the gateway has not applied yet
+DEPLOYMENT_PENDING_STATUSES = {"pending", "unregistered"}
+
+logger = logging.getLogger(__name__)
+
+
+class _AnypointRetry(Retry):
+    """Retry policy for transient Anypoint errors.
+
+    429 and 503 mean the request was not processed and are retried for every
+    method, 502 and 504 only for idempotent ones since the request may have
+    reached Anypoint.
+    """
+
+    SAFE_TO_REPEAT = frozenset({429, 503})
+
+    def is_retry(
+        self, method: str, status_code: int, has_retry_after: bool = False
+    ) -> bool:
+        if status_code in self.SAFE_TO_REPEAT and self.total:
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+@lru_cache(maxsize=None)
+def _get_session() -> requests.Session:
+    """Get the process wide HTTP session, pooling connections to Anypoint."""
+    retry = _AnypointRetry(
+        total=4,
+        backoff_factor=0.5,
+        status_forcelist=(429, 502, 503, 504),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(max_retries=retry))
+    session.mount("http://", HTTPAdapter(max_retries=retry))
+    return session
+
+
+def _proxy_uri(api: dict[str, Any]) -> Optional[str]:
+    """Return the proxy URI of an API instance, None if it is not included."""
+    endpoint = api.get("endpoint")
+    if isinstance(endpoint, dict) and "proxyUri" in endpoint:
+        return endpoint["proxyUri"] or ""
+    if "proxyUri" in api:
+        return api["proxyUri"] or ""
+    return None
+
 
 class MulesoftAPI:
     """
@@ -14,6 +85,8 @@ class MulesoftAPI:
         environment_id: API environment ID
         client_id: Connected app `id`
         client_secret: Connected app `secret`
+        profile: MuleSoft profile name, its access token is cached on disk
+            and reused until it expires
     """
 
     base_url = "https://anypoint.mulesoft.com"
@@ -24,28 +97,49 @@ class MulesoftAPI:
         environment_id: str,
         client_id: str,
         client_secret: str,
+        profile: Optional[str] = None,
     ):
         self._org_id = org_id
         self._environment_id = environment_id
         self._client_id = client_id
         self._client_secret = client_secret
+        self._profile = profile
+        self._session = _get_session()
+        self._token = None
+        # lookups memoized for the client's lifetime, i.e. one publish run
+        self._api_details: dict[Any, dict[str, Any]] = {}
+        self._existing_apis: dict[tuple[str, str], Optional[dict[str, Any]]] = {}
+        self._deployments: dict[Any, list[dict[str, Any]]] = {}
 
-        auth_result = self._authorize()
-        if isinstance(auth_result, BaseResponse):
-            self.auth_error = auth_result
-            self._session = None
-        else:
-            self._session = auth_result
-            self.auth_error = None
+        self.auth_error = self._authorize()
 
     def _check_auth(self) -> Optional[BaseResponse]:
         if self.auth_error:
             return self.auth_error
         return None
 
-    def _authorize(self) -> BaseResponse:
-        """Get oauth token for subsequent API calls."""
-        response = requests.post(
+    @property
+    def _token_file(self) -> Optional[Path]:
+        if not self._profile:
+            return None
+        return MULESOFT_TOKEN_CACHE_DIR / f"{self._profile}.json"
+
+    def _authorize(self, refresh: bool = False) -> Optional[BaseResponse]:
+        """
+        Get an oauth token for subsequent API calls.
+
+        Args:
+            refresh: Ignore the cached token and request a new one
+
+        Returns:
+            None on success, otherwise the authorization error
+        """
+        if not refresh:
+            self._token = self._load_token()
+            if self._token:
+                return None
+
+        response = self._session.post(
             f"{self.base_url}/accounts/api/v2/oauth2/token",
             auth=HTTPBasicAuth(
                 username="~~~Client~~~",
@@ -57,6 +151,7 @@ class MulesoftAPI:
                 "client_secret": self._client_secret,
                 "grant_type": "client_credentials",
             },
+            timeout=REQUEST_TIMEOUT,
         )
         if response.status_code != 200:
             try:
@@ -67,12 +162,47 @@ class MulesoftAPI:
                 success=False,
                 message=f"Authorization failed: {error_msg}",
             )
-        token = response.json()["access_token"]
-        session = requests.Session()
-        session.headers = {
-            "authorization": f"Bearer {token}",
-        }
-        return session
+        data = response.json()
+        self._token = data["access_token"]
+        if data.get("expires_in"):
+            self._save_token(time.time() + float(data["expires_in"]))
+        return None
+
+    def _load_token(self) -> Optional[str]:
+        token_file = self._token_file
+        if token_file is None:
+            return None
+        try:
+            cached = json.loads(token_file.read_text())
+        except (OSError, ValueError):
+            return None
+        # tokens of a previous connected app are not reused
+        if cached.get("client_id") != self._client_id:
+            return None
+        if cached.get("expires_at", 0) - TOKEN_EXPIRY_MARGIN <= time.time():
+            return None
+        return cached.get("access_token")
+
+    def _save_token(self, expires_at: float) -> None:
+        token_file = self._token_file
+        if token_file is None:
+            return
+        try:
+            token_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            atomic_write_text(
+                token_file,
+                json.dumps(
+                    {
+                        "client_id": self._client_id,
+                        "access_token": self._token,
+                        "expires_at": expires_at,
+                    }
+                ),
+                mode=0o600,
+            )
+        except OSError:
+            # the token still works for this client, it is just not reused
+            pass
 
     def _make_api_call(
         self,
@@ -85,6 +215,9 @@ class MulesoftAPI:
         """
         Wrapper around MuleSoft API calls.
 
+        Transient errors (429, 5xx) are retried with backoff, honouring
+        Retry-After. A 401 refreshes the access token and retries once.
+
         Args:
             path: URL Path to call
             method: HTTP Method
@@ -96,17 +229,34 @@ class MulesoftAPI:
             JSON response from API
         """
         url = f"{self.base_url}/{path}"
-        print(f"Calling: {url=}")
-        response = self._session.request(
-            method, url, headers=headers, json=body, files=files
-        )
+        logger.debug("Calling %s %s", method.upper(), url)
+        response = self._request(method, url, headers, body, files)
+        if response.status_code == 401 and self._authorize(refresh=True) is None:
+            response = self._request(method, url, headers, body, files)
         try:
             response.raise_for_status()
         except requests.HTTPError:
-            print(response.json())
+            logger.debug("Anypoint error response: %s", response.text)
             raise
         return response.json()
 
+    def _request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict],
+        body: Optional[dict],
+        files: Optional[dict],
+    ) -> requests.Response:
+        return self._session.request(
+            method,
+            url,
+            headers={"authorization": f"Bearer {self._token}", **(headers or {})},
+            json=body,
+            files=files,
+            timeout=REQUEST_TIMEOUT,
+        )
+
     def search_exchange_assets(
         self, name_filter: Optional[str] = None
     ) -> list[dict[str, Any]]:
@@ -149,6 +299,7 @@ class MulesoftAPI:
         oas_file: str,
         tags: Optional[list[str]] = None,
         description: str = "",
+        timeout: float = PUBLICATION_TIMEOUT,
     ) -> dict[str, Any]:
         """
         Publish an asset to Exchange.
@@ -156,52 +307,86 @@ class MulesoftAPI:
         Args:
             name: Asset Name
             version: Asset version
-            oas_file: Open API Specification file (yaml format)
+            oas_file: Open API Specification file (yaml or json format)
             tags: List of API tags
             description: API Description
+            timeout: Seconds to wait for the publication to finish
 
         Returns:
             Created Asset
+
+        Raises:
+            PollTimeoutError: If the publication is still running at the timeout
         """
         tags = tags or []
+        packaging = "json" if oas_file.lower().endswith(".json") else "yaml"
         response = self._make_api_call(
             f"exchange/api/v2/organizations/{self._org_id}/assets/{self._org_id}/{name}/{version}",
             "post",
             files={
-                "files.oas.yaml": (oas_file.split("/")[-1], open(oas_file, "rb")),
+                f"files.oas.{packaging}": (
+                    oas_file.rsplit("/", maxsplit=1)[-1],
+                    Path(oas_file).read_bytes(),
+                ),
                 "name": (None, name),
                 "description": (None, description),
                 "type": (None, "oas"),
-                "properties.apiVersion": (None, f"v{version.split('.')[0]}"),
-                "properties.mainFile": (None, oas_file.split("/")[-1]),
+                "properties.apiVersion": (
+                    None,
+                    f"v{version.split('.', maxsplit=1)[0]}",
+                ),
+                "properties.mainFile": (None, oas_file.rsplit("/", maxsplit=1)[-1]),
                 "tags": (None, ",".join(tags)),
             },
         )
         status_link = response["publicationStatusLink"]
-        while True:
-            publication_status = self._make_api_call(
+        publication_status = poll(
+            lambda: self._make_api_call(
                 status_link.removeprefix(f"{self.base_url}/"), "get"
-            )
-            print(f"Publication status check: {publication_status}")  # Debug logging
-            if publication_status["status"] != "running":
-                break
-            time.sleep(1)
-        print(f"Final publication status: {publication_status}")  # Debug logging
+            ),
+            lambda status: status["status"] != "running",
+            description=f"Exchange publication of {name} {version}",
+            timeout=timeout,
+        )
+        logger.debug(f"Final publication status: {publication_status}")
         return publication_status
 
-    def list_published_apis(self) -> list[dict[str, Any]]:
-        """List published APIs."""
+    def list_published_apis(self, asset_id: Optional[str] = None) -> dict[str, Any]:
+        """
+        List published APIs.
+
+        Args:
+            asset_id: Only list the instances of this Exchange asset
+
+        Returns:
+            Published APIs grouped by asset
+        """
+        query = f"?{urlencode({'assetId': asset_id})}" if asset_id else ""
         return self._make_api_call(
-            f"apimanager/api/v1/organizations/{self._org_id}/environments/{self._environment_id}/apis",
+            f"apimanager/api/v1/organizations/{self._org_id}/environments/{self._environment_id}/apis{query}",
             "get",
         )
 
+    def _get_api(self, api_id: Any) -> dict[str, Any]:
+        """Get the details of an API instance, cached for the client's lifetime."""
+        if api_id not in self._api_details:
+            self._api_details[api_id] = self._make_api_call(
+                f"apimanager/api/v1/organizations/{self._org_id}/environments/{self._environment_id}/apis/{api_id}",
+                "get",
+            )
+        return self._api_details[api_id]
+
     def _find_existing_api(
         self, name: str, endpoint_path: str
     ) -> Optional[dict[str, Any]]:
         """
         Find an existing API based on name and endpoint path.
 
+        The listing is filtered by asset server side. Instances whose listing
+        already exposes the proxy URI are matched directly, the details of
+        the others are fetched concurrently. Results are remembered for the
+        rest of the client's lifetime.
+
         Args:
             name: Name of the API
             endpoint_path: Path of the API endpoint
@@ -209,26 +394,41 @@ class MulesoftAPI:
         Returns:
             Existing API details if found, None otherwise
         """
-        published_apis = self.list_published_apis()
-
-        # Look through assets for matching name
-        for asset in published_apis.get("assets", []):
-            if asset.get("exchangeAssetName") == name:
-                # Look through APIs for matching endpoint path
-                for api_instance in asset.get("apis", []):
-                    # We need to check the endpoint.proxyUri path
-                    api_details = self._make_api_call(
-                        f"apimanager/api/v1/organizations/{self._org_id}/environments/{self._environment_id}/apis/{api_instance['id']}",
-                        "get",
-                    )
-                    if (
-                        api_details.get("endpoint", {})
-                        .get("proxyUri", "")
-                        .endswith(f"/{endpoint_path}")
-                    ):
-                        return api_details
-
-        return None
+        key = (name, endpoint_path)
+        if key in self._existing_apis:
+            return self._existing_apis[key]
+
+        published_apis = self.list_published_apis(asset_id=name)
+        instances = [
+            api_instance
+            for asset in published_apis.get("assets", [])
+            # older API Manager versions ignore the filter
+            if name in (asset.get("exchangeAssetName"), asset.get("assetId"))
+            for api_instance in asset.get("apis", [])
+        ]
+
+        unresolved = []
+        for api_instance in instances:
+            proxy_uri = _proxy_uri(api_instance)
+            if proxy_uri is None:
+                unresolved.append(api_instance["id"])
+            elif proxy_uri.endswith(f"/{endpoint_path}"):
+                self._existing_apis[key] = self._get_api(api_instance["id"])
+                return self._existing_apis[key]
+
+        found = None
+        if unresolved:
+            with ThreadPoolExecutor(
+                max_workers=min(MAX_LOOKUP_WORKERS, len(unresolved))
+            ) as pool:
+                # map keeps the listing order, the first match wins
+                for api_details in pool.map(self._get_api, unresolved):
+                    if (_proxy_uri(api_details) or "").endswith(f"/{endpoint_path}"):
+                        found = api_details
+                        break
+
+        self._existing_apis[key] = found
+        return found
 
     def publish_api(
         self,
@@ -255,53 +455,68 @@ class MulesoftAPI:
         Returns:
             Published API details
         """
+        body = {
+            "technology": "flexGateway",
+            "endpointUri": endpoint_uri,
+            "providerId": None,
+            "spec": {
+                "groupId": self._org_id,
+                "assetId": name,
+                "version": version,
+            },
+            "endpoint": {
+                "deploymentType": "HY",
+                "isCloudHub": None,
+                "uri": implementation_uri,
+                "proxyUri": f"http://localhost:8081/{endpoint_path}",
+            },
+        }
         existing_api = self._find_existing_api(name, endpoint_path)
         if existing_api:
             # If exists, update the existing API with the new version
             print(f"Updating existing API with ID: {existing_api['id']}")
-            return self._make_api_call(
+            api = self._make_api_call(
                 f"apimanager/api/v1/organizations/{self._org_id}/environments/{self._environment_id}/apis/{existing_api['id']}",
                 "patch",
-                body={
-                    "technology": "flexGateway",
-                    "endpointUri": endpoint_uri,
-                    "providerId": None,
-                    "spec": {
-                        "groupId": self._org_id,
-                        "assetId": name,
-                        "version": version,
-                    },
-                    "endpoint": {
-                        "deploymentType": "HY",
-                        "isCloudHub": None,
-                        "uri": implementation_uri,
-                        "proxyUri": f"http://localhost:8081/{endpoint_path}",
-                    },
-                },
+                body=body,
             )
         else:
             # If doesn't exist, create a new API
-            return self._make_api_call(
+            api = self._make_api_call(
                 f"apimanager/api/v1/organizations/{self._org_id}/environments/{self._environment_id}/apis",
                 "post",
-                body={
-                    "technology": "flexGateway",
-                    "endpointUri": endpoint_uri,
-                    "providerId": None,
-                    "spec": {
-                        "groupId": self._org_id,
-                        "assetId": name,
-                        "version": version,
-                    },
-                    "endpoint": {
-                        "deploymentType": "HY",
-                        "isCloudHub": None,
-                        "uri": implementation_uri,
-                        "proxyUri": f"http://localhost:8081/{endpoint_path}",
-                    },
-                },
+                body=body,
             )
 
+        self._existing_apis[(name, endpoint_path)] = api
+        if "id" in api:
+            self._api_details[api["id"]] = api
+        return api
+
+    def list_deployments(self, api_id: Any) -> list[dict[str, Any]]:
+        """
+        List the gateway deployments of an API, cached for the client's lifetime.
+
+        Args:
+            api_id: ID of the API
+
+        Returns:
+            Deployments of the API, empty if it was never deployed
+        """
+        if api_id not in self._deployments:
+            try:
+                deployments = self._make_api_call(
+                    f"proxies/xapi/v1/organizations/{self._org_id}/environments/{self._environment_id}/apis/{api_id}/deployments",
+                    "get",
+                )
+            except requests.HTTPError as e:
+                # If we get a 404, it means no deployments exist yet
+                if e.response.status_code != 404:
+                    raise
+                deployments = []
+            self._deployments[api_id] = deployments or []
+        return self._deployments[api_id]
+
     def deploy_api(
         self,
         api_id: str,
@@ -319,37 +534,24 @@ class MulesoftAPI:
         Returns:
             Published API details
         """
-        # First check if a deployment already exists
-        try:
-            existing_deployments = self._make_api_call(
-                f"proxies/xapi/v1/organizations/{self._org_id}/environments/{self._environment_id}/apis/{api_id}/deployments",
-                "get",
-            )
-
-            # If we have existing deployments, handle them
-            if existing_deployments and len(existing_deployments) > 0:
-                # Find deployment on this target
-                for deployment in existing_deployments:
-                    if deployment and deployment.get("targetId") == gateway_id:
-                        deployment_id = deployment.get("id")
-                        print(
-                            f"Found existing deployment with ID: {deployment_id}, "
-                            f"updating instead of creating new"
-                        )
-
-                        # Update the existing deployment
-                        return self._make_api_call(
-                            f"proxies/xapi/v1/organizations/{self._org_id}/environments/{self._environment_id}/apis/{api_id}/deployments/{deployment_id}",
-                            "patch",
-                            body={"gatewayVersion": gateway_version},
-                        )
-        except requests.HTTPError as e:
-            # If we get a 404, it means no deployments exist yet
-            if e.response.status_code != 404:
-                raise
+        # First check if a deployment already exists on this target
+        for deployment in self.list_deployments(api_id):
+            if deployment and deployment.get("targetId") == gateway_id:
+                deployment_id = deployment.get("id")
+                print(
+                    f"Found existing deployment with ID: {deployment_id}, "
+                    f"updating instead of creating new"
+                )
+
+                # Update the existing deployment
+                return self._make_api_call(
+                    f"proxies/xapi/v1/organizations/{self._org_id}/environments/{self._environment_id}/apis/{api_id}/deployments/{deployment_id}",
+                    "patch",
+                    body={"gatewayVersion": gateway_version},
+                )
 
         # If there's no deployment for this specific target, create a new one
-        return self._make_api_call(
+        deployment = self._make_api_call(
             f"proxies/xapi/v1/organizations/{self._org_id}/environments/{self._environment_id}/apis/{api_id}/deployments",
             "post",
             body={
@@ -359,3 +561,31 @@ class MulesoftAPI:
                 "environmentId": self._environment_id,
             },
         )
+        self._deployments[api_id] = [*self._deployments[api_id], deployment]
+        return deployment
+
+    def wait_for_deployment(
+        self, api_id: Any, timeout: float = DEPLOYMENT_TIMEOUT
+    ) -> dict[str, Any]:
+        """
+        Wait until the gateway has applied a deployed API.
+
+        Args:
+            api_id: ID of the deployed API
+            timeout: Seconds to wait for the API to become active
+
+        Returns:
+            API details once its status is no longer pending
+
+        Raises:
+            PollTimeoutError: If the API is still pending at the timeout
+        """
+        return poll(
+            lambda: self._make_api_call(
+                f"apimanager/api/v1/organizations/{self._org_id}/environments/{self._environment_id}/apis/{api_id}",
+                "get",
+            ),
+            lambda api: api.get("status") not in DEPLOYMENT_PENDING_STATUSES,
+            description=f"deployment of API {api_id}",
+            timeout=timeout,
+        )
@@ -0,0 +1,210 @@
+import asyncio
+import inspect
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class StageError(Exception):
+    """Raised by a stage to fail with a message meant for the user."""
+
+
+class _Skipped(Exception):
+    """Raised in place of a stage whose dependency failed."""
+
+
+class Stage:
+    """
+    One step of a publish pipeline.
+
+    Args:
+        name: str
+            Unique stage name, its result is stored under this key
+        run: Callable[[Dict[str, Any]], Any]
+            Receives the results of the finished stages. Plain functions run
+            in a worker thread, coroutine functions on the event loop
+        after: Iterable[str]
+            Names of the stages that must finish first
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[Dict[str, Any]], Any],
+        after: Iterable[str] = (),
+    ):
+        self.name = name
+        self.run = run
+        self.after = tuple(after)
+
+
+class PipelineResult:
+    """
+    Outcome of a pipeline run.
+
+    Args:
+        results: Dict[str, Any]
+            Result of every stage that finished
+        timings: Dict[str, Dict[str, float]]
+            "start" offset and "duration" in seconds of the stages that ran
+        elapsed: float
+            Wall time of the whole run in seconds
+        failed_stage: Optional[str]
+            Name of the stage that raised, None on success
+        error: Optional[BaseException]
+            The exception it raised
+        skipped: Optional[List[str]]
+            Stages not run because a dependency failed or was cancelled
+    """
+
+    def __init__(
+        self,
+        results: Dict[str, Any],
+        timings: Dict[str, Dict[str, float]],
+        elapsed: float,
+        failed_stage: Optional[str] = None,
+        error: Optional[BaseException] = None,
+        skipped: Optional[List[str]] = None,
+    ):
+        self.results = results
+        self.timings = timings
+        self.elapsed = elapsed
+        self.failed_stage = failed_stage
+        self.error = error
+        self.skipped = skipped or []
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+async def run_stages_async(stages: List[Stage]) -> PipelineResult:
+    """
+    Run stages concurrently, each one as soon as its dependencies finished.
+
+    A failing stage does not stop the stages independent of it, those that
+    depend on it are skipped.
+
+    Args:
+        stages: List[Stage]
+            Stages to run, dependencies must refer to stages in the list
+
+    Returns:
+        PipelineResult
+            Results, timings and the first error
+
+    Raises:
+        ValueError
+            If a dependency is unknown or the dependencies form a cycle
+    """
+    order = _check_graph(stages)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    results: Dict[str, Any] = {}
+    timings: Dict[str, Dict[str, float]] = {}
+    tasks: Dict[str, "asyncio.Task[Any]"] = {}
+
+    async def run(stage: Stage) -> Any:
+        for name in stage.after:
+            try:
+                await tasks[name]
+            except (Exception, asyncio.CancelledError):
+                raise _Skipped(name) from None
+        began = loop.time()
+        try:
+            if inspect.iscoroutinefunction(stage.run):
+                result = await stage.run(results)
+            else:
+                result = await asyncio.to_thread(stage.run, results)
+        finally:
+            timings[stage.name] = {
+                "start": began - start,
+                "duration": loop.time() - began,
+            }
+        results[stage.name] = result
+        return result
+
+    for stage in order:
+        tasks[stage.name] = asyncio.create_task(run(stage), name=f"stage:{stage.name}")
+    await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    failures = []
+    skipped = []
+    for name, task in tasks.items():
+        outcome = asyncio.CancelledError() if task.cancelled() else task.exception()
+        if isinstance(outcome, _Skipped):
+            skipped.append(name)
+        elif outcome is not None:
+            # a stage cancelled before it started has no timings, it sorts
+            # after the stages that ran
+            began = timings[name]["start"] if name in timings else float("inf")
+            failures.append((began, name, outcome))
+    failed_stage, error = None, None
+    if failures:
+        _, failed_stage, error = min(failures, key=lambda failure: failure[0])
+    return PipelineResult(
+        results, timings, loop.time() - start, failed_stage, error, skipped
+    )
+
+
+def run_stages(stages: List[Stage]) -> PipelineResult:
+    """
+    Run stages from synchronous code, see run_stages_async.
+
+    Works from inside a running event loop too (e.g. a notebook), the
+    pipeline then gets its own loop in a helper thread.
+
+    Args:
+        stages: List[Stage]
+            Stages to run
+
+    Returns:
+        PipelineResult
+            Results, timings and the first error
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run_stages_async(stages))
+
+    outcome: List[Tuple[Optional[PipelineResult], Optional[BaseException]]] = []
+
+    def target() -> None:
+        try:
+            outcome.append((asyncio.run(run_stages_async(stages)), None))
+        except BaseException as e:  # re-raised in the calling thread
+            outcome.append((None, e))
+
+    thread = threading.Thread(target=target, name="sfai-pipeline")
+    thread.start()
+    thread.join()
+    result, error = outcome[0]
+    if error:
+        raise error
+    return result
+
+
+def _check_graph(stages: List[Stage]) -> List[Stage]:
+    """Return the stages in dependency order, validating names and cycles."""
+    by_name = {stage.name: stage for stage in stages}
+    if len(by_name) != len(stages):
+        raise ValueError("Stage names must be unique")
+
+    ordered: List[Stage] = []
+    state: Dict[str, int] = {}
+
+    def visit(stage: Stage) -> None:
+        if state.get(stage.name) == 2:
+            return
+        if state.get(stage.name) == 1:
+            raise ValueError(f"Stage dependency cycle through '{stage.name}'")
+        state[stage.name] = 1
+        for name in stage.after:
+            if name not in by_name:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown '{name}'")
+            visit(by_name[name])
+        state[stage.name] = 2
+        ordered.append(stage)
+
+    for stage in stages:
+        visit(stage)
+    return ordered
@@ -1,14 +1,28 @@
+import hashlib
 import os
-from typing import Dict, Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 from sfai.context.manager import ContextManager
+from sfai.context.models import RegisteredApp
 from sfai.core.base import BaseIntegration
 from sfai.core.response_models import BaseResponse
 from sfai.core.decorators import with_context
+from sfai.integrations.mulesoft.pipeline import Stage, StageError, run_stages
+from sfai.integrations.mulesoft.core import MulesoftAPI
 from sfai.integrations.mulesoft.utils import _get_mulesoft_client
-from sfai.integrations.mulesoft.agentforce_utils import generate_openapi_from_app
+from sfai.integrations.mulesoft.agentforce_utils import (
+    detect_agentforce_usage,
+    generate_openapi_from_app,
+    spec_format_of,
+    spec_output_file,
+)
 
 ctx_mgr = ContextManager()
 
+# apps published at the same time by publish_all
+DEFAULT_PUBLISH_CONCURRENCY = 4
+
 
 class MuleSoftIntegration(BaseIntegration):
     @with_context
@@ -19,10 +33,12 @@ class MuleSoftIntegration(BaseIntegration):
         asset = mulesoft_config.get("asset", {})
         api = mulesoft_config.get("api", {})
         profile_name = kwargs.get("profile") or mulesoft_config.get("profile")
+        # set when publishing an app other than the one in the current directory
+        app_path = kwargs.get("app_path") or ""
+        app_ctx_mgr = ContextManager(app_path) if app_path else ctx_mgr
 
         if not profile_name:
-            profiles = ctx_mgr.list_service_profiles("mulesoft")
-            profile_name = profiles[0] if profiles else "default"
+            profile_name = _default_profile()
 
         profile = ctx_mgr.get_service_profile("mulesoft", profile_name)
         if not profile:
@@ -47,28 +63,15 @@ class MuleSoftIntegration(BaseIntegration):
         elif not version:
             version = "1.0.0"
         oas_file = kwargs.get("oas_file") or asset.get("oas_file", "openapi.yaml")
+        spec_format = kwargs.get("spec_format")
+        if (
+            spec_format
+            and not kwargs.get("oas_file")
+            and detect_agentforce_usage(os.path.join(app_path, "app.py"))
+        ):
+            # generate the spec in the requested format instead
+            oas_file = spec_output_file("app.py", spec_format)
 
-        # Check if we need to auto-generate OpenAPI spec
-        if not os.path.exists(oas_file):
-            # Try to auto-generate from app.py with AgentForce decorators
-            generation_result = generate_openapi_from_app("app.py")
-            if not generation_result.success:
-                return BaseResponse(
-                    success=False,
-                    error=(
-                        f"OAS file not found and auto-generation failed: "
-                        f"{generation_result.error}"
-                    ),
-                )
-
-            # Update oas_file to the generated file
-            oas_file = generation_result.data.get("openapi_file", "openapi.yaml")
-
-        if not oas_file or not os.path.exists(oas_file):
-            return BaseResponse(
-                success=False,
-                error="OAS file not found",
-            )
         description = kwargs.get("description") or asset.get("description", "")
         tags = kwargs.get("tags") or asset.get(
             "tags", ["sf-api-catalog", "sf-api-topic"]
@@ -109,7 +112,7 @@ class MuleSoftIntegration(BaseIntegration):
                 success=False,
                 error="Gateway version not found",
             )
-        ms_client = _get_mulesoft_client(profile_name)
+        ms_client = kwargs.get("client") or _get_mulesoft_client(profile_name)
 
         # if _get_mulesoft_client() failed, return the error
         if isinstance(ms_client, BaseResponse):
@@ -122,76 +125,170 @@ class MuleSoftIntegration(BaseIntegration):
                 success=False,
                 error="Mulesoft client not found",
             )
-        # publish the asset
-        asset_result = ms_client.publish_exchange_asset(
-            name=name,
-            version=version,
-            description=description,
-            tags=tags,
-            oas_file=oas_file,
-        )
-        if asset_result.get("status") not in ["success", "completed"]:
-            return BaseResponse(
-                success=False,
-                error=f"Failed to publish asset: {asset_result.get('message')}",
+        wait = kwargs.get("wait", False)
+        # an explicitly requested version is always uploaded
+        force_upload = kwargs.get("force_upload", False) or bool(kwargs.get("version"))
+
+        def spec(results: Dict[str, Any]) -> str:
+            oas_path = os.path.join(app_path, oas_file)
+            app_file = os.path.join(app_path, "app.py")
+            spec_format = spec_format_of(oas_file)
+            # a spec generated from the app is refreshed whenever it is stale
+            generated = os.path.abspath(oas_path) == os.path.abspath(
+                spec_output_file(app_file, spec_format)
+            ) and detect_agentforce_usage(app_file)
+            if os.path.exists(oas_path) and not generated:
+                return oas_path
+            # Try to auto-generate from app.py with AgentForce decorators
+            generation_result = generate_openapi_from_app(
+                app_file, spec_format=spec_format
             )
+            if not generation_result.success and generated:
+                raise StageError(
+                    f"OpenAPI spec generation failed: {generation_result.error}"
+                )
+            if not generation_result.success:
+                raise StageError(
+                    f"OAS file not found and auto-generation failed: "
+                    f"{generation_result.error}"
+                )
+            generated = generation_result.data.get("openapi_file", "openapi.yaml")
+            if not generated or not os.path.exists(generated):
+                raise StageError("OAS file not found")
+            return generated
 
-        ctx_mgr.update_platform(
-            platform=ctx.get("active_platform"),
-            environment=ctx.get("active_environment"),
-            values={
-                "mulesoft": {
-                    "profile": profile_name,
-                    "asset": {
-                        "name": name,
-                        "version": version,
-                        "description": description,
-                        "oas_file": oas_file,
-                        "tags": tags,
-                    },
+        def exchange(results: Dict[str, Any]) -> Dict[str, Any]:
+            spec_hash = _file_hash(results["spec"])
+            if (
+                not force_upload
+                and asset.get("spec_hash") == spec_hash
+                and asset.get("name") == name
+                and asset.get("description") == description
+                and asset.get("tags") == tags
+                and asset.get("version")
+            ):
+                # the last published version has the same spec
+                return {
+                    "status": "unchanged",
+                    "version": asset["version"],
+                    "spec_hash": spec_hash,
                 }
-            },
-        )
+            asset_result = ms_client.publish_exchange_asset(
+                name=name,
+                version=version,
+                description=description,
+                tags=tags,
+                oas_file=results["spec"],
+            )
+            if asset_result.get("status") not in ["success", "completed"]:
+                raise StageError(
+                    f"Failed to publish asset: {asset_result.get('message')}"
+                )
+            return {**asset_result, "version": version, "spec_hash": spec_hash}
 
-        # publish API
-        api_result = ms_client.publish_api(
-            name=name,
-            version=version,
-            implementation_uri=implementation_uri,
-            endpoint_uri=endpoint_uri,
-            endpoint_path=endpoint_path,
-        )
-        api_id = api_result.get("id")
-        if not api_id:
-            return BaseResponse(
-                success=False,
-                error=f"Failed to publish API: {api_result.get('message')}",
+        def find_api(results: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            return ms_client._find_existing_api(name, endpoint_path)
+
+        def deployments(results: Dict[str, Any]) -> List[Dict[str, Any]]:
+            existing_api = results["find_api"]
+            if not existing_api:
+                return []
+            return ms_client.list_deployments(existing_api["id"])
+
+        def publish_api(results: Dict[str, Any]) -> Dict[str, Any]:
+            api_result = ms_client.publish_api(
+                name=name,
+                version=results["exchange"]["version"],
+                implementation_uri=implementation_uri,
+                endpoint_uri=endpoint_uri,
+                endpoint_path=endpoint_path,
             )
+            if not api_result.get("id"):
+                raise StageError(f"Failed to publish API: {api_result.get('message')}")
+            return api_result
 
-        # deploy the API
-        ms_client.deploy_api(
-            api_id=api_id,
-            gateway_id=gateway_id,
-            gateway_version=gateway_version,
-        )
+        def deploy(results: Dict[str, Any]) -> Dict[str, Any]:
+            return ms_client.deploy_api(
+                api_id=results["api"]["id"],
+                gateway_id=gateway_id,
+                gateway_version=gateway_version,
+            )
 
-        # update context
-        ctx_mgr.update_platform(
-            platform=ctx.get("active_platform"),
-            environment=ctx.get("active_environment"),
-            values={
-                "mulesoft": {
-                    "profile": profile_name,
-                    "api": {
-                        "api_id": api_id,
-                        "gateway_id": gateway_id,
-                        "gateway_version": gateway_version,
-                        "endpoint_uri": endpoint_uri,
-                        "endpoint_path": endpoint_path,
+        # the existing API and its deployments are looked up while the
+        # spec is generated and uploaded to Exchange
+        stages = [
+            Stage("spec", spec),
+            Stage("exchange", exchange, after=["spec"]),
+            Stage("find_api", find_api),
+            Stage("deployments", deployments, after=["find_api"]),
+            Stage("api", publish_api, after=["exchange", "find_api"]),
+            Stage("deploy", deploy, after=["api", "deployments"]),
+        ]
+        if wait:
+            stages.append(
+                Stage(
+                    "wait",
+                    lambda results: ms_client.wait_for_deployment(results["api"]["id"]),
+                    after=["deploy"],
+                )
+            )
+        pipeline = run_stages(stages)
+        stage_timings = {
+            stage: {key: round(value, 3) for key, value in timing.items()}
+            for stage, timing in pipeline.timings.items()
+        }
+
+        # the asset and API records are written to the context in one go,
+        # the published asset is kept when a later step fails
+        with app_ctx_mgr.transaction():
+            if "exchange" in pipeline.results:
+                published = pipeline.results["exchange"]
+                app_ctx_mgr.update_platform(
+                    platform=ctx.get("active_platform"),
+                    environment=ctx.get("active_environment"),
+                    values={
+                        "mulesoft": {
+                            "profile": profile_name,
+                            "asset": {
+                                "name": name,
+                                "version": published["version"],
+                                "description": description,
+                                "oas_file": os.path.relpath(
+                                    pipeline.results["spec"], app_path or "."
+                                ),
+                                "tags": tags,
+                                "spec_hash": published["spec_hash"],
+                            },
+                        }
                     },
-                }
-            },
-        )
+                )
+
+            if not pipeline.success:
+                return BaseResponse(
+                    success=False,
+                    error=_stage_error(pipeline.failed_stage, pipeline.error),
+                    failed_stage=pipeline.failed_stage,
+                    stage_timings=stage_timings,
+                )
+
+            api_id = pipeline.results["api"]["id"]
+            # update context
+            app_ctx_mgr.update_platform(
+                platform=ctx.get("active_platform"),
+                environment=ctx.get("active_environment"),
+                values={
+                    "mulesoft": {
+                        "profile": profile_name,
+                        "api": {
+                            "api_id": api_id,
+                            "gateway_id": gateway_id,
+                            "gateway_version": gateway_version,
+                            "endpoint_uri": endpoint_uri,
+                            "endpoint_path": endpoint_path,
+                        },
+                    }
+                },
+            )
 
         access_url = f"{endpoint_uri.rstrip('/')}/{endpoint_path.lstrip('/')}"
 
@@ -201,4 +298,176 @@ class MuleSoftIntegration(BaseIntegration):
             api_id=api_id,
             access_url=access_url,
             message="API published successfully",
+            asset_unchanged=pipeline.results["exchange"]["status"] == "unchanged",
+            stage_timings=stage_timings,
+            elapsed=round(pipeline.elapsed, 3),
         )
+
+    def publish_all(
+        self,
+        apps: Optional[List[str]] = None,
+        profile: Optional[str] = None,
+        concurrency: int = DEFAULT_PUBLISH_CONCURRENCY,
+        **kwargs,
+    ) -> BaseResponse:
+        """
+        Publish several registered apps, each from its own directory.
+
+        Apps are published concurrently. Every MuleSoft profile is
+        authenticated once and its client is shared by the apps using it.
+
+        Args:
+            apps: Optional[List[str]]
+                Names of the registered apps to publish, all apps if None
+            profile: Optional[str]
+                MuleSoft profile to use instead of the one of each app
+            concurrency: int
+                Number of apps published at the same time
+            **kwargs
+                Passed on to publish, e.g. wait
+
+        Returns:
+            BaseResponse
+                results lists app_name, path, success, api_id, error and
+                elapsed per app, success is True if every app was published
+        """
+        registered, missing = _select_apps(apps)
+        results: List[Dict[str, Any]] = [
+            _app_result(name, None, error=f"App '{name}' is not registered")
+            for name in missing
+        ]
+        clients: Dict[str, Any] = {}
+        jobs = []
+        for app in registered:
+            try:
+                app_ctx = ContextManager(app.path).read_context()
+            except ValueError as e:
+                results.append(_app_result(app.app_name, app.path, error=str(e)))
+                continue
+            if not app_ctx:
+                results.append(
+                    _app_result(app.app_name, app.path, error="No context found")
+                )
+                continue
+
+            profile_name = (
+                profile
+                or app_ctx.get("mulesoft", {}).get("profile")
+                or _default_profile()
+            )
+            if profile_name not in clients:
+                clients[profile_name] = _get_mulesoft_client(profile_name)
+            error = _client_error(clients[profile_name])
+            if error:
+                results.append(_app_result(app.app_name, app.path, error=error))
+                continue
+            jobs.append((app, app_ctx, profile_name, clients[profile_name]))
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            futures = [pool.submit(self._publish_app, *job, **kwargs) for job in jobs]
+            results.extend(future.result() for future in futures)
+
+        published = sum(1 for result in results if result["success"])
+        return BaseResponse(
+            success=published == len(results),
+            message=f"Published {published} of {len(results)} apps",
+            results=results,
+        )
+
+    def _publish_app(
+        self,
+        app: RegisteredApp,
+        app_ctx: Dict[str, Any],
+        profile_name: str,
+        client: MulesoftAPI,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        start = time.monotonic()
+        try:
+            response = self.publish(
+                ctx=app_ctx,
+                app_path=app.path,
+                profile=profile_name,
+                client=client,
+                **kwargs,
+            )
+        except Exception as e:
+            response = BaseResponse(success=False, error=str(e))
+        return _app_result(
+            app_ctx.get("app_name") or app.app_name,
+            app.path,
+            success=response.success,
+            api_id=getattr(response, "api_id", None),
+            error=response.error,
+            elapsed=round(time.monotonic() - start, 3),
+        )
+
+
+def _default_profile() -> str:
+    """Return the first configured MuleSoft profile, "default" if there is none."""
+    profiles = ctx_mgr.list_service_profiles("mulesoft")
+    return profiles[0] if profiles else "default"
+
+
+def _select_apps(
+    names: Optional[List[str]],
+) -> Tuple[List[RegisteredApp], List[str]]:
+    """Return the registered apps with the given names and the unknown names."""
+    if not names:
+        return ctx_mgr.list_apps(), []
+    registered, missing = [], []
+    for name in dict.fromkeys(names):
+        apps = ctx_mgr.list_apps(name)
+        if apps:
+            registered.extend(apps)
+        else:
+            missing.append(name)
+    return registered, missing
+
+
+def _client_error(client: Any) -> Optional[str]:
+    """Return why a MuleSoft client could not be created, None if it works."""
+    if isinstance(client, MulesoftAPI):
+        auth_error = client._check_auth()
+        return auth_error.message if auth_error else None
+    if isinstance(client, BaseResponse):
+        return client.error or client.message
+    if isinstance(client, dict):
+        return client.get("message")
+    return "Mulesoft client not found"
+
+
+def _app_result(
+    app_name: str,
+    path: Optional[str],
+    success: bool = False,
+    api_id: Any = None,
+    error: Optional[str] = None,
+    elapsed: Optional[float] = None,
+) -> Dict[str, Any]:
+    return {
+        "app_name": app_name,
+        "path": path,
+        "success": success,
+        "api_id": api_id,
+        "error": error,
+        "elapsed": elapsed,
+    }
+
+
+def _file_hash(file: str) -> str:
+    """Return the hex SHA-256 digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(file, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stage_error(stage: str, error: BaseException) -> str:
+    """Describe a failed publish stage for the user."""
+    if isinstance(error, StageError):
+        return str(error)
+    if stage == "exchange":
+        return f"Failed to publish asset: {error}"
+    return f"Failed to publish API: {error}"
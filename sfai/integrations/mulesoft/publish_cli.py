@@ -1,4 +1,6 @@
 import os
+from typing import Dict, List, Optional
+
 import typer
 from rich.console import Console
 from rich.table import Table
@@ -6,8 +8,13 @@ from rich.panel import Panel
 from rich.prompt import Prompt
 from sfai.context.manager import ContextManager
 from sfai.integrations.registry import INTEGRATION_REGISTRY
-from sfai.integrations.mulesoft.agentforce_utils import detect_agentforce_usage
-from sfai.constants import ROCKET_EMOJI
+from sfai.integrations.mulesoft.agentforce_utils import (
+    SPEC_FORMATS,
+    find_agentforce_usages,
+    spec_format_of,
+    spec_output_file,
+)
+from sfai.constants import ERROR_EMOJI, ROCKET_EMOJI, SUCCESS_EMOJI
 
 ctx_mgr = ContextManager()
 
@@ -30,7 +37,25 @@ def publish_cli(
     skip_confirm: bool = typer.Option(
         False, help="Skip confirmation of default values"
     ),
+    wait: bool = typer.Option(
+        False, help="Wait until the gateway has applied the deployed API"
+    ),
+    profile_stages: bool = typer.Option(
+        False, help="Print how long each publish stage took"
+    ),
+    force_upload: bool = typer.Option(
+        False, help="Upload a new Exchange version even if the spec is unchanged"
+    ),
+    spec_format: str = typer.Option(
+        None, help="Format of the generated OpenAPI spec, yaml or json"
+    ),
 ):
+    if spec_format and spec_format not in SPEC_FORMATS:
+        console.print(
+            f"[bold red]Unsupported spec format {spec_format}, use yaml or json[/]"
+        )
+        return
+
     ctx = ctx_mgr.read_context()
     if not ctx:
         console.print(
@@ -64,10 +89,15 @@ def publish_cli(
         return
 
     # Check for AgentForce decorators to determine if we can auto-generate OpenAPI
-    can_auto_generate = detect_agentforce_usage("app.py")
+    agentforce_usages = find_agentforce_usages("app.py")
+    can_auto_generate = bool(agentforce_usages)
+    # keep the format of the last published spec unless asked otherwise
+    spec_format = spec_format or spec_format_of(asset.get("oas_file", ""))
     if can_auto_generate:
+        actions = sum(usage["kind"] == "action" for usage in agentforce_usages)
         console.print(
-            "[green]AgentForce decorators detected - OpenAPI will be auto-generated[/]"
+            f"[green]AgentForce decorators detected ({actions} actions) - "
+            "OpenAPI will be auto-generated[/]"
         )
     else:
         console.print(
@@ -103,7 +133,7 @@ def publish_cli(
 
         # Only ask for OpenAPI file if we can't auto-generate
         if can_auto_generate:
-            oas_file = "openapi.yaml"  # Will be auto-generated
+            oas_file = spec_output_file("app.py", spec_format)  # auto-generated
             console.print(
                 "📄 [dim]OpenAPI spec will be auto-generated from decorators[/]"
             )
@@ -143,7 +173,7 @@ def publish_cli(
 
         # Set OpenAPI file - will be auto-generated if decorators are present
         if can_auto_generate:
-            oas_file = "openapi.yaml"  # Will be auto-generated
+            oas_file = spec_output_file("app.py", spec_format)  # auto-generated
         else:
             oas_file = asset.get("oas_file", "openapi.yaml")
         description = asset.get("description", "")
@@ -241,10 +271,20 @@ def publish_cli(
         gateway_id=gateway_id,
         gateway_version=gateway_version,
         profile=profile_name,
+        wait=wait,
+        force_upload=force_upload,
     )
+    stage_timings = getattr(publish_result, "stage_timings", None)
+    if profile_stages and stage_timings:
+        _print_stage_timings(stage_timings)
     if not publish_result.success:
         console.print(f"[bold red]Error publishing asset: {publish_result.error}[/]")
         return
+    elif getattr(publish_result, "asset_unchanged", False):
+        console.print(
+            "[dim]OpenAPI spec unchanged since the last published version, "
+            "Exchange upload skipped.[/]"
+        )
     else:
         console.print("[bold green]Asset published successfully.[/]")
 
@@ -275,3 +315,100 @@ def publish_cli(
         "\n[bold green]✓ MuleSoft asset published, API created, and "
         "deployed successfully![/]"
     )
+
+
+def publish_all_cli(
+    apps: Optional[List[str]] = None,
+    profile: Optional[str] = None,
+    concurrency: int = 4,
+    skip_confirm: bool = False,
+    wait: bool = False,
+    force_upload: bool = False,
+    spec_format: Optional[str] = None,
+) -> None:
+    """
+    Publish several registered apps and print a summary.
+
+    Args:
+        apps: Optional[List[str]]
+            Names of the apps to publish, comma-separated values are split,
+            every registered app if None
+        profile: Optional[str]
+            MuleSoft profile to use instead of the one of each app
+        concurrency: int
+            Number of apps published at the same time
+        skip_confirm: bool
+            Publish without asking for confirmation
+        wait: bool
+            Wait until the gateway has applied each deployed API
+        force_upload: bool
+            Upload new Exchange versions even if the specs are unchanged
+        spec_format: Optional[str]
+            Format of the specs generated from AgentForce apps, yaml or json,
+            the format each app last published if None
+    """
+    if spec_format and spec_format not in SPEC_FORMATS:
+        console.print(
+            f"[bold red]Unsupported spec format {spec_format}, use yaml or json[/]"
+        )
+        return
+
+    if apps:
+        apps = [name.strip() for value in apps for name in value.split(",")]
+        apps = [name for name in apps if name]
+    targets = apps or [app.app_name for app in ctx_mgr.list_apps()]
+    if not targets:
+        console.print("[yellow]No registered apps found. Run `sfai app init` first.[/]")
+        return
+
+    if not skip_confirm:
+        console.print(f"[bold blue]Apps to publish ({len(targets)}):[/]")
+        console.print(", ".join(f"[cyan]{name}[/]" for name in targets))
+        confirm = Prompt.ask(
+            "\nProceed with publishing and deployment?", default="y", choices=["y", "n"]
+        )
+        if confirm.lower() != "y":
+            console.print("[yellow]Operation cancelled.[/]")
+            return
+
+    result = INTEGRATION_REGISTRY["mulesoft"].publish_all(
+        apps=apps,
+        profile=profile,
+        concurrency=concurrency,
+        wait=wait,
+        force_upload=force_upload,
+        spec_format=spec_format,
+    )
+
+    table = Table("App", "Status", "API ID", "Time (s)", "Error", title="Publish")
+    for app in result.results:
+        table.add_row(
+            app["app_name"],
+            SUCCESS_EMOJI if app["success"] else ERROR_EMOJI,
+            str(app["api_id"] or ""),
+            f"{app['elapsed']:.1f}" if app["elapsed"] is not None else "",
+            app["error"] or "",
+        )
+    console.print(table)
+    style = "bold green" if result.success else "bold red"
+    console.print(f"[{style}]{result.message}[/]")
+    if not result.success:
+        raise typer.Exit(code=1)
+
+
+def _print_stage_timings(stage_timings: Dict[str, Dict[str, float]]) -> None:
+    """Print the start offset and duration of each publish stage."""
+    table = Table(title="Publish stages")
+    table.add_column("Stage", style="cyan")
+    table.add_column("Start (s)", justify="right")
+    table.add_column("Duration (s)", justify="right")
+    ordered = sorted(stage_timings.items(), key=lambda item: item[1]["start"])
+    for stage, timing in ordered:
+        table.add_row(stage, f"{timing['start']:.2f}", f"{timing['duration']:.2f}")
+    console.print(table)
+
+    wall_time = max(timing["start"] + timing["duration"] for _, timing in ordered)
+    busy_time = sum(timing["duration"] for _, timing in ordered)
+    console.print(
+        f"[dim]Wall time {wall_time:.2f}s for {busy_time:.2f}s of stage work[/]"
+    )
@@ -0,0 +1,158 @@
+"""
+Extract the OpenAPI spec of a FastAPI app in a separate process.
+
+Importing an app runs all of its import-time work (loading models, opening
+connections, importing ML libraries). The import happens in a short-lived
+child process with SFAI_SPEC_EXTRACTION=1 set, so apps can skip that work,
+and only the OpenAPI schema comes back. Schemas are cached by the source
+hash of the app and the sfai and FastAPI versions, so an unchanged app is
+never imported again.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Dict
+
+from sfai.constants import OPENAPI_CACHE_DIR, SPEC_EXTRACTION_ENV
+from sfai.core.response_models import BaseResponse
+
+# seconds an app may take to import before extraction is abandoned
+SPEC_EXTRACTION_TIMEOUT = 300
+# lines of the child's output kept in the error of a failed extraction
+_ERROR_OUTPUT_LINES = 20
+# packages producing the schema, their versions are part of the cache key
+_CACHE_KEY_PACKAGES = ("sfai", "fastapi")
+
+
+def extract_openapi(app_file: str, source_hash: str) -> BaseResponse:
+    """
+    Return the OpenAPI schema of an app, from the cache or a child process.
+
+    Args:
+        app_file: Path to the FastAPI application file
+        source_hash: Hash of the app sources, see app_source_hash
+
+    Returns:
+        BaseResponse with data.openapi holding the schema and data.cached
+        telling whether it came from the cache
+    """
+    cache_key = f"{source_hash}-{_generator_versions()}"
+    cache_file = OPENAPI_CACHE_DIR / f"{cache_key}.json"
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            return BaseResponse(
+                success=True, data={"openapi": json.load(f), "cached": True}
+            )
+    except (OSError, ValueError):
+        pass
+
+    OPENAPI_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # written next to the cache entry and renamed once complete
+    fd, output_file = tempfile.mkstemp(
+        dir=OPENAPI_CACHE_DIR, prefix=f".{cache_key}.", suffix=".json"
+    )
+    os.close(fd)
+    try:
+        result = _run_extraction(app_file, output_file)
+        if not result.success:
+            return result
+        with open(output_file, "r", encoding="utf-8") as f:
+            openapi_schema = json.load(f)
+        os.replace(output_file, cache_file)
+    finally:
+        if os.path.exists(output_file):
+            os.unlink(output_file)
+
+    return BaseResponse(success=True, data={"openapi": openapi_schema, "cached": False})
+
+
+@lru_cache(maxsize=None)
+def _generator_versions() -> str:
+    """Return e.g. "sfai0.1.0-fastapi0.115.0" for the installed packages."""
+    versions = []
+    for package in _CACHE_KEY_PACKAGES:
+        try:
+            versions.append(f"{package}{version(package)}")
+        except PackageNotFoundError:
+            versions.append(package)
+    return "-".join(versions)
+
+
+def _run_extraction(app_file: str, output_file: str) -> BaseResponse:
+    """Import the app in a child process writing its schema to output_file."""
+    app_file = os.path.abspath(app_file)
+    env = dict(os.environ)
+    env[SPEC_EXTRACTION_ENV] = "1"
+    # keep sfai importable when it runs from a source checkout
+    sfai_root = str(Path(__file__).resolve().parents[3])
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (sfai_root, env.get("PYTHONPATH")) if path
+    )
+
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-m", __name__, app_file, output_file],
+            cwd=os.path.dirname(app_file),
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            timeout=SPEC_EXTRACTION_TIMEOUT,
+            check=False,
+        )
+    except subprocess.TimeoutExpired:
+        return BaseResponse(
+            success=False,
+            error=(
+                f"Importing {app_file} took longer than {SPEC_EXTRACTION_TIMEOUT}s, "
+                f"skip startup work when {SPEC_EXTRACTION_ENV}=1 is set"
+            ),
+        )
+
+    if completed.returncode != 0:
+        output = completed.stdout.strip().splitlines()[-_ERROR_OUTPUT_LINES:]
+        return BaseResponse(
+            success=False,
+            error=output[-1] if output else f"exit code {completed.returncode}",
+            data={"output": "\n".join(output)},
+        )
+    return BaseResponse(success=True)
+
+
+def _extract(app_file: str, output_file: str) -> int:
+    """Entry point of the child process, returns its exit code."""
+    # only the child needs them, and agentforce_utils imports this module
+    from sfai.core.agentforce.generator import (  # noqa: PLC0415 - child only
+        custom_openapi,
+    )
+    from sfai.integrations.mulesoft.agentforce_utils import (  # noqa: PLC0415 - cycle
+        _import_app_module,
+    )
+
+    app_module = _import_app_module(app_file)
+    # the last line of output is reported as the error
+    sys.stdout.flush()
+    if not app_module:
+        print(f"Could not import FastAPI app from {app_file}", file=sys.stderr)
+        return 1
+
+    app = getattr(app_module, "app", None)
+    if not app:
+        print("No 'app' FastAPI instance found in the module", file=sys.stderr)
+        return 1
+
+    openapi_schema: Dict[str, Any] = custom_openapi(app)
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(openapi_schema, f)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_extract(sys.argv[1], sys.argv[2]))
@@ -71,4 +71,5 @@ def _get_mulesoft_client(
         environment_id=mulesoft_config["environment_id"],
         client_id=mulesoft_config["client_id"],
         client_secret=mulesoft_config["client_secret"],
+        profile=profile_name,
     )
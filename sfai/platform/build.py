@@ -0,0 +1,565 @@
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from sfai.constants import BUILD_CACHE_DIR
+from sfai.platform.streaming import run_command
+
+# buildx drivers able to export the build cache to a local directory, the
+# default "docker" driver keeps its layer cache inside the daemon instead
+LOCAL_CACHE_DRIVERS = {"docker-container", "kubernetes", "remote"}
+
+# never part of the image, whatever .dockerignore says
+ALWAYS_IGNORED = (".sfai", ".git", "**/__pycache__")
+# files docker reads even when .dockerignore lists them
+ALWAYS_INCLUDED = ("Dockerfile", ".dockerignore")
+
+# platform the images of remote providers (EKS, Heroku) run on
+REMOTE_PLATFORM = "linux/amd64"
+
+_DRIVERS: Dict[Tuple[Optional[str], Optional[str]], Optional[str]] = {}
+_DRIVERS_LOCK = threading.Lock()
+
+# one lock per image destination, see image_lock
+_IMAGE_LOCKS: Dict[str, threading.Lock] = {}
+_IMAGE_LOCKS_LOCK = threading.Lock()
+
+# daemon platform per Docker host, see daemon_platform
+_DAEMON_PLATFORMS: Dict[Optional[str], Optional[str]] = {}
+# artifacts built by this process, no_cache rebuilds each of them once
+_ARTIFACTS: Set[str] = set()
+
+
+def build_image(
+    path: Union[str, Path],
+    image: str,
+    cache_key: Optional[str] = None,
+    platform: Optional[str] = None,
+    push: bool = False,
+    no_cache: bool = False,
+    builder: Optional[str] = None,
+    extra_tags: Optional[List[str]] = None,
+    docker_env: Optional[Dict[str, str]] = None,
+) -> None:
+    """
+    Build a Docker image with BuildKit, reusing the layers of earlier builds.
+
+    When the active buildx builder can export its cache, the layers are
+    kept in BUILD_CACHE_DIR/<cache_key> and fed back with --cache-from, so
+    the dependency layers survive pruned images and builder restarts.
+    Otherwise the daemon's own BuildKit layer cache is used.
+
+    Args:
+        path: Union[str, Path]
+            Build context directory containing the Dockerfile
+        image: str
+            Full image reference to tag, e.g. "repo/app:1.0.0"
+        cache_key: Optional[str]
+            Name of the local cache directory, usually the app name. No
+            local cache is used when None
+        platform: Optional[str]
+            Target platform, e.g. "linux/amd64"
+        push: bool
+            Push the image to its registry instead of loading it locally
+        no_cache: bool
+            Ignore all cached layers and rebuild from scratch
+        builder: Optional[str]
+            buildx builder to use instead of the active one
+        extra_tags: Optional[List[str]]
+            More image references to tag (and push) the same image as
+        docker_env: Optional[Dict[str, str]]
+            Variables pointing docker at another daemon, e.g. minikube's
+            DOCKER_HOST, instead of changing os.environ
+
+    Returns:
+        None
+
+    Raises:
+        subprocess.CalledProcessError
+            If the build or push fails
+    """
+    env = {**os.environ, **(docker_env or {}), "DOCKER_BUILDKIT": "1"}
+    driver = builder_driver(builder, docker_env)
+    cache_dir = (
+        BUILD_CACHE_DIR / cache_key
+        if cache_key and driver in LOCAL_CACHE_DRIVERS
+        else None
+    )
+
+    staging = None
+    if cache_dir:
+        # each build exports to its own directory, builds running at the
+        # same time never write into each other's cache
+        BUILD_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=BUILD_CACHE_DIR, prefix=f".{cache_key}."))
+
+    images = [image, *(extra_tags or [])]
+    if driver is None:
+        commands = [_docker_build_command(path, images, platform, no_cache)]
+        if push:
+            commands.extend(["docker", "push", ref] for ref in images)
+    else:
+        commands = [
+            _buildx_command(
+                path, images, platform, push, no_cache, cache_dir, staging, builder
+            )
+        ]
+
+    try:
+        for cmd in commands:
+            run_command(cmd, check=True, env=env)
+    except subprocess.CalledProcessError:
+        if staging:
+            shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    if cache_dir:
+        # builds sharing the cache key, e.g. of two images of one app, take
+        # turns swapping it
+        with image_lock(f"cache/{cache_key}"):
+            _rotate_cache(cache_dir, staging)
+
+
+def builder_driver(
+    builder: Optional[str] = None, docker_env: Optional[Dict[str, str]] = None
+) -> Optional[str]:
+    """
+    Get the driver of a buildx builder.
+
+    The result is remembered per Docker host, minikube deploys point
+    DOCKER_HOST at the cluster's daemon.
+
+    Args:
+        builder: Optional[str]
+            Builder name, the active builder if None
+        docker_env: Optional[Dict[str, str]]
+            Variables pointing docker at another daemon
+
+    Returns:
+        Optional[str]
+            The driver name (e.g. "docker", "docker-container"), or None if
+            buildx is not available
+    """
+    env = {**os.environ, **(docker_env or {})}
+    key = (env.get("DOCKER_HOST"), builder)
+    with _DRIVERS_LOCK:
+        if key in _DRIVERS:
+            return _DRIVERS[key]
+
+    driver = None
+    try:
+        result = subprocess.run(
+            ["docker", "buildx", "inspect", *([builder] if builder else [])],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        )
+        for line in result.stdout.splitlines():
+            field, _, value = line.partition(":")
+            if field.strip() == "Driver":
+                driver = value.strip()
+                break
+    except (OSError, subprocess.CalledProcessError):
+        pass
+
+    with _DRIVERS_LOCK:
+        _DRIVERS[key] = driver
+    return driver
+
+
+def image_exists(image: str, docker_env: Optional[Dict[str, str]] = None) -> bool:
+    """
+    Check whether an image is present in the current Docker daemon.
+
+    Args:
+        image: str
+            Image reference, e.g. "app:fp-0123456789ab"
+        docker_env: Optional[Dict[str, str]]
+            Variables pointing docker at another daemon
+
+    Returns:
+        bool
+            True if the daemon has the image
+    """
+    try:
+        result = subprocess.run(
+            ["docker", "image", "inspect", image],
+            capture_output=True,
+            check=False,
+            env={**os.environ, **(docker_env or {})},
+        )
+    except OSError:
+        return False
+    return result.returncode == 0
+
+
+def artifact_image(
+    name: str,
+    fingerprint: str,
+    platform: Optional[str] = None,
+    docker_env: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Return the reference of the image artifact built from a fingerprint.
+
+    Args:
+        name: str
+            Repository name of the artifact, usually the app name
+        fingerprint: str
+            Build fingerprint of the app, see build_fingerprint
+        platform: Optional[str]
+            Target platform, the daemon's own platform if None
+        docker_env: Optional[Dict[str, str]]
+            Variables pointing docker at another daemon
+
+    Returns:
+        str
+            The image reference, e.g. "app:fp-0123456789ab", suffixed with
+            the architecture when it differs from the daemon's
+    """
+    tag = fingerprint_tag(fingerprint)
+    if platform and platform != daemon_platform(docker_env):
+        tag += "-" + platform.rsplit("/", 1)[-1]
+    return f"{name}:{tag}"
+
+
+def build_artifact(
+    path: Union[str, Path],
+    name: str,
+    fingerprint: str,
+    platform: Optional[str] = None,
+    no_cache: bool = False,
+    docker_env: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Build the image artifact of a fingerprint once, for every provider.
+
+    The artifact is loaded into the Docker daemon docker_env points at.
+    Providers retag and push it (promote_image) or load it into their
+    cluster instead of running their own build, so deploying identical
+    sources to any number of targets builds at most one image per platform.
+
+    Args:
+        path: Union[str, Path]
+            Build context directory containing the Dockerfile
+        name: str
+            Repository name of the artifact, usually the app name
+        fingerprint: str
+            Build fingerprint of the app, see build_fingerprint
+        platform: Optional[str]
+            Target platform, e.g. REMOTE_PLATFORM, the daemon's if None
+        no_cache: bool
+            Rebuild without cached layers, once per process
+        docker_env: Optional[Dict[str, str]]
+            Variables pointing docker at another daemon than the local one
+
+    Returns:
+        str
+            Reference of the artifact in the daemon
+
+    Raises:
+        subprocess.CalledProcessError
+            If the build fails
+    """
+    image = artifact_image(name, fingerprint, platform, docker_env)
+    # each platform keeps its own layer cache, like its own image name
+    cache_key = name
+    if platform and platform != daemon_platform(docker_env):
+        cache_key = f"{name}-{platform.replace('/', '-')}"
+    # artifacts live in one daemon, another daemon needs its own build
+    artifact = f"{_docker_host(docker_env)}/{image}"
+    with image_lock(artifact):
+        if artifact in _ARTIFACTS or (
+            not no_cache and image_exists(image, docker_env=docker_env)
+        ):
+            return image
+        build_image(
+            path,
+            image,
+            cache_key=cache_key,
+            platform=platform,
+            no_cache=no_cache,
+            docker_env=docker_env,
+        )
+        _ARTIFACTS.add(artifact)
+    return image
+
+
+def promote_image(
+    image: str,
+    refs: List[str],
+    push: bool = True,
+    docker_env: Optional[Dict[str, str]] = None,
+) -> None:
+    """
+    Tag an image under more references and push them.
+
+    Args:
+        image: str
+            Reference of an image in the daemon, e.g. an artifact
+        refs: List[str]
+            References to tag, e.g. "<registry>/<repo>:<tag>"
+        push: bool
+            Push the new references to their registries
+        docker_env: Optional[Dict[str, str]]
+            Variables pointing docker at another daemon
+
+    Returns:
+        None
+
+    Raises:
+        subprocess.CalledProcessError
+            If tagging or pushing fails
+    """
+    env = {**os.environ, **(docker_env or {})}
+    for ref in refs:
+        run_command(["docker", "tag", image, ref], check=True, env=env)
+    if push:
+        for ref in refs:
+            run_command(["docker", "push", ref], check=True, env=env)
+
+
+def daemon_platform(docker_env: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """
+    Get the platform of a Docker daemon.
+
+    The result is remembered per Docker host, like builder_driver.
+
+    Args:
+        docker_env: Optional[Dict[str, str]]
+            Variables pointing docker at another daemon than the local one
+
+    Returns:
+        Optional[str]
+            e.g. "linux/arm64", or None if docker is not available
+    """
+    env = {**os.environ, **(docker_env or {})}
+    key = env.get("DOCKER_HOST")
+    with _DRIVERS_LOCK:
+        if key in _DAEMON_PLATFORMS:
+            return _DAEMON_PLATFORMS[key]
+
+    platform = None
+    try:
+        result = subprocess.run(
+            ["docker", "version", "--format", "{{.Server.Os}}/{{.Server.Arch}}"],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        )
+        platform = (result.stdout or "").strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        pass
+
+    with _DRIVERS_LOCK:
+        _DAEMON_PLATFORMS[key] = platform
+    return platform
+
+
+def _docker_host(docker_env: Optional[Dict[str, str]] = None) -> str:
+    return {**os.environ, **(docker_env or {})}.get("DOCKER_HOST") or "local"
+
+
+@contextmanager
+def image_lock(destination: str) -> Iterator[None]:
+    """
+    Serialize building and pushing one image destination across threads.
+
+    Deploying several environments at once may target the same repository,
+    the second deploy then finds the image the first one built.
+
+    Args:
+        destination: str
+            Repository or registry the image goes to, e.g. an ECR URI
+
+    Returns:
+        Iterator[None]
+    """
+    with _IMAGE_LOCKS_LOCK:
+        lock = _IMAGE_LOCKS.setdefault(destination, threading.Lock())
+    with lock:
+        yield
+
+
+def build_fingerprint(path: Union[str, Path]) -> str:
+    """
+    Hash the build context of an app.
+
+    Every file docker would send to the build is hashed with its relative
+    path and executable bit, honouring .dockerignore. Local state (.sfai,
+    .git and __pycache__) is always left out, so the fingerprint only
+    changes when the built image would.
+
+    Args:
+        path: Union[str, Path]
+            Build context directory containing the Dockerfile
+
+    Returns:
+        str
+            Hex SHA-256 digest of the build context
+    """
+    root = Path(path).resolve()
+    digest = hashlib.sha256()
+    for relative in sorted(_context_files(root)):
+        file = root / relative
+        digest.update(relative.encode())
+        digest.update(b"\0x" if os.access(file, os.X_OK) else b"\0-")
+        digest.update(_file_digest(file))
+    return digest.hexdigest()
+
+
+def _file_digest(file: Path) -> bytes:
+    digest = hashlib.sha256()
+    with open(file, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def fingerprint_tag(fingerprint: str) -> str:
+    """Return the image tag of a build fingerprint, e.g. "fp-0123456789ab"."""
+    return f"fp-{fingerprint[:12]}"
+
+
+def _context_files(root: Path) -> Iterator[str]:
+    patterns = _ignore_patterns(root)
+    # directories can only be skipped whole when no pattern re-includes files
+    prune = not any(include for include, _ in patterns)
+    for dirpath, dirnames, filenames in os.walk(root):
+        directory = os.path.relpath(dirpath, root)
+        prefix = "" if directory == "." else directory.replace(os.sep, "/") + "/"
+        if prune:
+            dirnames[:] = [
+                name for name in dirnames if not _ignored(prefix + name, patterns)
+            ]
+        for name in filenames:
+            relative = prefix + name
+            if relative in ALWAYS_INCLUDED or not _ignored(relative, patterns):
+                yield relative
+
+
+def _ignore_patterns(root: Path) -> List[Tuple[bool, "re.Pattern[str]"]]:
+    lines = list(ALWAYS_IGNORED)
+    try:
+        lines.extend((root / ".dockerignore").read_text().splitlines())
+    except FileNotFoundError:
+        pass
+
+    patterns = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        include = line.startswith("!")
+        pattern = os.path.normpath(line.lstrip("!").strip().lstrip("/"))
+        patterns.append((include, _compile_pattern(pattern.replace(os.sep, "/"))))
+    return patterns
+
+
+def _compile_pattern(pattern: str) -> "re.Pattern[str]":
+    # .dockerignore globs: "*" and "?" stay within one path segment, "**"
+    # spans any number of them
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+            continue
+        if char == "*":
+            regex += "[^/]*"
+        elif char == "?":
+            regex += "[^/]"
+        elif char == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                regex += re.escape(char)
+            else:
+                regex += "[" + pattern[i + 1 : end].replace("\\", "\\\\") + "]"
+                i = end
+        else:
+            regex += re.escape(char)
+        i += 1
+    # a pattern matching a directory also matches everything below it
+    return re.compile(regex + "(?:/.*)?")
+
+
+def _ignored(relative: str, patterns: List[Tuple[bool, "re.Pattern[str]"]]) -> bool:
+    ignored = False
+    for include, pattern in patterns:
+        if pattern.fullmatch(relative):
+            ignored = not include
+    return ignored
+
+
+def _docker_build_command(
+    path: Union[str, Path], images: List[str], platform: Optional[str], no_cache: bool
+) -> List[str]:
+    cmd = ["docker", "build"]
+    if platform:
+        cmd.extend(["--platform", platform])
+    if no_cache:
+        cmd.append("--no-cache")
+    return cmd + _tag_args(images) + [str(path)]
+
+
+def _buildx_command(
+    path: Union[str, Path],
+    images: List[str],
+    platform: Optional[str],
+    push: bool,
+    no_cache: bool,
+    cache_dir: Optional[Path],
+    staging: Optional[Path],
+    builder: Optional[str],
+) -> List[str]:
+    cmd = ["docker", "buildx", "build"]
+    if builder:
+        cmd.extend(["--builder", builder])
+    if platform:
+        cmd.extend(["--platform", platform])
+    if no_cache:
+        cmd.append("--no-cache")
+    if cache_dir:
+        if cache_dir.exists() and not no_cache:
+            cmd.extend(["--cache-from", f"type=local,src={cache_dir}"])
+        cmd.extend(["--cache-to", f"type=local,dest={staging},mode=max"])
+    # registries such as Heroku's reject attestation manifests, loaded
+    # images may be pushed later on
+    cmd.append("--provenance=false")
+    cmd.append("--push" if push else "--load")
+    return cmd + _tag_args(images) + [str(path)]
+
+
+def _tag_args(images: List[str]) -> List[str]:
+    return [arg for image in images for arg in ("-t", image)]
+
+
+def _rotate_cache(cache_dir: Path, staging: Path) -> None:
+    # the local exporter never prunes, writing each build's cache to a fresh
+    # directory keeps only the layers the latest build used
+    if not any(staging.iterdir()):
+        shutil.rmtree(staging, ignore_errors=True)
+        return
+    # moved aside before the swap, so the cache is never missing or partial
+    previous = Path(
+        tempfile.mkdtemp(dir=cache_dir.parent, prefix=f".{cache_dir.name}.")
+    )
+    if cache_dir.exists():
+        os.replace(cache_dir, previous / "cache")
+    os.replace(staging, cache_dir)
+    shutil.rmtree(previous, ignore_errors=True)
@@ -49,14 +49,15 @@ def init(
         if not result.success:
             return result
 
-        # Save the platform configuration to context
-        if result.data:
-            ctx_mgr.update_platform(platform, result.data, environment)
+        # Save the configuration and switch to it in a single context write
+        with ctx_mgr.transaction():
+            if result.data:
+                ctx_mgr.update_platform(platform, result.data, environment)
 
-        # Switch to the newly initialized environment
-        switch_result = switch(platform, environment)
-        if not switch_result.success:
-            return switch_result
+            # Switch to the newly initialized environment
+            switch_result = switch(platform, environment)
+            if not switch_result.success:
+                return switch_result
 
         return result.with_update(
             platform=platform,
@@ -1,7 +1,6 @@
 import logging
 from typing import Dict, Any, Optional
 from pathlib import Path
-import boto3
 from sfai.core.base import BasePlatform
 from sfai.context.manager import ContextManager
 from sfai.core.response_models import BaseResponse
@@ -20,6 +19,12 @@ from sfai.platform.providers.kubernetes.platform import K8sPlatform
 from sfai.core.decorators import with_context
 from sfai.platform.providers.kubernetes.utils.helpers import get_app_version
 from sfai.platform.providers.eks.utils.helpers import _build_and_push_image
+from sfai.platform.build import build_fingerprint, fingerprint_tag, image_lock
+from sfai.platform.providers.kubernetes.utils.checks import _kube_context_exists
+from sfai.platform.providers.eks.utils.session import (
+    call_with_fresh_credentials,
+    get_client,
+)
 from rich.console import Console
 from botocore.exceptions import ClientError, NoCredentialsError, ProfileNotFound
 
@@ -210,27 +215,114 @@ class EKSPlatform(BasePlatform):
                     "'sfai platform init aws' first."
                 ),
             )
-        session = boto3.Session(profile_name=profile, region_name=region)
-        ecr = session.client("ecr")
-        try:
-            ecr.describe_images(
-                repositoryName=ecr_repo, imageIds=[{"imageTag": version}]
+        fingerprint = kwargs.get("fingerprint") or build_fingerprint(path)
+        image_tag = fingerprint_tag(fingerprint)
+        # environments sharing a repository push the same tag once
+        no_cache = kwargs.get("no_cache", False)
+        with image_lock(ecr_repo_uri):
+            # looked up even for unchanged sources, lifecycle policies may
+            # have expired the tag since the last deploy
+            image_exists = False
+            if not no_cache:
+                lookup = self._find_image(ecr_repo, image_tag, region, profile)
+                if not lookup.success:
+                    return lookup
+                image_exists = lookup.image_exists
+
+            if not image_exists:
+                build_result = _build_and_push_image(
+                    path,
+                    ecr_repo_uri,
+                    region,
+                    app_name=app_name,
+                    fingerprint=fingerprint,
+                    image_tag=image_tag,
+                    profile=profile,
+                    no_cache=no_cache,
+                    extra_tags=[version],
+                )
+                if not build_result:
+                    return BaseResponse(
+                        success=False,
+                        error="Failed to build and push Docker image to ECR",
+                    )
+
+        # pinned so deploys running at the same time don't depend on the
+        # kubeconfig's current context
+        kube_context = context.get("cluster_arn")
+        if kube_context and not _kube_context_exists(kube_context):
+            if not _update_kubeconfig(cluster_name, region, profile):
+                return BaseResponse(
+                    success=False,
+                    error=f"Failed to update kubeconfig for cluster {cluster_name}",
+                )
+        context["kube_context"] = kube_context
+
+        context["helm_set"] = {
+            "image.repository": ecr_repo_uri,
+            "image.tag": image_tag,
+            "image.pullPolicy": "IfNotPresent",
+        }
+
+        # helm install/upgrade
+        console.print(f"Deploying {app_name}:{version} to namespace {namespace}...")
+        result = self.k8s.deploy(context=context, path=path, **kwargs)
+
+        if result.success:
+            public_url = get_public_url(app_name, namespace, kube_context)
+            values = {"image_tag": image_tag, "build_fingerprint": fingerprint}
+            if public_url:
+                values["public_url"] = public_url
+            ctx_mgr.update_platform(
+                platform="eks",
+                values=values,
+                environment=context.get("active_environment", "default"),
+                activate=kwargs.get("activate", True),
             )
-            logger.info(
-                "Image already exists in ECR. Skipping build and push. "
-                "update version in version.json to build and push a new image."
+            return BaseResponse(
+                success=True,
+                message=f"Deployed {app_name}:{version} to {namespace}",
+                public_url=public_url,
             )
-        except ecr.exceptions.ImageNotFoundException:
-            build_result = _build_and_push_image(
-                path, ecr_repo_uri, region, image_tag=version, profile=profile
+        else:
+            return BaseResponse(
+                success=False, error=result.error, message="Helm deployment failed"
             )
-            if not build_result:
-                return BaseResponse(
-                    success=False, error="Failed to build and push Docker image to ECR"
-                )
+
+    def _find_image(
+        self, ecr_repo: str, image_tag: str, region: str, profile: str
+    ) -> BaseResponse:
+        """
+        Check whether an image tag was already pushed to ECR.
+
+        Args:
+            ecr_repo: str
+                ECR repository name
+            image_tag: str
+                Image tag to look up
+            region: str
+                AWS region of the repository
+            profile: str
+                AWS profile name
+
+        Returns:
+            BaseResponse
+                image_exists on success, or the AWS error
+        """
+        try:
+            call_with_fresh_credentials(
+                profile,
+                lambda: get_client("ecr", profile, region).describe_images(
+                    repositoryName=ecr_repo, imageIds=[{"imageTag": image_tag}]
+                ),
+            )
+            logger.info(f"Image {image_tag} already exists in ECR. Skipping build.")
+            return BaseResponse(success=True, image_exists=True)
         except ClientError as e:
             error_code = e.response["Error"]["Code"]
-            if error_code == "ExpiredTokenException":
+            if error_code == "ImageNotFoundException":
+                return BaseResponse(success=True, image_exists=False)
+            elif error_code == "ExpiredTokenException":
                 return BaseResponse(
                     success=False,
                     error="AWS credentials expired. Please refresh your credentials.",
@@ -253,40 +345,6 @@ class EKSPlatform(BasePlatform):
                 success=False, error=f"AWS profile '{profile}' not found."
             )
 
-        context["helm_set"] = {
-            "image.repository": ecr_repo_uri,
-            "image.tag": version,
-            "image.pullPolicy": "IfNotPresent",
-        }
-
-        # helm install/upgrade
-        console.print(f"Deploying {app_name}:{version} to namespace {namespace}...")
-        result = self.k8s.deploy(context=context, path=path, **kwargs)
-
-        if result.success:
-            public_url = get_public_url(app_name, namespace)
-            if public_url:
-                ctx_mgr.update_platform(
-                    platform="eks",
-                    values={"public_url": public_url, "image_tag": version},
-                    environment=context.get("active_environment", "default"),
-                )
-            else:
-                ctx_mgr.update_platform(
-                    platform="eks",
-                    values={"image_tag": version},
-                    environment=context.get("active_environment", "default"),
-                )
-            return BaseResponse(
-                success=True,
-                message=f"Deployed {app_name}:{version} to {namespace}",
-                public_url=public_url,
-            )
-        else:
-            return BaseResponse(
-                success=False, error=result.error, message="Helm deployment failed"
-            )
-
     @with_context
     def delete(self, context: Dict[str, Any]) -> BaseResponse:
         if not _verify_aws_credentials(profile=context.get("profile", "default")):
@@ -300,7 +358,7 @@ class EKSPlatform(BasePlatform):
         return self.k8s.delete(context=context)
 
     @with_context
-    def logs(self, context: Dict[str, Any]) -> BaseResponse:
+    def logs(self, context: Dict[str, Any], **kwargs) -> BaseResponse:
         """Get logs from the application pods."""
         if not _verify_aws_credentials(profile=context.get("profile", "default")):
             return BaseResponse(
@@ -310,7 +368,7 @@ class EKSPlatform(BasePlatform):
                     "your credentials."
                 ),
             )
-        return self.k8s.logs(context=context)
+        return self.k8s.logs(context=context, **kwargs)
 
     @with_context
     def open(
@@ -337,7 +395,9 @@ class EKSPlatform(BasePlatform):
 
     @with_context
     def status(self, context: Dict[str, Any]) -> BaseResponse:
-        if not _verify_aws_credentials(profile=context.get("profile", "default")):
+        # the cluster rejects expired credentials itself, no STS round trip
+        result = self.k8s.status(context=context)
+        if not result.success and getattr(result, "status_code", None) == 401:
             return BaseResponse(
                 success=False,
                 error=(
@@ -345,4 +405,4 @@ class EKSPlatform(BasePlatform):
                     "your credentials."
                 ),
             )
-        return self.k8s.status(context=context)
+        return result
@@ -1,9 +1,13 @@
 import subprocess
 import logging
-import boto3
 from typing import Dict, Any
 from kubernetes import client, config
 from kubernetes.client.rest import ApiException
+from sfai.platform.providers.eks.utils.session import (
+    call_with_fresh_credentials,
+    get_client,
+    verify_credentials,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -18,16 +22,8 @@ def _is_aws_cli_installed() -> bool:
 
 
 def _verify_aws_credentials(profile: str = "default") -> bool:
-    """Verify AWS credentials are configured and valid."""
-    try:
-        session = boto3.Session(profile_name=profile)
-        logger.warning(f"Verifying AWS credentials for profile: {profile}")
-        sts = session.client("sts")
-        sts.get_caller_identity()
-        return True
-    except Exception as e:
-        logger.error(f"Error verifying AWS credentials: {e}")
-        return False
+    """Verify AWS credentials are configured and valid, caching the result."""
+    return verify_credentials(profile)
 
 
 def _verify_eks_cluster(
@@ -35,9 +31,12 @@ def _verify_eks_cluster(
 ) -> Dict[str, Any]:
     """Verify EKS cluster exists and return cluster information."""
     try:
-        session = boto3.Session(profile_name=profile, region_name=region)
-        eks = session.client("eks")
-        cluster = eks.describe_cluster(name=cluster_name)["cluster"]
+        cluster = call_with_fresh_credentials(
+            profile,
+            lambda: get_client("eks", profile, region).describe_cluster(
+                name=cluster_name
+            )["cluster"],
+        )
 
         return {
             "endpoint": cluster.get("endpoint"),
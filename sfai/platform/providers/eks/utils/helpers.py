@@ -1,10 +1,16 @@
 import subprocess
 from pathlib import Path
+from typing import List, Optional
 from rich.console import Console
-from sfai.constants import DOCKER_EMOJI, PACKAGE_EMOJI, ROCKET_EMOJI, ERROR_EMOJI
+from sfai.constants import DOCKER_EMOJI, ROCKET_EMOJI, ERROR_EMOJI
+from sfai.platform.build import REMOTE_PLATFORM, build_artifact, promote_image
+from sfai.platform.streaming import run_command
 import logging
-import boto3
 import json
+from sfai.platform.providers.eks.utils.session import (
+    call_with_fresh_credentials,
+    get_client,
+)
 
 console = Console()
 logger = logging.getLogger(__name__)
@@ -13,9 +19,12 @@ logger = logging.getLogger(__name__)
 def _get_ecr_repository(ecr_repo: str, region: str, profile: str = "default") -> str:
     """Verify ECR repository exists and is accessible."""
     try:
-        session = boto3.Session(profile_name=profile)
-        client = session.client("ecr", region_name=region)
-        response = client.describe_repositories(repositoryNames=[ecr_repo])
+        response = call_with_fresh_credentials(
+            profile,
+            lambda: get_client("ecr", profile, region).describe_repositories(
+                repositoryNames=[ecr_repo]
+            ),
+        )
         repo = response["repositories"][0]
         uri = repo["repositoryUri"]
         return uri
@@ -29,7 +38,7 @@ def _update_kubeconfig(
 ) -> bool:
     """Update kubeconfig for the EKS cluster."""
     try:
-        subprocess.run(
+        run_command(
             [
                 "aws",
                 "eks",
@@ -50,9 +59,17 @@ def _update_kubeconfig(
 
 
 def _build_and_push_image(
-    path: Path, ecr_repo_uri: str, region: str, image_tag: str, profile: str
+    path: Path,
+    ecr_repo_uri: str,
+    region: str,
+    app_name: str,
+    fingerprint: str,
+    image_tag: str,
+    profile: str,
+    no_cache: bool = False,
+    extra_tags: Optional[List[str]] = None,
 ) -> str:
-    """Build Docker image and push to ECR."""
+    """Push the app's linux/amd64 artifact to ECR, also under the extra tags."""
     try:
         full_image_name = f"{ecr_repo_uri}:{image_tag}"
 
@@ -63,17 +80,21 @@ def _build_and_push_image(
             f"{ecr_repo_uri.split('/')[0]}"
         )
         console.print("Logging in to ECR....")
-        subprocess.run(cmd, shell=True, check=True)
-
-        # Build image
-        build_cmd = ["docker", "build", "-t", full_image_name, str(path)]
-        console.print(f"{DOCKER_EMOJI} Building image....")
-        subprocess.run(build_cmd, check=True)
+        run_command(cmd, shell=True, check=True)
 
-        # Push image
-        push_cmd = ["docker", "push", full_image_name]
-        console.print(f"{PACKAGE_EMOJI} Pushing image....")
-        subprocess.run(push_cmd, check=True)
+        # Build the shared artifact unless another target did, then push it
+        console.print(f"{DOCKER_EMOJI} Building and pushing image....")
+        artifact = build_artifact(
+            path,
+            app_name,
+            fingerprint,
+            platform=REMOTE_PLATFORM,
+            no_cache=no_cache,
+        )
+        promote_image(
+            artifact,
+            [full_image_name, *(f"{ecr_repo_uri}:{tag}" for tag in extra_tags or [])],
+        )
 
         console.print(
             f"{ROCKET_EMOJI} Successfully built and pushed image: {full_image_name}"
@@ -85,7 +106,9 @@ def _build_and_push_image(
         return None
 
 
-def get_public_url(app_name: str, namespace: str) -> str:
+def get_public_url(
+    app_name: str, namespace: str, kube_context: Optional[str] = None
+) -> str:
     try:
         cmd = [
             "kubectl",
@@ -97,6 +120,8 @@ def get_public_url(app_name: str, namespace: str) -> str:
             "-o",
             "json",
         ]
+        if kube_context:
+            cmd.extend(["--context", kube_context])
         output = subprocess.check_output(cmd, text=True)
         ingress = json.loads(output)
 
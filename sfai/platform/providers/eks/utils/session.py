@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+import boto3
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# How long a successful credential check is trusted when the credentials do
+# not expose an expiry (e.g. static access keys)
+DEFAULT_CREDENTIAL_TTL = 300.0
+# Re-check this many seconds before temporary credentials expire
+EXPIRY_MARGIN = 60.0
+
+_EXPIRED_TOKEN_CODES = {"ExpiredToken", "ExpiredTokenException", "RequestExpired"}
+
+_lock = threading.RLock()
+_sessions: Dict[Tuple[str, Optional[str]], boto3.Session] = {}
+_clients: Dict[Tuple[str, str, Optional[str]], Any] = {}
+_verified_until: Dict[str, float] = {}
+
+
+def get_session(
+    profile: str = "default", region: Optional[str] = None
+) -> boto3.Session:
+    """
+    Get the process wide boto3 session for a profile and region.
+
+    Args:
+        profile: str
+            AWS profile name
+        region: Optional[str]
+            AWS region, the profile's default if None
+
+    Returns:
+        boto3.Session
+            The memoized session
+    """
+    key = (profile, region)
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = boto3.Session(profile_name=profile, region_name=region)
+            _sessions[key] = session
+        return session
+
+
+def get_client(
+    service: str, profile: str = "default", region: Optional[str] = None
+) -> Any:
+    """
+    Get the process wide boto3 client for a service, profile and region.
+
+    Args:
+        service: str
+            AWS service name (e.g. "ecr", "eks", "sts")
+        profile: str
+            AWS profile name
+        region: Optional[str]
+            AWS region, the profile's default if None
+
+    Returns:
+        Any
+            The memoized boto3 client
+    """
+    key = (service, profile, region)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = get_session(profile, region).client(service)
+            _clients[key] = client
+        return client
+
+
+def invalidate(profile: str = "default") -> None:
+    """
+    Forget the sessions, clients and credential check of a profile.
+
+    Args:
+        profile: str
+            AWS profile name
+
+    Returns:
+        None
+    """
+    with _lock:
+        for key in [key for key in _sessions if key[0] == profile]:
+            del _sessions[key]
+        for key in [key for key in _clients if key[1] == profile]:
+            del _clients[key]
+        _verified_until.pop(profile, None)
+
+
+def verify_credentials(profile: str = "default", force: bool = False) -> bool:
+    """
+    Check that a profile has valid credentials, caching successful checks.
+
+    A successful STS caller identity check is trusted until shortly before
+    the credentials expire, or for DEFAULT_CREDENTIAL_TTL seconds when
+    they have no expiry.
+
+    Args:
+        profile: str
+            AWS profile name
+        force: bool
+            Ignore a cached successful check
+
+    Returns:
+        bool
+            True if the credentials are valid
+    """
+    with _lock:
+        if not force and _verified_until.get(profile, 0.0) > time.monotonic():
+            return True
+    try:
+        logger.warning(f"Verifying AWS credentials for profile: {profile}")
+        get_client("sts", profile).get_caller_identity()
+    except Exception as e:
+        logger.error(f"Error verifying AWS credentials: {e}")
+        invalidate(profile)
+        return False
+
+    ttl = _credential_ttl(get_session(profile))
+    with _lock:
+        _verified_until[profile] = time.monotonic() + ttl
+    return True
+
+
+def call_with_fresh_credentials(profile: str, call: Callable[[], T]) -> T:
+    """
+    Run an AWS call, re-checking the credentials once if they expired.
+
+    The call must look its clients up through get_client so the retry uses
+    a fresh session.
+
+    Args:
+        profile: str
+            AWS profile name the call uses
+        call: Callable[[], T]
+            Function making the AWS request
+
+    Returns:
+        T
+            The call's result
+
+    Raises:
+        botocore.exceptions.ClientError
+            If the call fails for another reason, or again after re-checking
+    """
+    try:
+        return call()
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") not in _EXPIRED_TOKEN_CODES:
+            raise
+        invalidate(profile)
+        if not verify_credentials(profile, force=True):
+            raise
+        return call()
+
+
+def _credential_ttl(session: boto3.Session) -> float:
+    credentials = session.get_credentials()
+    # refreshable credentials (SSO, assumed roles) know when they expire
+    expiry = getattr(credentials, "_expiry_time", None)
+    if not isinstance(expiry, datetime):
+        return DEFAULT_CREDENTIAL_TTL
+    if expiry.tzinfo is None:
+        expiry = expiry.replace(tzinfo=timezone.utc)
+    remaining = (expiry - datetime.now(timezone.utc)).total_seconds()
+    return max(remaining - EXPIRY_MARGIN, 0.0)
@@ -16,6 +16,7 @@ from sfai.platform.providers.heroku.utils.deploy import (
 )
 from sfai.platform.providers.heroku.utils.deploy import COLOR_PATTERN
 from sfai.core.decorators import with_context
+from sfai.platform.streaming import stream_command
 
 logger = logging.getLogger(__name__)
 ctx_mgr = ContextManager()
@@ -124,7 +125,14 @@ class HerokuPlatform(BasePlatform):
 
     @with_context
     def deploy(self, context: Dict[str, Any], **kwargs) -> BaseResponse:
-        deploy_to_heroku(**kwargs)
+        try:
+            result = deploy_to_heroku(context=context, **kwargs)
+        except subprocess.CalledProcessError as e:
+            return BaseResponse(
+                success=False, error=str(e), message="Deployment failed"
+            )
+        if not result.success:
+            return result
         return BaseResponse(
             success=True,
             message="Deployment successful",
@@ -160,11 +168,22 @@ class HerokuPlatform(BasePlatform):
         return BaseResponse(success=True, message="App status checked successfully")
 
     @with_context
-    def logs(self, context: Dict[str, Any]) -> BaseResponse:
-        subprocess.run(
-            ["heroku", "logs", "--app", context.get("heroku_app_name")], check=False
-        )
-        return BaseResponse(success=True, message="Logs fetched successfully")
+    def logs(
+        self,
+        context: Dict[str, Any],
+        follow: bool = False,
+        since: Optional[str] = None,
+        tail: Optional[int] = None,
+        **kwargs,
+    ) -> BaseResponse:
+        if since:
+            logger.warning("Heroku logs do not support --since, ignoring it")
+        cmd = ["heroku", "logs", "--app", context.get("heroku_app_name")]
+        if follow:
+            cmd.append("--tail")
+        if tail is not None:
+            cmd.extend(["--num", str(tail)])
+        return stream_command(cmd, f"logs for {context.get('heroku_app_name')}")
 
     @with_context
     def open(
@@ -1,13 +1,22 @@
 import json
 import subprocess
+import threading
 from pathlib import Path
-from typing import Union, Any, Optional
+from typing import Dict, Union, Any, Optional
 import re
-import platform
 from sfai.context.manager import ContextManager
 from datetime import datetime
 from rich.console import Console
-from sfai.constants import ROCKET_EMOJI
+from sfai.constants import DOCKER_EMOJI, ROCKET_EMOJI, SUCCESS_EMOJI
+from sfai.platform.build import (
+    REMOTE_PLATFORM,
+    build_artifact,
+    build_fingerprint,
+    fingerprint_tag,
+    image_lock,
+    promote_image,
+)
+from sfai.platform.streaming import run_command
 from sfai.platform.providers.heroku.utils.checks import (
     generate_suffix,
     is_heroku_repo,
@@ -19,45 +28,83 @@ console = Console()
 ctx_mgr = ContextManager()
 
 COLOR_PATTERN = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+_REPO_LOCK = threading.Lock()
 
 
-def _push_with_buildx(app_name: str, app_path: Path) -> None:
-    """Build and push a linux/amd64 single-arch image directly with buildx.
-
-    This is used on Apple Silicon machines where the default heroku container:push
-    produces multi-arch manifest lists that Heroku's registry doesn't support.
+def _push_container(
+    app_name: str,
+    app_path: Path,
+    image: Optional[str] = None,
+    fingerprint: Optional[str] = None,
+) -> None:
+    """Push a linux/amd64 single-arch image artifact, then release it.
+
+    The image is built for linux/amd64 on every machine, on Apple Silicon the
+    default heroku container:push produces multi-arch manifest lists that
+    Heroku's registry doesn't support. Without an image the last pushed one
+    is released again.
+
+    Docker mounts layers it has pushed to another repository of the same
+    registry, which Heroku rejects across apps, so the other apps' tags are
+    removed first. Pushes to registry.heroku.com run one at a time, the
+    environments deployed at once would otherwise untag each other's images.
 
     Args:
         app_name: The Heroku app name (with environment suffix)
         app_path: Path to the application directory
+        image: Local image artifact to push, see build_artifact
+        fingerprint: Build fingerprint of the image, tagged in the registry
     """
-
-    # Build and push in one step - avoids cross-repo mount optimisation
-    subprocess.run(
-        [
-            "docker",
-            "buildx",
-            "build",
-            "--platform",
-            "linux/amd64",
-            "--push",  # stream layers directly to prod app repo
-            "--no-cache",  # guarantee fresh digests, no mounts
-            "--provenance=false",
-            "-t",
-            f"registry.heroku.com/{app_name}/web",
-            ".",
-        ],
-        check=True,
-        cwd=app_path,
-    )
+    if not image:
+        console.print(f"{SUCCESS_EMOJI} Source unchanged, releasing the last image")
+    else:
+        console.print(f"{DOCKER_EMOJI} Pushing {image}...")
+        repository = f"registry.heroku.com/{app_name}/web"
+        refs = [repository]
+        if fingerprint:
+            refs.append(f"{repository}:{fingerprint_tag(fingerprint)}")
+        with image_lock("registry.heroku.com"):
+            _remove_other_app_images(app_name)
+            promote_image(image, refs)
     # Release the image
-    subprocess.run(
+    run_command(
         ["heroku", "container:release", "web", "--app", app_name],
         check=True,
         cwd=app_path,
     )
 
 
+def _remove_other_app_images(app_name: str) -> None:
+    """Untag the local images of other Heroku apps.
+
+    Docker tries to mount layers it has pushed to another repository of the
+    same registry, which Heroku rejects across apps. Only the other apps'
+    tags are removed, the layers and this app's image stay cached.
+
+    Args:
+        app_name: The Heroku app name (with environment suffix)
+    """
+    own_repository = f"registry.heroku.com/{app_name}/"
+    try:
+        refs = subprocess.check_output(
+            [
+                "docker",
+                "images",
+                "--filter",
+                "reference=registry.heroku.com/*/*",
+                "--format",
+                "{{.Repository}}:{{.Tag}}",
+            ],
+            text=True,
+        ).splitlines()
+        others = [ref for ref in refs if not ref.startswith(own_repository)]
+        if others:
+            run_command(["docker", "rmi", *others], check=False)
+    except Exception:
+        # Non-fatal - continue even if the cleanup fails
+        pass
+
+
 def create_heroku_app(
     app_name: str,
     base_app_name: str,
@@ -179,15 +226,20 @@ def create_heroku_app(
     )
 
 
-def deploy_to_heroku(path: Union[str, Path], **kwargs: Any) -> BaseResponse:
+def deploy_to_heroku(
+    path: Union[str, Path], context: Optional[Dict[str, Any]] = None, **kwargs: Any
+) -> BaseResponse:
     """Deploy the current app to Heroku.
 
     Args:
         path: The path to the app.
+        context: Context of the environment to deploy, the active one if None.
         commit_message: The commit message.
         branch: The branch to deploy to.
+        no_cache: Rebuild the container image without cached layers.
+        fingerprint: Build fingerprint of the app, computed if not given.
     """
-    ctx = ctx_mgr.read_context()
+    ctx = context or ctx_mgr.read_context()
     app_path = Path(path).resolve()
     app_name = ctx.get("app_name")
     heroku_app_name = (
@@ -197,28 +249,6 @@ def deploy_to_heroku(path: Union[str, Path], **kwargs: Any) -> BaseResponse:
     branch = kwargs.get("branch")
     deployment_type = ctx.get("deployment_type") or "buildpack"
 
-    # Always clear local Heroku-registry images to prevent cross-repo mounts
-    try:
-        imgs = (
-            subprocess.check_output(
-                [
-                    "docker",
-                    "images",
-                    "--filter",
-                    "reference=registry.heroku.com/*",
-                    "--quiet",
-                ]
-            )
-            .decode()
-            .strip()
-            .splitlines()
-        )
-        if imgs:
-            subprocess.run(["docker", "rmi", "-f", *imgs], check=False)
-    except Exception:
-        # Non-fatal - continue even if prune fails
-        pass
-
     console.print(
         f"{ROCKET_EMOJI} Deploying {heroku_app_name} to Heroku using "
         f"{deployment_type} deployment type..."
@@ -243,24 +273,28 @@ def deploy_to_heroku(path: Union[str, Path], **kwargs: Any) -> BaseResponse:
             branch = get_default_branch(app_path)
             console.print(f"Using current branch: {branch}")
 
-        # check if there are any changes to commit
-        changes = subprocess.run(
-            ["git", "status", "--porcelain"],
-            cwd=app_path,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-
-        if changes.stdout.strip():
-            subprocess.run(["git", "add", "."], cwd=app_path, check=True)
-            subprocess.run(
-                ["git", "commit", "-m", commit_message], cwd=app_path, check=True
+        # check if there are any changes to commit, environments deployed at
+        # the same time commit the same work tree
+        with _REPO_LOCK:
+            changes = subprocess.run(
+                ["git", "status", "--porcelain"],
+                cwd=app_path,
+                capture_output=True,
+                text=True,
+                check=False,
             )
-        else:
-            console.print("No changes to commit.")
 
-        subprocess.run(["git", "push", "heroku", branch], cwd=app_path, check=True)
+            if changes.stdout.strip():
+                run_command(["git", "add", "."], cwd=app_path, check=True)
+                run_command(
+                    ["git", "commit", "-m", commit_message], cwd=app_path, check=True
+                )
+            else:
+                console.print("No changes to commit.")
+
+        # push to this environment's app, the heroku remote is the default one
+        remote = ctx.get("git_url") or "heroku"
+        run_command(["git", "push", remote, branch], cwd=app_path, check=True)
 
         return BaseResponse(
             success=True,
@@ -269,33 +303,33 @@ def deploy_to_heroku(path: Union[str, Path], **kwargs: Any) -> BaseResponse:
 
     elif deployment_type == "container":
         # Set stack to container
-        subprocess.run(
+        run_command(
             ["heroku", "stack:set", "container", "--app", heroku_app_name],
             cwd=app_path,
             check=True,
         )
         # login to heroku container registry
-        subprocess.run(["heroku", "container:login"], cwd=app_path, check=True)
-
-        # Check if we're on Apple Silicon and use the appropriate method
-        if platform.machine() in ["arm64", "aarch64"]:
-            console.print(
-                "Apple Silicon detected - using environment variables for "
-                "Heroku compatibility..."
-            )
-            _push_with_buildx(heroku_app_name, app_path)
-        else:
-            # Standard heroku container:push for Intel machines
-            subprocess.run(
-                ["heroku", "container:push", "web", "--app", heroku_app_name],
-                cwd=app_path,
-                check=True,
-            )
-            subprocess.run(
-                ["heroku", "container:release", "web", "--app", heroku_app_name],
-                cwd=app_path,
-                check=True,
+        run_command(["heroku", "container:login"], cwd=app_path, check=True)
+
+        fingerprint = kwargs.get("fingerprint") or build_fingerprint(app_path)
+        no_cache = kwargs.get("no_cache", False)
+        image = None
+        if no_cache or fingerprint != ctx.get("build_fingerprint"):
+            console.print(f"{DOCKER_EMOJI} Building linux/amd64 image...")
+            image = build_artifact(
+                app_path,
+                app_name,
+                fingerprint,
+                platform=REMOTE_PLATFORM,
+                no_cache=no_cache,
             )
+        _push_container(heroku_app_name, app_path, image, fingerprint)
+        ctx_mgr.update_platform(
+            platform="heroku",
+            values={"build_fingerprint": fingerprint},
+            environment=ctx.get("active_environment", "default"),
+            activate=kwargs.get("activate", True),
+        )
 
         return BaseResponse(
             success=True,
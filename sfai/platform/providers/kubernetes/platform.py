@@ -1,12 +1,19 @@
 from typing import Dict, Any, Optional
 from pathlib import Path
 import subprocess
+from sfai.platform.streaming import run_command
 from sfai.core.base import BasePlatform
 from sfai.core.decorators import with_context
 from sfai.constants import PACKAGE_EMOJI, PORT_EMOJI, ROCKET_EMOJI, CHARTS_PATH
 from sfai.core.response_models import BaseResponse
 from rich.console import Console
+from rich.table import Table
+from sfai.platform.providers.kubernetes.utils.api import (
+    collect_status,
+    reset_api_client,
+)
 from sfai.platform.providers.kubernetes.utils.helpers import get_app_version
+from sfai.platform.streaming import stream_command
 from sfai.platform.providers.kubernetes.utils.checks import (
     _is_kubectl_installed,
     _is_helm_installed,
@@ -14,6 +21,9 @@ from sfai.platform.providers.kubernetes.utils.checks import (
 
 console = Console()
 
+# Upper bound of pods whose logs are streamed concurrently
+MAX_LOG_STREAMS = 50
+
 
 class K8sPlatform(BasePlatform):
     def __init__(self, env: str = "k8s"):
@@ -83,6 +93,10 @@ class K8sPlatform(BasePlatform):
             "--namespace",
             namespace,
         ]
+        # pinned so deploys running at the same time don't depend on the
+        # kubeconfig's current context
+        if context.get("kube_context"):
+            cmd.extend(["--kube-context", context["kube_context"]])
 
         # Check if kubectl is installed
         if not _is_kubectl_installed():
@@ -120,7 +134,7 @@ class K8sPlatform(BasePlatform):
             cmd.extend(["--set", f"{key}={value}"])
 
         try:
-            subprocess.run(cmd, check=True)
+            run_command(cmd, check=True)
             return BaseResponse(
                 success=True,
                 message=f"Deployed {name} to {namespace}",
@@ -144,40 +158,36 @@ class K8sPlatform(BasePlatform):
         )
 
     @with_context
-    def logs(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    def logs(
+        self,
+        context: Dict[str, Any],
+        follow: bool = False,
+        since: Optional[str] = None,
+        tail: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
         name = context.get("app_name")
         namespace = context.get("namespace", "default")
-        pod = subprocess.run(
-            [
-                "kubectl",
-                "get",
-                "pods",
-                "-l",
-                f"app={name}",
-                "-n",
-                namespace,
-                "-o",
-                "jsonpath={.items[0].metadata.name}",
-            ],
-            check=False,
-            capture_output=True,
-            text=True,
-        ).stdout.strip()
-
-        if not pod:
-            return BaseResponse(
-                success=False,
-                error="No pod found.",
-            )
-        else:
-            subprocess.run(
-                ["kubectl", "logs", pod, "-n", namespace],
-                check=True,
-            )
-            return BaseResponse(
-                success=True,
-                message=f"Logs for {name} from {pod}",
-            )
+
+        # one stream for every pod of the app, each line prefixed by its pod
+        cmd = [
+            "kubectl",
+            "logs",
+            "-l",
+            f"app={name}",
+            "-n",
+            namespace,
+            "--prefix",
+            "--all-containers",
+            f"--max-log-requests={MAX_LOG_STREAMS}",
+            # kubectl only shows the last 10 lines per pod for selectors
+            f"--tail={tail if tail is not None else -1}",
+        ]
+        if follow:
+            cmd.append("--follow")
+        if since:
+            cmd.append(f"--since={since}")
+        return stream_command(cmd, f"logs for {name}")
 
     @with_context
     def open(
@@ -197,24 +207,74 @@ class K8sPlatform(BasePlatform):
     def status(self, context: Dict[str, Any]) -> Dict[str, Any]:
         name = context.get("app_name")
         namespace = context.get("namespace", "default")
-        cmds = [
-            (
-                f"{PACKAGE_EMOJI} Pods",
-                ["kubectl", "get", "pods", "-l", f"app={name}", "-n", namespace],
-            ),
-            (
-                f"{PORT_EMOJI} Services",
-                ["kubectl", "get", "svc", f"{name}-service", "-n", namespace],
-            ),
-            (
-                f"{ROCKET_EMOJI} Deployments",
-                ["kubectl", "get", "deployment", name, "-n", namespace],
-            ),
-        ]
-        for title, cmd in cmds:
-            console.print(f"{title}:")
-            subprocess.run(cmd, check=True)
+        try:
+            try:
+                data = collect_status(name, namespace)
+            except Exception as e:
+                if getattr(e, "status", None) != 401:
+                    raise
+                # the cached credentials may have expired, reload them once
+                reset_api_client()
+                data = collect_status(name, namespace)
+        except Exception as e:
+            status_code = getattr(e, "status", None)
+            reason = getattr(e, "reason", None) or str(e)
+            return BaseResponse(
+                success=False,
+                error=f"Failed to get status for {name} in {namespace}: {reason}",
+                status_code=status_code,
+            )
+
+        _print_status(data)
         return BaseResponse(
             success=True,
             message=f"Status for {name} in {namespace}",
+            **data,
+        )
+
+
+def _print_status(data: Dict[str, Any]) -> None:
+    deployment = data.get("deployment")
+    console.print(f"{ROCKET_EMOJI} Deployment:")
+    if deployment:
+        table = Table("NAME", "READY", "UP-TO-DATE", "AVAILABLE", "IMAGE TAG")
+        table.add_row(
+            deployment["name"],
+            f"{deployment['ready_replicas']}/{deployment['replicas']}",
+            str(deployment["updated_replicas"]),
+            str(deployment["available_replicas"]),
+            deployment["image_tag"] or "-",
         )
+        console.print(table)
+    else:
+        console.print("  not found")
+
+    service = data.get("service")
+    console.print(f"{PORT_EMOJI} Service:")
+    if service:
+        table = Table("NAME", "TYPE", "CLUSTER-IP", "EXTERNAL", "PORTS")
+        table.add_row(
+            service["name"],
+            service["type"] or "-",
+            service["cluster_ip"] or "-",
+            ", ".join(service["external"]) or "-",
+            ", ".join(service["ports"]) or "-",
+        )
+        console.print(table)
+    else:
+        console.print("  not found")
+
+    console.print(f"{PACKAGE_EMOJI} Pods:")
+    if data.get("pods"):
+        table = Table("NAME", "READY", "STATUS", "RESTARTS", "IMAGE TAG")
+        for pod in data["pods"]:
+            table.add_row(
+                pod["name"],
+                pod["ready"],
+                pod["phase"] or "-",
+                str(pod["restarts"]),
+                pod["image_tag"] or "-",
+            )
+        console.print(table)
+    else:
+        console.print("  no pods found")
@@ -0,0 +1,181 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+# kubernetes is imported inside the functions, it is slow to import and only
+# needed by the commands talking to a cluster
+
+# seconds to wait for each API request
+REQUEST_TIMEOUT = 15
+
+_API_CLIENTS: Dict[Tuple[str, Optional[int]], Any] = {}
+_API_CLIENTS_LOCK = threading.Lock()
+
+
+def _kubeconfig_key() -> Tuple[str, Optional[int]]:
+    path = os.environ.get("KUBECONFIG", "~/.kube/config").split(os.pathsep)[0]
+    path = os.path.expanduser(path)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+    return path, mtime
+
+
+def get_api_client() -> Any:
+    """
+    Get the shared Kubernetes API client for the current kubeconfig context.
+
+    The kubeconfig is loaded once and the client, with its connection pool,
+    is reused until the kubeconfig file changes (e.g. after switching the
+    current context).
+
+    Returns:
+        kubernetes.client.ApiClient
+            The shared API client
+    """
+    from kubernetes import client, config  # noqa: PLC0415 - slow import
+
+    key = _kubeconfig_key()
+    with _API_CLIENTS_LOCK:
+        api_client = _API_CLIENTS.get(key)
+        if api_client is None:
+            configuration = client.Configuration()
+            try:
+                config.load_kube_config(client_configuration=configuration)
+            except config.ConfigException:
+                config.load_incluster_config(client_configuration=configuration)
+            api_client = client.ApiClient(configuration)
+            _API_CLIENTS.clear()
+            _API_CLIENTS[key] = api_client
+        return api_client
+
+
+def reset_api_client() -> None:
+    """Drop the shared API client, e.g. after its credentials were rejected."""
+    with _API_CLIENTS_LOCK:
+        _API_CLIENTS.clear()
+
+
+def collect_status(name: str, namespace: str = "default") -> Dict[str, Any]:
+    """
+    Fetch the deployment, service and pods of an app concurrently.
+
+    Args:
+        name: str
+            App name, used as deployment name, service prefix and pod label
+        namespace: str
+            Namespace the app is deployed to
+
+    Returns:
+        Dict[str, Any]
+            "deployment" and "service" summaries (None when missing) and the
+            list of "pods"
+
+    Raises:
+        kubernetes.client.rest.ApiException
+            If the cluster rejects a request for another reason than a
+            missing resource
+    """
+    from kubernetes import client  # noqa: PLC0415 - slow import
+
+    api_client = get_api_client()
+    core = client.CoreV1Api(api_client)
+    apps = client.AppsV1Api(api_client)
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        pods = pool.submit(
+            core.list_namespaced_pod,
+            namespace,
+            label_selector=f"app={name}",
+            _request_timeout=REQUEST_TIMEOUT,
+        )
+        service = pool.submit(
+            _read_optional,
+            core.read_namespaced_service,
+            f"{name}-service",
+            namespace,
+        )
+        deployment = pool.submit(
+            _read_optional, apps.read_namespaced_deployment, name, namespace
+        )
+
+        return {
+            "deployment": _deployment_summary(deployment.result()),
+            "service": _service_summary(service.result()),
+            "pods": [_pod_summary(pod) for pod in pods.result().items],
+        }
+
+
+def _read_optional(read, name: str, namespace: str) -> Optional[Any]:
+    from kubernetes.client.rest import ApiException  # noqa: PLC0415 - slow import
+
+    try:
+        return read(name, namespace, _request_timeout=REQUEST_TIMEOUT)
+    except ApiException as e:
+        if e.status == 404:
+            return None
+        raise
+
+
+def image_tag(image: Optional[str]) -> Optional[str]:
+    """Return the tag of an image reference, "latest" when it has none."""
+    if not image:
+        return None
+    image = image.split("@", 1)[0]
+    name = image.rsplit("/", 1)[-1]
+    return name.split(":", 1)[1] if ":" in name else "latest"
+
+
+def _deployment_summary(deployment: Optional[Any]) -> Optional[Dict[str, Any]]:
+    if deployment is None:
+        return None
+    containers = deployment.spec.template.spec.containers or []
+    image = containers[0].image if containers else None
+    status = deployment.status
+    return {
+        "name": deployment.metadata.name,
+        "replicas": deployment.spec.replicas or 0,
+        "ready_replicas": status.ready_replicas or 0,
+        "updated_replicas": status.updated_replicas or 0,
+        "available_replicas": status.available_replicas or 0,
+        "image": image,
+        "image_tag": image_tag(image),
+    }
+
+
+def _service_summary(service: Optional[Any]) -> Optional[Dict[str, Any]]:
+    if service is None:
+        return None
+    ingress = (
+        service.status.load_balancer.ingress
+        if service.status and service.status.load_balancer
+        else None
+    ) or []
+    return {
+        "name": service.metadata.name,
+        "type": service.spec.type,
+        "cluster_ip": service.spec.cluster_ip,
+        "external": [entry.hostname or entry.ip for entry in ingress],
+        "ports": [
+            (
+                f"{port.port}:{port.node_port}/{port.protocol}"
+                if port.node_port
+                else f"{port.port}/{port.protocol}"
+            )
+            for port in service.spec.ports or []
+        ],
+    }
+
+
+def _pod_summary(pod: Any) -> Dict[str, Any]:
+    statuses: List[Any] = pod.status.container_statuses or []
+    return {
+        "name": pod.metadata.name,
+        "phase": pod.status.phase,
+        "ready": f"{sum(1 for s in statuses if s.ready)}/{len(statuses)}",
+        "restarts": sum(s.restart_count or 0 for s in statuses),
+        "image_tag": image_tag(statuses[0].image) if statuses else None,
+        "node": pod.spec.node_name if pod.spec else None,
+    }
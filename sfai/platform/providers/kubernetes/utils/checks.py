@@ -19,3 +19,16 @@ def _is_helm_installed() -> bool:
         return True
     except (subprocess.CalledProcessError, FileNotFoundError):
         return False
+
+
+def _kube_context_exists(name: str) -> bool:
+    """Check if the kubeconfig has a context of that name."""
+    try:
+        subprocess.run(
+            ["kubectl", "config", "get-contexts", name],
+            capture_output=True,
+            check=True,
+        )
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
@@ -4,6 +4,8 @@ from pathlib import Path
 from sfai.core.base import BasePlatform
 from sfai.core.decorators import with_context
 from sfai.platform.providers.local.utils import find_free_port
+from sfai.platform.build import build_artifact, build_fingerprint, promote_image
+from sfai.platform.streaming import run_command, stream_command
 from sfai.core.response_models import BaseResponse
 from sfai.context.manager import ContextManager
 from rich.console import Console
@@ -30,31 +32,35 @@ class LocalPlatform(BasePlatform):
     def deploy(self, context: Dict[str, Any], path: Path, **kwargs) -> Dict[str, Any]:
         """Deploy the application to local Docker."""
         try:
-            ctx = ctx_mgr.read_context()
-            app_name = ctx.get("app_name")
+            app_name = context.get("app_name")
             app_path = Path(path).resolve()
 
             # Clean up any existing container first
             console.print(f"{DOCKER_EMOJI} Cleaning up existing container: {app_name}")
-            self.delete(context)
+            self.delete(context=context)
 
             # Check if Dockerfile exists
             dockerfile_path = app_path / "Dockerfile"
             if not dockerfile_path.exists():
                 raise RuntimeError(f"Dockerfile not found in {app_path}")
 
-            # Build image
-            console.print(f"{DOCKER_EMOJI} Building Docker image: {app_name}")
-            subprocess.run(
-                ["docker", "build", "-t", app_name, "."], cwd=app_path, check=True
+            # Build the image, unless another target already built these sources
+            fingerprint = kwargs.get("fingerprint") or build_fingerprint(app_path)
+            console.print(f"{DOCKER_EMOJI} Preparing Docker image: {app_name}")
+            image = build_artifact(
+                app_path,
+                app_name,
+                fingerprint,
+                no_cache=kwargs.get("no_cache", False),
             )
+            promote_image(image, [app_name], push=False)
 
             # Find a free local port starting from 8080
             free_port = find_free_port(8080, 8100)
 
             # Run container
             console.print(f"{DOCKER_EMOJI} Starting container: {app_name}")
-            subprocess.run(
+            run_command(
                 [
                     "docker",
                     "run",
@@ -65,7 +71,7 @@ class LocalPlatform(BasePlatform):
                     f"{free_port}:8080",
                     "-e",
                     "PORT=8080",
-                    app_name,
+                    image,
                 ],
                 check=True,
             )
@@ -75,7 +81,10 @@ class LocalPlatform(BasePlatform):
                 values={
                     "public_url": f"http://localhost:{free_port}",
                     "port": free_port,
+                    "build_fingerprint": fingerprint,
                 },
+                environment=context.get("active_environment", "default"),
+                activate=kwargs.get("activate", True),
             )
 
             console.print(f"{SUCCESS_EMOJI} App deployed successfully!")
@@ -87,42 +96,44 @@ class LocalPlatform(BasePlatform):
                 success=False, error=str(e), message="Deployment failed"
             )
 
+    @with_context
     def delete(self, context: Dict[str, Any]) -> BaseResponse:
         """Stop and remove the Docker container."""
         try:
-            ctx = ctx_mgr.read_context()
-            app_name = ctx.get("app_name")
+            app_name = context.get("app_name")
 
-            subprocess.run(["docker", "stop", app_name], check=False)
-            subprocess.run(["docker", "rm", app_name], check=False)
+            run_command(["docker", "stop", app_name], check=False)
+            run_command(["docker", "rm", app_name], check=False)
             console.print(f"{SUCCESS_EMOJI} Container {app_name} stopped and removed")
 
             return BaseResponse(success=True, message="Container removed")
         except Exception as e:
             return BaseResponse(success=False, error=str(e))
 
-    def logs(self, context: Dict[str, Any]) -> BaseResponse:
-        """Get Docker container logs."""
-        try:
-            ctx = ctx_mgr.read_context()
-            app_name = ctx.get("app_name")
-
-            if not app_name:
-                return BaseResponse(success=False, error="No app name found")
-
-            result = subprocess.run(
-                ["docker", "logs", app_name], capture_output=True, text=True, check=True
-            )
-            console.print(f"{SEARCH_EMOJI} Logs for {app_name}:")
-            if result.stdout:
-                console.print(result.stdout)
-            if result.stderr:
-                console.print("[red]STDERR:[/red]")
-                console.print(result.stderr)
-
-            return BaseResponse(success=True, message="Logs retrieved")
-        except Exception as e:
-            return BaseResponse(success=False, error=str(e))
+    def logs(
+        self,
+        context: Dict[str, Any],
+        follow: bool = False,
+        since: Optional[str] = None,
+        tail: Optional[int] = None,
+        **kwargs,
+    ) -> BaseResponse:
+        """Stream Docker container logs."""
+        app_name = context.get("app_name")
+        if not app_name:
+            return BaseResponse(success=False, error="No app name found")
+
+        cmd = ["docker", "logs"]
+        if follow:
+            cmd.append("--follow")
+        if since:
+            cmd.extend(["--since", since])
+        if tail is not None:
+            cmd.extend(["--tail", str(tail)])
+        cmd.append(app_name)
+
+        console.print(f"{SEARCH_EMOJI} Logs for {app_name}:")
+        return stream_command(cmd, f"logs for {app_name}")
 
     def open(
         self, context: Dict[str, Any], path: str, url: Optional[str] = None
@@ -107,7 +107,7 @@ class MinikubePlatform(BasePlatform):
             **kwargs: Additional arguments
         """
         try:
-            deploy_to_minikube(path, **kwargs)
+            deploy_to_minikube(path, context=context, **kwargs)
             return BaseResponse(
                 success=True,
                 message="Deployment successful",
@@ -120,8 +120,8 @@ class MinikubePlatform(BasePlatform):
     def delete(self, context: Dict[str, Any]) -> BaseResponse:
         return self.k8s.delete(context=context)
 
-    def logs(self, context: Dict[str, Any]) -> BaseResponse:
-        return self.k8s.logs(context=context)
+    def logs(self, context: Dict[str, Any], **kwargs) -> BaseResponse:
+        return self.k8s.logs(context=context, **kwargs)
 
     def open(
         self,
@@ -1,14 +1,21 @@
 import subprocess
-import os
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, Optional
 from sfai.platform.providers.minikube.utils.checks import (
-    check_deployment_exists,
     get_app_version,
     _is_minikube_running,
     _start_minikube,
 )
 from sfai.context.manager import ContextManager
+from sfai.platform.build import (
+    artifact_image,
+    build_artifact,
+    build_fingerprint,
+    image_exists,
+    image_lock,
+    promote_image,
+)
+from sfai.platform.streaming import run_command
 from rich.console import Console
 from sfai.constants import (
     ERROR_EMOJI,
@@ -26,22 +33,34 @@ console = Console()
 ctx_mgr = ContextManager()
 
 
-def deploy_to_minikube(path: str = ".", **kwargs: Any) -> None:
+def deploy_to_minikube(
+    path: str = ".", context: Optional[Dict[str, Any]] = None, **kwargs: Any
+) -> None:
     """
     Deploy an application to local Minikube environment.
 
     Args:
         app_path: Union[str, Path]
             Path to the application directory
+        context: Optional[Dict[str, Any]]
+            Context of the environment to deploy, the active one if None
         values_path: Optional[str]
             Path to custom Helm values file
         set_values: Optional[str]
             Additional values to set for Helm
+        no_cache: bool
+            Rebuild the image without cached layers
+        fingerprint: Optional[str]
+            Build fingerprint of the app, computed if not given
 
     Returns:
         None
+
+    Raises:
+        RuntimeError
+            If any step of the deployment fails
     """
-    ctx = ctx_mgr.read_context()
+    ctx = context or ctx_mgr.read_context()
     app_path = Path(path).resolve()
     app_name = ctx.get("app_name")
     image_name = app_name or ctx.get("image")
@@ -50,19 +69,16 @@ def deploy_to_minikube(path: str = ".", **kwargs: Any) -> None:
 
     # Get app version from version.json
     try:
-        image_tag = get_app_version(app_path)
+        version = get_app_version(app_path)
     except (FileNotFoundError, ValueError) as e:
-        console.print(f"{ERROR_EMOJI} {e!s}")
-        return
+        raise RuntimeError(f"{ERROR_EMOJI} {e!s}") from e
 
     port = 8080
 
-    # Check if deployment with this tag already exists
-    if check_deployment_exists(app_name, image_tag):
-        raise RuntimeError(
-            f"Deployment with tag '{image_tag}' already exists. "
-            f"Please update version in version.json to deploy a new version."
-        )
+    # Identical sources produce the same image, a redeploy only re-runs helm
+    fingerprint = kwargs.get("fingerprint") or build_fingerprint(app_path)
+    image = artifact_image(image_name, fingerprint)
+    image_tag = image.rsplit(":", 1)[1]
 
     console.print(f"{CONFIG_EMOJI} Checking Minikube status...")
     if not _is_minikube_running():
@@ -71,7 +87,7 @@ def deploy_to_minikube(path: str = ".", **kwargs: Any) -> None:
         # Set kubectl context to minikube after starting
         try:
             console.print(f"{UPDATE_EMOJI} Setting kubectl context to minikube...")
-            subprocess.run(["kubectl", "config", "use-context", "minikube"], check=True)
+            run_command(["kubectl", "config", "use-context", "minikube"], check=True)
             console.print(f"{SUCCESS_EMOJI} kubectl context set to minikube")
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"Failed to set kubectl context: {e}") from e
@@ -88,7 +104,7 @@ def deploy_to_minikube(path: str = ".", **kwargs: Any) -> None:
                 console.print(
                     f"Current context is {current_context}, switching to minikube..."
                 )
-                subprocess.run(
+                run_command(
                     ["kubectl", "config", "use-context", "minikube"], check=True
                 )
             console.print(f"{SUCCESS_EMOJI} kubectl context is set to minikube")
@@ -96,6 +112,9 @@ def deploy_to_minikube(path: str = ".", **kwargs: Any) -> None:
             raise RuntimeError(f"Failed to check/set kubectl context: {e}") from e
 
     console.print(f"{CONFIG_EMOJI} Switching to Minikube Docker environment...")
+    # passed to docker rather than exported, other deploys running in this
+    # process keep talking to their own daemon
+    docker_env = {}
     try:
         # Get Minikube Docker environment variables
         result = subprocess.run(
@@ -104,7 +123,7 @@ def deploy_to_minikube(path: str = ".", **kwargs: Any) -> None:
         for line in result.stdout.splitlines():
             if line.startswith("export"):
                 key, value = line.replace("export ", "").split("=", 1)
-                os.environ[key] = value.strip('"')
+                docker_env[key] = value.strip('"')
         console.print(f"{SUCCESS_EMOJI} Switched to Minikube Docker environment")
     except subprocess.CalledProcessError as e:
         raise RuntimeError(
@@ -113,21 +132,33 @@ def deploy_to_minikube(path: str = ".", **kwargs: Any) -> None:
 
     dockerfile_path = app_path / "Dockerfile"
     if not dockerfile_path.exists():
-        console.print(
+        raise RuntimeError(
             f"{ERROR_EMOJI} Dockerfile not found in {app_path}. "
             f"Run `sfai init` or check your app structure."
         )
-        return
 
-    console.print(f"{DOCKER_EMOJI} Building Docker image: {image_name}")
-    try:
-        subprocess.run(
-            ["docker", "build", "--no-cache", "-t", f"{image_name}:{image_tag}", "."],
-            cwd=app_path,
-            check=True,
-        )
-    except subprocess.CalledProcessError:
-        raise RuntimeError(f"{ERROR_EMOJI} Docker build failed.") from None
+    no_cache = kwargs.get("no_cache", False)
+    # environments of one app share the image on minikube's daemon
+    with image_lock(f"minikube/{image_name}"):
+        if not no_cache and image_exists(image, docker_env=docker_env):
+            console.print(f"{SUCCESS_EMOJI} Source unchanged, reusing {image_tag}")
+        else:
+            console.print(f"{DOCKER_EMOJI} Preparing Docker image: {image_name}")
+            try:
+                # built once on the local daemon and loaded into the cluster
+                build_artifact(app_path, image_name, fingerprint, no_cache=no_cache)
+                console.print(f"{UPDATE_EMOJI} Loading {image} into Minikube...")
+                run_command(["minikube", "image", "load", image], check=True)
+                promote_image(
+                    image,
+                    [f"{image_name}:{version}"],
+                    push=False,
+                    docker_env=docker_env,
+                )
+            except subprocess.CalledProcessError:
+                raise RuntimeError(
+                    f"{ERROR_EMOJI} Failed to build or load the Docker image."
+                ) from None
 
     chart_path = Path("./helm-chart") if Path("./helm-chart").exists() else CHARTS_PATH
     values_file = chart_path / "values.yaml"
@@ -136,9 +167,15 @@ def deploy_to_minikube(path: str = ".", **kwargs: Any) -> None:
 
     # Save context for future reference
     ctx_mgr.update_platform(
-        platform="local",
-        values={"image": image_name, "image_tag": image_tag, "port": port},
+        platform="minikube",
+        values={
+            "image": image_name,
+            "image_tag": image_tag,
+            "build_fingerprint": fingerprint,
+            "port": port,
+        },
         environment=ctx.get("active_environment", "default"),
+        activate=kwargs.get("activate", True),
     )
     # Prepare Helm command with proper arguments
     helm_args = [
@@ -147,6 +184,8 @@ def deploy_to_minikube(path: str = ".", **kwargs: Any) -> None:
         "--install",
         app_name,
         str(chart_path),
+        "--kube-context",
+        "minikube",
         "--set",
         f"image.repository={image_name}",
         "--set",
@@ -166,7 +205,7 @@ def deploy_to_minikube(path: str = ".", **kwargs: Any) -> None:
 
     console.print(f"{PACKAGE_EMOJI} Deploying Helm chart to Minikube...")
     try:
-        subprocess.run(helm_args, check=True)
+        run_command(helm_args, check=True)
     except subprocess.CalledProcessError as e:
         raise RuntimeError(f"{ERROR_EMOJI} Helm deployment failed: {e}") from e
 
@@ -177,7 +216,10 @@ def deploy_to_minikube(path: str = ".", **kwargs: Any) -> None:
     # Display service information
     try:
         console.print(f"{TEMPLATE_EMOJI} Service information:")
-        subprocess.run(["kubectl", "get", "service", f"{app_name}-service"], check=True)
+        service = f"{app_name}-service"
+        run_command(
+            ["kubectl", "--context", "minikube", "get", "service", service], check=True
+        )
 
     except subprocess.CalledProcessError as e:
         console.print(f"{WARNING_EMOJI} Could not retrieve service information: {e}")
@@ -0,0 +1,210 @@
+import io
+import subprocess
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, Set, TextIO
+
+from sfai.core.response_models import BaseResponse
+
+# per thread (stdout, stderr) writers, see prefixed_output
+_OUTPUT = threading.local()
+_OUTPUT_LOCK = threading.RLock()
+# threads inside prefixed_output, sys.stdout is restored when none is left
+_OUTPUT_THREADS: Set[int] = set()
+
+
+def stream_command(
+    cmd: List[str], description: str, output: Optional[TextIO] = None
+) -> BaseResponse:
+    """
+    Run a command and forward its output line by line as it is produced.
+
+    Only the current line is held in memory, so long histories and follow
+    mode streams are printed without buffering. Ctrl+C stops the command
+    and is reported as a successful end of the stream.
+
+    Args:
+        cmd: List[str]
+            Command to run, e.g. ["docker", "logs", "--follow", "my-app"]
+        description: str
+            What is being streamed, used in the response message
+        output: Optional[TextIO]
+            Where to write the lines, defaults to stdout
+
+    Returns:
+        BaseResponse
+            Success once the command ends, or the error it failed with
+    """
+    output = output or sys.stdout
+    try:
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+            bufsize=1,
+        )
+    except FileNotFoundError:
+        return BaseResponse(success=False, error=f"{cmd[0]} is not installed")
+
+    try:
+        for line in process.stdout:
+            output.write(line)
+            output.flush()
+        returncode = process.wait()
+    except KeyboardInterrupt:
+        _stop(process)
+        return BaseResponse(success=True, message=f"Stopped streaming {description}")
+    finally:
+        process.stdout.close()
+
+    if returncode != 0:
+        return BaseResponse(
+            success=False,
+            error=f"Failed to fetch {description} (exit code {returncode})",
+        )
+    return BaseResponse(success=True, message=f"Fetched {description}")
+
+
+def _stop(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def run_command(cmd: Any, **kwargs: Any) -> subprocess.CompletedProcess:
+    """
+    Run a command like subprocess.run, keeping its output with its thread's.
+
+    Inside prefixed_output the command's stdout and stderr are read line by
+    line and written with the prefix, anywhere else, or when the caller
+    handles the output itself, this is subprocess.run.
+
+    Args:
+        cmd: Any
+            Command to run, as for subprocess.run
+        kwargs: Any
+            Passed on to subprocess.run, e.g. check, cwd or env
+
+    Returns:
+        subprocess.CompletedProcess
+            The finished process, without captured output when prefixed
+
+    Raises:
+        subprocess.CalledProcessError
+            If check is set and the command fails
+    """
+    check = kwargs.pop("check", False)
+    writers = getattr(_OUTPUT, "writers", None)
+    handled = {"stdout", "stderr", "capture_output", "input", "timeout"}
+    if writers is None or handled.intersection(kwargs):
+        return subprocess.run(cmd, check=check, **kwargs)
+
+    kwargs.pop("text", None)
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+        **kwargs,
+    ) as process:
+        for line in process.stdout:
+            writers[0].write(line)
+    if check and process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, cmd)
+    return subprocess.CompletedProcess(cmd, process.returncode)
+
+
+@contextmanager
+def prefixed_output(prefix: str) -> Iterator[None]:
+    """
+    Prefix every line the current thread prints, e.g. with its deploy target.
+
+    Threads running at the same time would otherwise interleave partial
+    lines. While any thread uses this, sys.stdout and sys.stderr route each
+    thread's writes to its own line buffer, which writes whole lines with
+    the prefix. Commands started with run_command are prefixed too.
+
+    Args:
+        prefix: str
+            Text put in front of each line, e.g. "[heroku:prod] "
+
+    Returns:
+        Iterator[None]
+    """
+    with _OUTPUT_LOCK:
+        if not _OUTPUT_THREADS:
+            sys.stdout = _ThreadOutput(sys.stdout, 0)
+            sys.stderr = _ThreadOutput(sys.stderr, 1)
+        _OUTPUT_THREADS.add(threading.get_ident())
+        stdout, stderr = sys.stdout.default, sys.stderr.default
+    _OUTPUT.writers = (
+        _PrefixedLines(stdout, prefix),
+        _PrefixedLines(stderr, prefix),
+    )
+    try:
+        yield
+    finally:
+        for writer in _OUTPUT.writers:
+            writer.finish()
+        del _OUTPUT.writers
+        with _OUTPUT_LOCK:
+            _OUTPUT_THREADS.discard(threading.get_ident())
+            if not _OUTPUT_THREADS:
+                sys.stdout, sys.stderr = stdout, stderr
+
+
+class _PrefixedLines(io.TextIOBase):
+    """Writes whole lines with a prefix, keeping partial lines until done."""
+
+    def __init__(self, stream: TextIO, prefix: str):
+        self._stream = stream
+        self._prefix = prefix
+        self._partial = ""
+
+    def write(self, text: str) -> int:
+        *lines, self._partial = (self._partial + text).split("\n")
+        if lines:
+            with _OUTPUT_LOCK:
+                for line in lines:
+                    self._stream.write(f"{self._prefix}{line}\n")
+                self._stream.flush()
+        return len(text)
+
+    def finish(self) -> None:
+        if self._partial:
+            self.write("\n")
+
+
+class _ThreadOutput(io.TextIOBase):
+    """Stands in for sys.stdout or sys.stderr inside prefixed_output."""
+
+    def __init__(self, default: TextIO, index: int):
+        self.default = default
+        self._index = index
+
+    def _target(self) -> TextIO:
+        writers = getattr(_OUTPUT, "writers", None)
+        return writers[self._index] if writers else self.default
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def isatty(self) -> bool:
+        return self.default.isatty()
+
+    def fileno(self) -> int:
+        return self.default.fileno()
+
+    @property
+    def encoding(self) -> str:
+        return getattr(self.default, "encoding", "utf-8")
@@ -1,3 +1,5 @@
+from typing import Any, Dict
+
 from sfai.context.manager import ContextManager
 from sfai.core.response_models import BaseResponse
 
@@ -34,61 +36,13 @@ def switch(
         status = ctx_mgr.check_platform_environment(platform, environment)
 
         if not status["exists"]:
-            if not status["platform_exists"]:
-                # Platform doesn't exist
-                available_platforms = status.get("available_platforms", [])
-                if available_platforms:
-                    platforms_str = ", ".join(available_platforms)
-                    error_msg = (
-                        f"Platform '{platform}' is not initialized. "
-                        f"Available platforms: {platforms_str}"
-                    )
-                else:
-                    error_msg = (
-                        f"Platform '{platform}' is not initialized. "
-                        f"No platforms configured yet."
-                    )
-                error_msg += (
-                    f"\nRun: sfai platform init --platform {platform} "
-                    f"--environment {environment}"
-                )
-            else:
-                # Platform exists but environment doesn't
-                available_envs = status.get("available_environments", [])
-                if available_envs:
-                    envs_str = ", ".join(available_envs)
-                    error_msg = (
-                        f"Environment '{environment}' not found for platform "
-                        f"'{platform}'. Available environments: {envs_str}"
-                    )
-                else:
-                    error_msg = (
-                        f"Environment '{environment}' not found for platform "
-                        f"'{platform}'. No environments configured yet."
-                    )
-                error_msg += (
-                    f"\nRun: sfai platform init --platform {platform} "
-                    f"--environment {environment}"
-                )
-
-            return BaseResponse(
-                success=False,
-                error=error_msg,
-            )
-
-        # Environment exists, get the data and switch
-        env_data = ctx_mgr.read_context(platform, environment)
-        if not env_data:
             return BaseResponse(
                 success=False,
-                error=(
-                    f"Failed to load configuration for platform '{platform}' "
-                    f"environment '{environment}'."
-                ),
+                error=environment_error(platform, environment, status),
             )
 
         # Update the active environment
-        ctx_mgr.update_platform(platform, env_data, environment)
+        ctx_mgr.set_active_environment(platform, environment)
         return BaseResponse(
             success=True,
             platform=platform,
@@ -102,3 +56,59 @@ def switch(
                 f"environment: {e!s}"
             ),
         )
+
+
+def environment_error(platform: str, environment: str, status: Dict[str, Any]) -> str:
+    """
+    Explain why a platform environment cannot be switched to.
+
+    Args:
+        platform: str
+            Requested platform
+        environment: str
+            Requested environment
+        status: Dict[str, Any]
+            Result of ContextManager.check_platform_environment
+
+    Returns:
+        str
+            Error message including the command to initialize it
+    """
+    if not status["platform_exists"]:
+        # Platform doesn't exist
+        available_platforms = status.get("available_platforms", [])
+        if available_platforms:
+            platforms_str = ", ".join(available_platforms)
+            error_msg = (
+                f"Platform '{platform}' is not initialized. "
+                f"Available platforms: {platforms_str}"
+            )
+        else:
+            error_msg = (
+                f"Platform '{platform}' is not initialized. "
+                f"No platforms configured yet."
+            )
+        error_msg += (
+            f"\nRun: sfai platform init --platform {platform} "
+            f"--environment {environment}"
+        )
+    else:
+        # Platform exists but environment doesn't
+        available_envs = status.get("available_environments", [])
+        if available_envs:
+            envs_str = ", ".join(available_envs)
+            error_msg = (
+                f"Environment '{environment}' not found for platform "
+                f"'{platform}'. Available environments: {envs_str}"
+            )
+        else:
+            error_msg = (
+                f"Environment '{environment}' not found for platform "
+                f"'{platform}'. No environments configured yet."
+            )
+        error_msg += (
+            f"\nRun: sfai platform init --platform {platform} "
+            f"--environment {environment}"
+        )
+
+    return error_msg
@@ -0,0 +1,117 @@
+"""
+OpenAPI spec generation benchmarks.
+
+Budgets are in milliseconds and can be overridden on slow machines with the
+SFAI_OPENAPI_BUDGET_MS and SFAI_OPENAPI_TRANSFORM_BUDGET_MS environment
+variables.
+"""
+
+import copy
+import os
+import time
+from typing import Annotated, List, Optional
+
+import pytest
+from fastapi import FastAPI
+from fastapi.openapi.utils import get_openapi
+from pydantic import BaseModel, create_model
+
+from sfai.core.agentforce import generator
+from sfai.core.agentforce.generator import (
+    AgentForceMetadata,
+    agentforce_action,
+    custom_openapi,
+)
+
+SPEC_BUDGET_MS = float(os.environ.get("SFAI_OPENAPI_BUDGET_MS", "5000"))
+TRANSFORM_BUDGET_MS = float(os.environ.get("SFAI_OPENAPI_TRANSFORM_BUDGET_MS", "250"))
+ROUTES = 500
+RUNS = 3
+
+
+class Address(BaseModel):
+    street: str
+    city: str
+
+
+class Person(BaseModel):
+    name: str
+    home: Address
+    work: Optional[Address] = None
+
+
+class Team(BaseModel):
+    lead: Person
+    members: List[Person]
+
+
+def _synthetic_app(routes: int = ROUTES) -> FastAPI:
+    """Build an app whose routes share models, like a large action service."""
+    app = FastAPI(title="Benchmark Service", description="Synthetic routes")
+    for i in range(routes):
+        body = create_model(f"Body{i}", team=(Team, ...), note=(str, ""))
+
+        def endpoint(
+            payload: Annotated[body, AgentForceMetadata(is_user_input=True)],
+            limit: int = 10,
+        ) -> Annotated[Team, AgentForceMetadata(is_displayable=True)]:
+            """Synthetic action."""
+
+        app.post(f"/actions/{i}")(agentforce_action(endpoint))
+    return app
+
+
+def _best_of(run, runs=RUNS) -> float:
+    """Return the fastest wall time of run() in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+@pytest.fixture(scope="module")
+def app():
+    """One synthetic app shared by the benchmarks, building it is slow."""
+    return _synthetic_app()
+
+
+@pytest.mark.slow
+class TestOpenapiGeneration:
+    """Spec generation cost for a 500 route AgentForce app."""
+
+    def test_spec_within_budget(self, app):
+        """Test the full generation, including FastAPI's own schema pass."""
+
+        def run():
+            app.openapi_schema = None
+            custom_openapi(app)
+
+        elapsed = _best_of(run)
+        assert elapsed <= SPEC_BUDGET_MS, (
+            f"generating a {ROUTES} route spec took {elapsed:.0f}ms "
+            f"(budget {SPEC_BUDGET_MS:.0f}ms)"
+        )
+
+    def test_agentforce_pass_within_budget(self, app, monkeypatch):
+        """Test the AgentForce post-processing on its own."""
+        raw = get_openapi(
+            title=app.title,
+            version=app.version,
+            routes=app.routes,
+            openapi_version="3.0.3",
+        )
+        copies = []
+        monkeypatch.setattr(generator, "get_openapi", lambda **kwargs: copies.pop())
+
+        def run():
+            app.openapi_schema = None
+            custom_openapi(app)
+
+        copies.extend(copy.deepcopy(raw) for _ in range(RUNS))
+        elapsed = _best_of(run)
+        assert elapsed <= TRANSFORM_BUDGET_MS, (
+            f"the AgentForce pass over {ROUTES} routes took {elapsed:.0f}ms "
+            f"(budget {TRANSFORM_BUDGET_MS:.0f}ms)"
+        )
@@ -0,0 +1,129 @@
+"""
+OpenAPI spec writing benchmarks.
+
+Budgets are in milliseconds and can be overridden on slow machines with the
+SFAI_SPEC_WRITE_BUDGET_MS environment variable.
+"""
+
+import copy
+import os
+import time
+
+import pytest
+import yaml
+
+from sfai.integrations.mulesoft.agentforce_utils import write_openapi_spec
+
+WRITE_BUDGET_MS = float(os.environ.get("SFAI_SPEC_WRITE_BUDGET_MS", "5000"))
+ROUTES = 1500
+
+PERSON = {
+    "type": "object",
+    "description": "Person of the action",
+    "properties": {
+        "name": {"type": "string", "description": "Name of the person"},
+        "home": {
+            "type": "object",
+            "properties": {
+                "street": {"type": "string", "description": "Street of the home"},
+                "city": {"type": "string", "description": "City of the home"},
+            },
+        },
+    },
+}
+
+
+class _PurePythonDumper(yaml.Dumper):
+    """The dumper specs were written with before, for comparison."""
+
+    def ignore_aliases(self, data):
+        return True
+
+
+def _inlined_spec(routes: int = ROUTES) -> dict:
+    """Build a spec whose schemas are inlined copies, like remove_inline_refs."""
+    team = {
+        "type": "object",
+        "properties": {
+            "lead": PERSON,
+            "members": {"type": "array", "items": PERSON},
+        },
+    }
+    paths = {}
+    for i in range(routes):
+        paths[f"/actions/{i}"] = {
+            "post": {
+                "operationId": f"action_{i}",
+                "requestBody": {
+                    "content": {"application/json": {"schema": copy.deepcopy(team)}}
+                },
+                "responses": {
+                    "200": {
+                        "description": "Successful Response",
+                        "content": {
+                            "application/json": {"schema": copy.deepcopy(team)}
+                        },
+                    }
+                },
+            }
+        }
+    return {"openapi": "3.0.3", "info": {"title": "Benchmark"}, "paths": paths}
+
+
+def _timed(run) -> float:
+    """Return the wall time of run() in milliseconds."""
+    start = time.perf_counter()
+    run()
+    return (time.perf_counter() - start) * 1000
+
+
+@pytest.fixture(scope="module")
+def spec():
+    """One inlined spec of a few megabytes shared by the benchmarks."""
+    return _inlined_spec()
+
+
+@pytest.mark.slow
+class TestSpecOutput:
+    """Writing a multi-megabyte inlined spec as YAML and as JSON."""
+
+    def test_yaml_within_budget(self, spec, tmp_path):
+        """Test the YAML output against the budget and the old dumper."""
+        output_file = tmp_path / "openapi.yaml"
+        elapsed = _timed(lambda: write_openapi_spec(spec, str(output_file)))
+        size_mb = output_file.stat().st_size / 1e6
+
+        assert size_mb > 2
+        assert elapsed <= WRITE_BUDGET_MS, (
+            f"writing a {size_mb:.1f}MB YAML spec took {elapsed:.0f}ms "
+            f"(budget {WRITE_BUDGET_MS:.0f}ms)"
+        )
+        if not yaml.__with_libyaml__:
+            return
+
+        def write_pure_python():
+            with open(tmp_path / "pure.yaml", "w", encoding="utf-8") as f:
+                yaml.dump(
+                    spec,
+                    f,
+                    Dumper=_PurePythonDumper,
+                    default_flow_style=False,
+                    sort_keys=False,
+                )
+
+        pure_python = _timed(write_pure_python)
+        assert (tmp_path / "pure.yaml").read_text() == output_file.read_text()
+        assert elapsed * 2 <= pure_python, (
+            f"libyaml took {elapsed:.0f}ms, the pure Python dumper "
+            f"{pure_python:.0f}ms"
+        )
+
+    def test_json_faster_than_yaml(self, spec, tmp_path):
+        """Test that the JSON output is the cheaper of the two."""
+        yaml_file = tmp_path / "openapi.yaml"
+        json_file = tmp_path / "openapi.json"
+
+        yaml_ms = _timed(lambda: write_openapi_spec(spec, str(yaml_file)))
+        json_ms = _timed(lambda: write_openapi_spec(spec, str(json_file)))
+
+        assert json_ms < yaml_ms, f"JSON took {json_ms:.0f}ms, YAML {yaml_ms:.0f}ms"
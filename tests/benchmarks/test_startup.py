@@ -0,0 +1,114 @@
+"""
+CLI startup benchmarks.
+
+Budgets are in milliseconds and can be overridden on slow machines with the
+SFAI_STARTUP_BUDGET_MS and SFAI_IMPORT_BUDGET_MS environment variables.
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+
+import pytest
+
+HELP_BUDGET_MS = float(os.environ.get("SFAI_STARTUP_BUDGET_MS", "500"))
+IMPORT_BUDGET_MS = float(os.environ.get("SFAI_IMPORT_BUDGET_MS", "150"))
+RUNS = 5
+
+HEAVY_MODULES = ["fastapi", "boto3", "botocore", "kubernetes", "requests", "yaml"]
+
+
+def _best_of(cmd, runs=RUNS) -> float:
+    """Return the fastest wall time in milliseconds over several runs."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, capture_output=True, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+@pytest.mark.slow
+class TestCliStartup:
+    """Startup cost of the `sfai` entry point."""
+
+    def test_help_does_not_import_heavy_dependencies(self):
+        """Test that `sfai --help` imports none of the command dependencies."""
+        code = (
+            "import sys\n"
+            "from sfai.main import app\n"
+            "try:\n"
+            "    app(['--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+            "assert not heavy, heavy\n"
+            "assert not any(m.startswith('sfai.cli.app.') for m in sys.modules)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=False
+        )
+        assert result.returncode == 0, result.stderr
+
+    def test_group_help_does_not_import_subcommands(self):
+        """Test that `sfai app --help` lists the commands without importing them."""
+        code = (
+            "import sys\n"
+            "from sfai.main import app\n"
+            "try:\n"
+            "    app(['app', '--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "assert not any(m.startswith('sfai.cli.app.') for m in sys.modules)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=False
+        )
+        assert result.returncode == 0, result.stderr
+        assert "Publish assets and APIs to MuleSoft" in result.stdout
+
+    def test_subcommand_imports_only_its_module(self):
+        """Test that invoking one subcommand leaves the others unimported."""
+        code = (
+            "import sys\n"
+            "from sfai.main import app\n"
+            "try:\n"
+            "    app(['config', 'list', '--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "assert 'sfai.cli.config.list' in sys.modules\n"
+            "assert 'sfai.cli.app.deploy' not in sys.modules\n"
+            "assert 'sfai.cli.platform.init' not in sys.modules\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=False
+        )
+        assert result.returncode == 0, result.stderr
+
+    def test_import_time_within_budget(self):
+        """Test the cumulative `-X importtime` cost of sfai.main."""
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import sfai.main"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        match = re.search(r"\|\s*(\d+)\s*\|\s*sfai\.main\s*$", result.stderr, re.M)
+        assert match, "sfai.main missing from importtime output"
+        cumulative_ms = int(match.group(1)) / 1000
+        assert cumulative_ms <= IMPORT_BUDGET_MS, (
+            f"importing sfai.main took {cumulative_ms:.0f}ms "
+            f"(budget {IMPORT_BUDGET_MS:.0f}ms)"
+        )
+
+    def test_help_within_budget(self):
+        """Test that `sfai --help` stays within budget over interpreter start."""
+        baseline = _best_of([sys.executable, "-c", "pass"])
+        elapsed = _best_of([sys.executable, "-m", "sfai.main", "--help"])
+        overhead = elapsed - baseline
+        assert overhead <= HELP_BUDGET_MS, (
+            f"`sfai --help` took {overhead:.0f}ms over interpreter startup "
+            f"(budget {HELP_BUDGET_MS:.0f}ms)"
+        )
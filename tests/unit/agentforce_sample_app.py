@@ -0,0 +1,76 @@
+"""FastAPI app exercising every AgentForce OpenAPI extension."""
+
+from typing import Annotated, List, Optional
+
+from fastapi import FastAPI, Query
+from pydantic import BaseModel, Field
+
+from sfai.core.agentforce.generator import AgentForceMetadata, agentforce_action
+
+app = FastAPI(title="Weather Service", description="Forecasts for agents")
+
+
+class Address(BaseModel):
+    street: str
+    city: str = Field(description="City name")
+
+
+class Person(BaseModel):
+    name: str
+    home: Address
+    work: Optional[Address] = None
+
+
+class Team(BaseModel):
+    lead: Person
+    members: List[Person]
+
+
+class Forecast(BaseModel):
+    team: Team
+    temperatures: List[float]
+
+
+@app.post("/forecast")
+@agentforce_action
+def forecast(
+    team: Annotated[
+        Team, AgentForceMetadata(is_user_input=True, description="Team to forecast")
+    ],
+) -> Annotated[Forecast, AgentForceMetadata(is_displayable=False)]:
+    """Forecast the weather for a team."""
+
+
+@app.post("/people", summary="Add")
+@agentforce_action(is_pii=True)
+def add_person(person: Person) -> Team:
+    pass
+
+
+@app.get("/cities/{name}")
+@agentforce_action(publish_as_agent_action=False)
+def city(
+    name: str,
+    units: Annotated[
+        str, Query(), AgentForceMetadata(is_user_input=True, description="Units")
+    ] = "metric",
+) -> Address:
+    """Look up a city."""
+
+
+@app.put("/teams/{team_id}")
+def rename_team(
+    team_id: int,
+    team: Annotated[Team, AgentForceMetadata(is_displayable=True)],
+) -> Team:
+    """Rename a team."""
+
+
+@app.delete("/teams/{team_id}", status_code=204)
+def delete_team(team_id: int) -> None:
+    """Delete a team without returning anything."""
+
+
+@app.get("/hidden", include_in_schema=False)
+def hidden() -> dict:
+    pass
@@ -0,0 +1,130 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+
+class FakeAnypoint:
+    """In-process Anypoint stand-in with scripted routes and failures."""
+
+    def __init__(self):
+        self.calls = []
+        self.tokens_issued = 0
+        # status codes to answer with before succeeding, per path
+        self.failures = {}
+        # JSON bodies or callables(method, query, body) per path without query
+        self.routes = {}
+        # seconds each API request takes
+        self.delay = 0
+        self.valid_tokens = set()
+        self.connections = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def handle(self, handler):
+        path = handler.path
+        with self._lock:
+            self.calls.append((handler.command, path))
+            self.connections.add(handler.client_address)
+        length = int(handler.headers.get("Content-Length") or 0)
+        raw = handler.rfile.read(length)
+
+        pending = self.failures.get(path)
+        if pending:
+            status = pending.pop(0)
+            return self._reply(handler, status, {"message": "busy"}, retry_after=0)
+
+        if path == "/accounts/api/v2/oauth2/token":
+            with self._lock:
+                self.tokens_issued += 1
+                token = f"token-{self.tokens_issued}"
+                self.valid_tokens.add(token)
+            return self._reply(
+                handler, 200, {"access_token": token, "expires_in": 3600}
+            )
+
+        token = handler.headers.get("authorization", "").removeprefix("Bearer ")
+        if token not in self.valid_tokens:
+            return self._reply(handler, 401, {"message": "expired"})
+
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            url = urlsplit(path)
+            route = self.routes.get(url.path, {"path": path})
+            if callable(route):
+                content_type = handler.headers.get("Content-Type", "")
+                body = json.loads(raw) if "json" in content_type and raw else None
+                route = route(handler.command, parse_qs(url.query), body)
+            if route is None:
+                return self._reply(handler, 404, {"message": "not found"})
+            return self._reply(handler, 200, route)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _reply(self, handler, status, body, retry_after=None):
+        data = json.dumps(body).encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        if retry_after is not None:
+            handler.send_header("Retry-After", str(retry_after))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def api_calls(self):
+        return [call for call in self.calls if "oauth2" not in call[1]]
+
+
+@pytest.fixture
+def anypoint(monkeypatch, tmp_path):
+    """Serve a fake Anypoint API and point the MuleSoft client at it."""
+    from sfai.integrations.mulesoft import core  # noqa: PLC0415 - opt-in
+
+    fake = FakeAnypoint()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            fake.handle(self)
+
+        do_POST = do_PATCH = do_GET
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+
+    monkeypatch.setattr(
+        core.MulesoftAPI, "base_url", f"http://127.0.0.1:{server.server_port}"
+    )
+    monkeypatch.setattr(core, "MULESOFT_TOKEN_CACHE_DIR", tmp_path / "tokens")
+    # a fresh session per test, its pool holds connections to this server
+    core._get_session.cache_clear()
+    monkeypatch.setattr(core._AnypointRetry, "get_backoff_time", lambda self: 0)
+    yield fake
+    core._get_session.cache_clear()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def openapi_cache(monkeypatch, tmp_path):
+    """Keep OpenAPI schemas extracted by tests out of the user's cache."""
+    from sfai.integrations.mulesoft import spec_extraction  # noqa: PLC0415 - opt-in
+
+    cache_dir = tmp_path / "openapi-cache"
+    monkeypatch.setattr(spec_extraction, "OPENAPI_CACHE_DIR", cache_dir)
+    return cache_dir
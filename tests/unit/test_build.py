@@ -0,0 +1,361 @@
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sfai.platform import build
+from sfai.platform.build import (
+    REMOTE_PLATFORM,
+    artifact_image,
+    build_artifact,
+    build_fingerprint,
+    build_image,
+    builder_driver,
+    fingerprint_tag,
+    promote_image,
+)
+
+
+class _FakeDocker:
+    """Stand-in for the docker CLI recording the commands it receives."""
+
+    def __init__(self, driver="docker-container", fail=False):
+        self.driver = driver
+        self.fail = fail
+        self.commands = []
+        self.envs = []
+        self.platform = "linux/arm64"
+        # platform of the daemons reached through DOCKER_HOST
+        self.hosts = {}
+        self.images = set()
+        # seconds each build takes
+        self.delay = 0
+
+    def run(self, cmd, **kwargs):
+        self.commands.append(cmd)
+        self.envs.append(kwargs.get("env"))
+        if cmd[:3] == ["docker", "buildx", "inspect"]:
+            if self.driver is None:
+                raise FileNotFoundError("docker")
+            return subprocess.CompletedProcess(
+                cmd, 0, stdout=f"Name: default\nDriver: {self.driver}\n"
+            )
+        if cmd[:2] == ["docker", "version"]:
+            host = (kwargs.get("env") or {}).get("DOCKER_HOST")
+            platform = self.hosts.get(host, self.platform)
+            return subprocess.CompletedProcess(cmd, 0, stdout=f"{platform}\n")
+        if cmd[:3] == ["docker", "image", "inspect"]:
+            return subprocess.CompletedProcess(cmd, int(cmd[3] not in self.images))
+        if self.fail:
+            raise subprocess.CalledProcessError(1, cmd)
+        self.images.update(cmd[i + 1] for i, arg in enumerate(cmd[:-1]) if arg == "-t")
+        time.sleep(self.delay)
+        # emulate the local cache exporter
+        for arg in cmd:
+            if arg.startswith("type=local,dest="):
+                dest = arg.split("dest=", 1)[1].split(",", 1)[0]
+                build.Path(dest).mkdir(parents=True, exist_ok=True)
+                (build.Path(dest) / "index.json").write_text("{}")
+        return subprocess.CompletedProcess(cmd, 0)
+
+    @property
+    def builds(self):
+        return [
+            cmd
+            for cmd in self.commands
+            if "inspect" not in cmd and cmd[:2] != ["docker", "version"]
+        ]
+
+
+@pytest.fixture
+def docker(monkeypatch, tmp_path):
+    """Route docker commands to a fake and the build cache to a temp dir."""
+    fake = _FakeDocker()
+    monkeypatch.setattr(build.subprocess, "run", fake.run)
+    monkeypatch.setattr(build, "BUILD_CACHE_DIR", tmp_path / "buildx")
+    monkeypatch.setattr(build, "_DRIVERS", {})
+    monkeypatch.setattr(build, "_DAEMON_PLATFORMS", {})
+    monkeypatch.setattr(build, "_ARTIFACTS", set())
+    return fake
+
+
+class TestBuildImage:
+    """Test cases for the shared image build."""
+
+    def test_local_cache_round_trip(self, docker, tmp_path):
+        """Test that the second build reads the cache the first one wrote."""
+        build_image(tmp_path, "demo:1.0.0", cache_key="demo")
+        first = docker.builds[-1]
+        cache_dir = tmp_path / "buildx" / "demo"
+
+        assert "--no-cache" not in first
+        assert "--cache-from" not in first
+        cache_to = first[first.index("--cache-to") + 1]
+        assert cache_to.startswith(f"type=local,dest={tmp_path / 'buildx' / '.demo.'}")
+        assert "--load" in first
+        assert (cache_dir / "index.json").exists()
+        assert [p.name for p in (tmp_path / "buildx").iterdir()] == ["demo"]
+
+        build_image(tmp_path, "demo:1.0.1", cache_key="demo")
+        second = docker.builds[-1]
+        assert f"type=local,src={cache_dir}" in second
+        assert docker.envs[-1]["DOCKER_BUILDKIT"] == "1"
+
+    def test_concurrent_builds_share_cache_key(self, docker, tmp_path, monkeypatch):
+        """Test that builds of one cache key rotate the cache one at a time."""
+        replace = build.os.replace
+
+        def _slow_replace(src, dst):
+            replace(src, dst)
+            time.sleep(0.02)
+
+        monkeypatch.setattr(build.os, "replace", _slow_replace)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(
+                pool.map(
+                    lambda tag: build_image(tmp_path, f"demo:{tag}", cache_key="demo"),
+                    range(4),
+                )
+            )
+
+        cache = tmp_path / "buildx"
+        assert [p.name for p in cache.iterdir()] == ["demo"]
+        assert (cache / "demo" / "index.json").exists()
+
+    def test_push(self, docker, tmp_path):
+        """Test that pushes skip attestations and the target platform is set."""
+        build_image(
+            tmp_path,
+            "registry/demo:1",
+            cache_key="demo",
+            platform="linux/amd64",
+            push=True,
+        )
+        cmd = docker.builds[-1]
+
+        assert cmd[cmd.index("--platform") + 1] == "linux/amd64"
+        assert "--push" in cmd
+        assert "--provenance=false" in cmd
+        assert "--load" not in cmd
+
+    def test_no_cache(self, docker, tmp_path):
+        """Test that --no-cache ignores but refreshes the local cache."""
+        build_image(tmp_path, "demo:1", cache_key="demo")
+        build_image(tmp_path, "demo:2", cache_key="demo", no_cache=True)
+        cmd = docker.builds[-1]
+
+        assert "--no-cache" in cmd
+        assert "--cache-from" not in cmd
+        assert "--cache-to" in cmd
+
+    def test_docker_driver_uses_daemon_cache(self, docker, tmp_path):
+        """Test that the default driver relies on the daemon's layer cache."""
+        docker.driver = "docker"
+        build_image(tmp_path, "demo:1", cache_key="demo")
+        cmd = docker.builds[-1]
+
+        assert cmd[:3] == ["docker", "buildx", "build"]
+        assert "--cache-to" not in cmd
+        assert not (tmp_path / "buildx").exists()
+
+    def test_without_buildx(self, docker, tmp_path):
+        """Test the plain docker build and push fallback."""
+        docker.driver = None
+        build_image(tmp_path, "registry/demo:1", cache_key="demo", push=True)
+
+        assert docker.builds == [
+            ["docker", "build", "-t", "registry/demo:1", str(tmp_path)],
+            ["docker", "push", "registry/demo:1"],
+        ]
+
+    def test_failed_build_keeps_cache(self, docker, tmp_path):
+        """Test that a failed build leaves the previous cache in place."""
+        build_image(tmp_path, "demo:1", cache_key="demo")
+        docker.fail = True
+
+        with pytest.raises(subprocess.CalledProcessError):
+            build_image(tmp_path, "demo:2", cache_key="demo")
+        assert (tmp_path / "buildx" / "demo" / "index.json").exists()
+
+    def test_driver_is_inspected_once(self, docker):
+        """Test that the builder driver is looked up once per Docker host."""
+        assert builder_driver() == "docker-container"
+        assert builder_driver() == "docker-container"
+        assert len(docker.commands) == 1
+
+
+class TestBuildArtifact:
+    """Test cases for the image artifact shared by every provider."""
+
+    def test_built_once_for_all_targets(self, docker, tmp_path):
+        """Test that any number of targets promote a single build."""
+
+        def _deploy(_):
+            image = build_artifact(tmp_path, "demo", "0123456789abcdef")
+            promote_image(image, ["registry/demo:1"])
+            return image
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            images = set(pool.map(_deploy, range(3)))
+
+        assert images == {"demo:fp-0123456789ab"}
+        assert len([cmd for cmd in docker.builds if "build" in cmd]) == 1
+        assert docker.builds.count(["docker", "push", "registry/demo:1"]) == 3
+
+    def test_platform_suffix(self, docker):
+        """Test that only foreign platforms get their own artifact tag."""
+        docker.platform = "linux/amd64"
+        assert artifact_image("demo", "0123456789abcdef", REMOTE_PLATFORM) == (
+            "demo:fp-0123456789ab"
+        )
+
+        build._DAEMON_PLATFORMS.clear()
+        docker.platform = "linux/arm64"
+        assert artifact_image("demo", "0123456789abcdef", REMOTE_PLATFORM) == (
+            "demo:fp-0123456789ab-amd64"
+        )
+        assert artifact_image("demo", "0123456789abcdef") == "demo:fp-0123456789ab"
+
+    def test_platform_of_targeted_daemon(self, docker, tmp_path):
+        """Test that artifacts built on another daemon match its platform."""
+        docker.hosts["tcp://amd64-host:2376"] = REMOTE_PLATFORM
+        docker_env = {"DOCKER_HOST": "tcp://amd64-host:2376"}
+
+        image = build_artifact(
+            tmp_path,
+            "demo",
+            "0123456789abcdef",
+            platform=REMOTE_PLATFORM,
+            docker_env=docker_env,
+        )
+
+        assert image == "demo:fp-0123456789ab"
+        assert docker.envs[-1]["DOCKER_HOST"] == "tcp://amd64-host:2376"
+        assert (tmp_path / "buildx" / "demo").exists()
+        # the local arm64 daemon still gets its own suffixed artifact
+        assert artifact_image("demo", "0123456789abcdef", REMOTE_PLATFORM) == (
+            "demo:fp-0123456789ab-amd64"
+        )
+
+    def test_platforms_keep_separate_caches(self, docker, tmp_path):
+        """Test that native and remote builds of one app don't share a cache."""
+        docker.delay = 0.1
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(
+                pool.map(
+                    lambda platform: build_artifact(
+                        tmp_path, "demo", "0123456789abcdef", platform=platform
+                    ),
+                    [None, REMOTE_PLATFORM],
+                )
+            )
+
+        builds = [cmd for cmd in docker.builds if "--cache-to" in cmd]
+        destinations = {cmd[cmd.index("--cache-to") + 1] for cmd in builds}
+        assert len(builds) == 2
+        assert len(destinations) == 2
+        cache = tmp_path / "buildx"
+        assert sorted(p.name for p in cache.iterdir()) == [
+            "demo",
+            "demo-linux-amd64",
+        ]
+        assert (cache / "demo" / "index.json").exists()
+        assert (cache / "demo-linux-amd64" / "index.json").exists()
+
+    def test_existing_artifact_is_reused(self, docker, tmp_path):
+        """Test that an artifact already in the daemon is not rebuilt."""
+        docker.images.add("demo:fp-0123456789ab")
+        build_artifact(tmp_path, "demo", "0123456789abcdef")
+
+        assert docker.builds == []
+
+    def test_no_cache_rebuilds_once(self, docker, tmp_path):
+        """Test that --no-cache rebuilds the artifact once per process."""
+        docker.images.add("demo:fp-0123456789ab")
+        for _ in range(2):
+            build_artifact(tmp_path, "demo", "0123456789abcdef", no_cache=True)
+
+        assert len(docker.builds) == 1
+        assert "--no-cache" in docker.builds[0]
+
+    def test_promote_without_push(self, docker):
+        """Test that promoting to a daemon only tags the image there."""
+        promote_image(
+            "demo:fp-1", ["demo:1.0.0"], push=False, docker_env={"DOCKER_HOST": "x"}
+        )
+
+        assert docker.builds == [["docker", "tag", "demo:fp-1", "demo:1.0.0"]]
+        assert docker.envs[-1]["DOCKER_HOST"] == "x"
+
+
+@pytest.fixture
+def app_dir(tmp_path):
+    """Create a minimal app build context."""
+    app = tmp_path / "app"
+    app.mkdir()
+    (app / "Dockerfile").write_text("FROM python:3.9-slim\n")
+    (app / "requirements.txt").write_text("fastapi\n")
+    (app / "app.py").write_text("app = None\n")
+    return app
+
+
+class TestBuildFingerprint:
+    """Test cases for the build context fingerprint."""
+
+    def test_stable_and_content_addressed(self, app_dir):
+        """Test that the fingerprint only depends on the sources."""
+        fingerprint = build_fingerprint(app_dir)
+        assert build_fingerprint(app_dir) == fingerprint
+        assert fingerprint_tag(fingerprint) == f"fp-{fingerprint[:12]}"
+
+        (app_dir / "app.py").write_text("app = 1\n")
+        assert build_fingerprint(app_dir) != fingerprint
+
+    def test_local_state_is_ignored(self, app_dir):
+        """Test that .sfai, .git and __pycache__ never change it."""
+        fingerprint = build_fingerprint(app_dir)
+        for name in (".sfai", ".git", "pkg/__pycache__"):
+            (app_dir / name).mkdir(parents=True)
+            (app_dir / name / "state").write_text("changed")
+
+        assert build_fingerprint(app_dir) == fingerprint
+
+    def test_dockerignore(self, app_dir):
+        """Test that ignored files are left out unless re-included."""
+        (app_dir / ".dockerignore").write_text(
+            "# local files\n*.log\ndocs\n!docs/keep.md\n"
+        )
+        fingerprint = build_fingerprint(app_dir)
+
+        (app_dir / "debug.log").write_text("noise")
+        (app_dir / "docs").mkdir()
+        (app_dir / "docs" / "notes.md").write_text("notes")
+        assert build_fingerprint(app_dir) == fingerprint
+
+        (app_dir / "docs" / "keep.md").write_text("kept")
+        assert build_fingerprint(app_dir) != fingerprint
+
+    def test_dockerfile_always_counts(self, app_dir):
+        """Test that the Dockerfile is hashed even when ignored."""
+        (app_dir / ".dockerignore").write_text("Dockerfile\n")
+        fingerprint = build_fingerprint(app_dir)
+
+        (app_dir / "Dockerfile").write_text("FROM python:3.12-slim\n")
+        assert build_fingerprint(app_dir) != fingerprint
+
+    @pytest.mark.parametrize(
+        "pattern, path, ignored",
+        [
+            ("*.pyc", "a.pyc", True),
+            ("*.pyc", "pkg/a.pyc", False),
+            ("**/*.pyc", "pkg/sub/a.pyc", True),
+            ("/venv", "venv/lib/site.py", True),
+            ("data/?.csv", "data/a.csv", True),
+            ("data/[ab].csv", "data/c.csv", False),
+        ],
+    )
+    def test_patterns(self, tmp_path, pattern, path, ignored):
+        """Test .dockerignore glob matching."""
+        (tmp_path / ".dockerignore").write_text(pattern)
+        assert build._ignored(path, build._ignore_patterns(tmp_path)) is ignored
@@ -0,0 +1,580 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from sfai.app.delete import delete
+from sfai.app.deploy import deploy
+from sfai.app.logs import logs
+from sfai.app.status import status
+from sfai.app.utils.helpers import determine_platform_and_environment
+from sfai.context import manager as manager_module
+from sfai.context import storage as storage_module
+from sfai.context.manager import ContextManager, clear_context_cache
+from sfai.context.registry import AppRegistry
+from sfai.context.storage import atomic_write_text, file_lock
+from sfai.core.base import BasePlatform
+from sfai.core.response_models import BaseResponse
+from sfai.platform.registry import PLATFORM_REGISTRY
+from sfai.platform.switch import switch
+
+
+@pytest.fixture
+def ctx_mgr(tmp_path):
+    """ContextManager whose context files live in a temporary directory."""
+    clear_context_cache()
+    mgr = ContextManager()
+    mgr.context_file = tmp_path / ".sfai" / "context.json"
+    mgr.global_context_file = tmp_path / "home" / "apps.json"
+    mgr.apps_db_file = tmp_path / "home" / "apps.db"
+    yield mgr
+    clear_context_cache()
+
+
+@pytest.fixture
+def count_reads(ctx_mgr, monkeypatch):
+    """Count how many times the JSON files are actually read from disk."""
+    reads = []
+    original = ContextManager._load_json
+
+    def _counting_load_json(self, file):
+        reads.append(file)
+        return original(self, file)
+
+    monkeypatch.setattr(ContextManager, "_load_json", _counting_load_json)
+    return reads
+
+
+class TestContextCache:
+    """Test cases for the in-process context model cache."""
+
+    def test_repeated_reads_parse_once(self, ctx_mgr, count_reads):
+        """Test that unchanged context files are parsed only once."""
+        ctx_mgr.update_platform("local", {"port": 8080}, app_name="demo")
+        count_reads.clear()
+
+        for _ in range(5):
+            context = ctx_mgr.read_context()
+            assert context["app_name"] == "demo"
+            assert context["port"] == 8080
+        ctx_mgr.check_platform_environment("local", "default")
+
+        assert count_reads == [ctx_mgr.context_file]
+
+    def test_own_writes_invalidate_cache(self, ctx_mgr):
+        """Test that saving through the manager is visible to the next read."""
+        ctx_mgr.update_platform("local", {"port": 8080}, app_name="demo")
+        assert ctx_mgr.read_context()["port"] == 8080
+
+        ctx_mgr.update_platform("local", {"port": 9090})
+        assert ctx_mgr.read_context()["port"] == 9090
+
+    def test_external_writes_invalidate_cache(self, ctx_mgr):
+        """Test that files changed by another process are re-read."""
+        ctx_mgr.update_platform("local", {"port": 8080}, app_name="demo")
+        assert ctx_mgr.read_context()["port"] == 8080
+
+        data = json.loads(ctx_mgr.context_file.read_text())
+        data["platform"]["local"]["default"]["port"] = 12345
+        ctx_mgr.context_file.write_text(json.dumps(data))
+        # make sure the change is observable even on coarse mtime filesystems
+        stat = ctx_mgr.context_file.stat()
+        os.utime(
+            ctx_mgr.context_file,
+            ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000),
+        )
+
+        assert ctx_mgr.read_context()["port"] == 12345
+
+    def test_deleted_file_is_not_served_from_cache(self, ctx_mgr):
+        """Test that a removed context file reads as no context."""
+        ctx_mgr.update_platform("local", {"port": 8080}, app_name="demo")
+        assert ctx_mgr.read_context() is not None
+
+        ctx_mgr.context_file.unlink()
+        assert ctx_mgr.read_context() is None
+
+    def test_returned_context_is_a_copy(self, ctx_mgr):
+        """Test that mutating a read result does not leak into the cache."""
+        ctx_mgr.update_platform(
+            "local", {"settings": {"debug": False}}, app_name="demo"
+        )
+
+        context = ctx_mgr.read_context()
+        context["settings"]["debug"] = True
+        context["port"] = 1
+
+        fresh = ctx_mgr.read_context()
+        assert fresh["settings"] == {"debug": False}
+        assert "port" not in fresh
+
+    def test_cache_is_shared_between_instances(self, ctx_mgr, count_reads):
+        """Test that separate managers reuse the same parsed context."""
+        ctx_mgr.update_platform("local", {"port": 8080}, app_name="demo")
+        count_reads.clear()
+
+        other = ContextManager()
+        other.context_file = ctx_mgr.context_file
+        ctx_mgr.read_context()
+        other.read_context()
+
+        assert len(count_reads) == 1
+
+    def test_service_profiles_are_cached(self, ctx_mgr, count_reads):
+        """Test that service profile lookups reuse the parsed global context."""
+        ctx_mgr.add_service_profile("mulesoft", "default", {"org_id": "org"})
+        count_reads.clear()
+
+        assert ctx_mgr.list_service_profiles("mulesoft") == ["default"]
+        profile = ctx_mgr.get_service_profile("mulesoft", "default")
+        assert profile == {"org_id": "org"}
+        profile["org_id"] = "changed"
+
+        assert ctx_mgr.get_service_profile("mulesoft", "default") == {"org_id": "org"}
+        assert count_reads == [ctx_mgr.global_context_file]
+
+    def test_missing_global_context(self, ctx_mgr):
+        """Test that lookups work before the global context file exists."""
+        assert ctx_mgr.list_service_profiles("mulesoft") == []
+        assert ctx_mgr.get_service_profile("mulesoft", "default") is None
+        assert not manager_module._MODEL_CACHE
+
+
+def _no_procfs(*args, **kwargs):
+    raise FileNotFoundError("/proc/self/status")
+
+
+class TestContextStorage:
+    """Test cases for atomic and lock-protected context writes."""
+
+    def test_atomic_write_replaces_content(self, tmp_path):
+        """Test that atomic writes replace the file and leave no temp files."""
+        target = tmp_path / "apps.json"
+        atomic_write_text(target, "old")
+        atomic_write_text(target, "new", mode=0o600)
+
+        assert target.read_text() == "new"
+        assert (target.stat().st_mode & 0o777) == 0o600
+        assert [p.name for p in tmp_path.iterdir()] == ["apps.json"]
+
+    def test_default_mode_follows_umask(self, tmp_path, monkeypatch):
+        """Test that new files get the umask's mode, also without procfs."""
+        previous = os.umask(0o027)
+        try:
+            for proc_available in (True, False):
+                storage_module._umask.cache_clear()
+                if not proc_available:
+                    monkeypatch.setattr(storage_module, "open", _no_procfs, False)
+                target = tmp_path / f"context-{proc_available}.json"
+                atomic_write_text(target, "{}")
+
+                assert (target.stat().st_mode & 0o777) == 0o640
+                assert os.umask(0o027) == 0o027
+        finally:
+            os.umask(previous)
+            storage_module._umask.cache_clear()
+
+    def test_failed_write_keeps_previous_content(self, tmp_path, monkeypatch):
+        """Test that a failure before the rename keeps the old file intact."""
+        target = tmp_path / "apps.json"
+        atomic_write_text(target, '{"applications": []}')
+
+        def _crash(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(storage_module.os, "replace", _crash)
+        with pytest.raises(OSError):
+            atomic_write_text(target, '{"applications": [')
+
+        assert json.loads(target.read_text()) == {"applications": []}
+        assert [p.name for p in tmp_path.iterdir()] == ["apps.json"]
+
+    def test_file_lock_is_reentrant(self, tmp_path):
+        """Test that nested locks on the same file do not deadlock."""
+        target = tmp_path / "context.json"
+        with file_lock(target):
+            with file_lock(target):
+                atomic_write_text(target, "{}")
+        assert (tmp_path / "context.json.lock").exists()
+
+    def test_threads_do_not_lose_updates(self, ctx_mgr):
+        """Test that concurrent profile updates from threads are all kept."""
+        threads = [
+            threading.Thread(
+                target=ctx_mgr.add_service_profile,
+                args=("mulesoft", f"profile-{i}", {"index": i}),
+            )
+            for i in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(ctx_mgr.list_service_profiles("mulesoft")) == 20
+
+    @pytest.mark.slow
+    def test_processes_do_not_lose_registrations(self, tmp_path):
+        """Test that many processes registering apps never corrupt apps.json."""
+        processes, apps_per_process = 8, 15
+        apps_file = tmp_path / "apps.json"
+        code = (
+            "import sys\n"
+            "from pathlib import Path\n"
+            "from sfai.context.manager import ContextManager\n"
+            "mgr = ContextManager()\n"
+            "mgr.global_context_file = Path(sys.argv[1])\n"
+            "mgr.apps_db_file = Path(sys.argv[1]).with_suffix('.db')\n"
+            "worker = sys.argv[2]\n"
+            f"for i in range({apps_per_process}):\n"
+            "    name = f'app-{worker}-{i}'\n"
+            "    mgr.register_app(name, str(Path(sys.argv[3]) / name))\n"
+            "    mgr.add_service_profile('mulesoft', name, {'worker': worker})\n"
+        )
+        workers = [
+            subprocess.Popen(
+                [sys.executable, "-c", code, str(apps_file), str(n), str(tmp_path)],
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            for n in range(processes)
+        ]
+        for worker in workers:
+            _, stderr = worker.communicate(timeout=120)
+            assert worker.returncode == 0, stderr
+
+        data = json.loads(apps_file.read_text())
+        total = processes * apps_per_process
+        assert len(data["service_profiles"]["mulesoft"]) == total
+        registry = AppRegistry(apps_file.with_suffix(".db"))
+        assert len(registry.list()) == total
+
+
+class TestContextTransaction:
+    """Test cases for batched context updates."""
+
+    def test_single_write_per_file(self, ctx_mgr, monkeypatch):
+        """Test that several updates in a transaction are written once."""
+        writes = []
+        original = ContextManager._save_json
+
+        def _counting_save_json(self, file, data):
+            writes.append(file)
+            return original(self, file, data)
+
+        monkeypatch.setattr(ContextManager, "_save_json", _counting_save_json)
+
+        with ctx_mgr.transaction():
+            ctx_mgr.update_platform("local", {"port": 8080}, app_name="demo")
+            ctx_mgr.update_platform("local", {"host": "localhost"})
+            ctx_mgr.add_service_profile("mulesoft", "default", {"org_id": "org"})
+            assert writes == []
+
+        assert sorted(writes) == sorted(
+            [ctx_mgr.context_file, ctx_mgr.global_context_file]
+        )
+        context = ctx_mgr.read_context()
+        assert context["port"] == 8080
+        assert context["host"] == "localhost"
+
+    def test_reads_see_staged_changes(self, ctx_mgr):
+        """Test that reads inside a transaction include pending updates."""
+        with ctx_mgr.transaction():
+            ctx_mgr.update_platform("local", {"port": 8080}, app_name="demo")
+            assert ctx_mgr.read_context()["port"] == 8080
+            assert not ctx_mgr.context_file.exists()
+
+            other = ContextManager()
+            other.context_file = ctx_mgr.context_file
+            assert other.read_context()["app_name"] == "demo"
+
+        assert ctx_mgr.context_file.exists()
+
+    def test_exception_discards_changes(self, ctx_mgr):
+        """Test that an error inside the transaction writes nothing."""
+        ctx_mgr.update_platform("local", {"port": 8080}, app_name="demo")
+
+        with pytest.raises(RuntimeError):
+            with ctx_mgr.transaction():
+                ctx_mgr.update_platform("local", {"port": 9090})
+                raise RuntimeError("boom")
+
+        assert ctx_mgr.read_context()["port"] == 8080
+
+    def test_nested_transactions_join(self, ctx_mgr):
+        """Test that an inner transaction commits with the outer one."""
+        with ctx_mgr.transaction():
+            with ctx_mgr.transaction():
+                ctx_mgr.update_platform("local", {"port": 8080}, app_name="demo")
+            assert not ctx_mgr.context_file.exists()
+
+        assert ctx_mgr.read_context()["port"] == 8080
+
+    def test_concurrent_changes_are_merged(self, ctx_mgr):
+        """Test that changes made by others during a transaction are kept."""
+        ctx_mgr.add_service_profile("mulesoft", "default", {"org_id": "org"})
+
+        with ctx_mgr.transaction():
+            ctx_mgr.add_service_profile("mulesoft", "staging", {"org_id": "stg"})
+
+            # simulate another process writing in the meantime
+            worker = threading.Thread(
+                target=ctx_mgr.add_service_profile,
+                args=("heroku", "default", {"team": "core"}),
+            )
+            worker.start()
+            worker.join()
+
+        assert ctx_mgr.list_service_profiles("mulesoft") == ["default", "staging"]
+        assert ctx_mgr.list_service_profiles("heroku") == ["default"]
+
+    def test_invalid_data_is_not_written(self, ctx_mgr):
+        """Test that validation failures on commit leave files untouched."""
+        ctx_mgr.update_platform("local", {"port": 8080}, app_name="demo")
+
+        with pytest.raises(ValueError):
+            with ctx_mgr.transaction():
+                ctx_mgr.update_platform("local", {"port": 9090})
+                ctx_mgr._mutate(
+                    ctx_mgr.context_file,
+                    manager_module.ApplicationContext,
+                    lambda data: data.update(platform="invalid"),
+                )
+
+        assert ctx_mgr.read_context()["port"] == 8080
+
+
+class TestAppRegistry:
+    """Test cases for the indexed global app registry."""
+
+    def test_register_and_lookup(self, ctx_mgr, tmp_path):
+        """Test registering apps and looking them up by path and name."""
+        ctx_mgr.register_app("demo", str(tmp_path / "demo"))
+        ctx_mgr.register_app("other", str(tmp_path / "other"), owner="team")
+
+        app = ctx_mgr.get_app(str(tmp_path / "demo"))
+        assert app.app_name == "demo"
+        assert app.path == str((tmp_path / "demo").resolve())
+        assert [a.app_name for a in ctx_mgr.list_apps()] == ["demo", "other"]
+        assert ctx_mgr.list_apps("other")[0].owner == "team"
+        assert ctx_mgr.get_app(str(tmp_path / "missing")) is None
+
+    def test_duplicate_path_is_ignored(self, ctx_mgr, tmp_path):
+        """Test that a path is registered only once."""
+        ctx_mgr.register_app("demo", str(tmp_path / "demo"))
+        ctx_mgr.register_app("renamed", str(tmp_path / "demo"))
+
+        assert [a.app_name for a in ctx_mgr.list_apps()] == ["demo"]
+
+    def test_unregister(self, ctx_mgr, tmp_path):
+        """Test removing apps by name."""
+        ctx_mgr.register_app("demo", str(tmp_path / "demo"))
+
+        assert ctx_mgr.unregister_app("demo").success is True
+        assert ctx_mgr.list_apps() == []
+        result = ctx_mgr.unregister_app("demo")
+        assert result.success is False
+        assert "not found" in result.error
+
+    def test_lookups_use_indexes(self, ctx_mgr, tmp_path):
+        """Test that lookups by path and name do not scan the table."""
+        ctx_mgr.register_app("demo", str(tmp_path / "demo"))
+
+        conn = sqlite3.connect(ctx_mgr.apps_db_file)
+        try:
+            for column in ("path", "app_name"):
+                plan = conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT * FROM applications "
+                    f"WHERE {column} = ?",
+                    ("x",),
+                ).fetchall()
+                assert "USING INDEX" in str(plan)
+        finally:
+            conn.close()
+
+    def test_migrates_legacy_registry(self, ctx_mgr, tmp_path):
+        """Test that apps from apps.json are imported and left in place there."""
+        _write_legacy_apps(
+            ctx_mgr,
+            [
+                {"app_name": "legacy", "path": "/apps/legacy"},
+                {"app_name": "old", "path": "/apps/old", "team": "x"},
+            ],
+        )
+
+        apps = ctx_mgr.list_apps()
+        assert [a.app_name for a in apps] == ["legacy", "old"]
+        assert apps[1].team == "x"
+
+        # older sfai versions still find their apps
+        data = json.loads(ctx_mgr.global_context_file.read_text())
+        assert len(data["applications"]) == 2
+        assert ctx_mgr.list_service_profiles("mulesoft") == ["default"]
+
+        # a fresh manager does not import twice
+        assert len(_fresh_manager(ctx_mgr).list_apps()) == 2
+
+    def test_reimports_apps_written_by_older_versions(self, ctx_mgr):
+        """Test that apps.json changes made after the migration are imported."""
+        _write_legacy_apps(ctx_mgr, [{"app_name": "legacy", "path": "/apps/legacy"}])
+        assert [a.app_name for a in ctx_mgr.list_apps()] == ["legacy"]
+
+        _write_legacy_apps(
+            ctx_mgr,
+            [
+                {
+                    "app_name": "renamed",
+                    "path": "/apps/legacy",
+                    "updated_at": "2999-01-01T00:00:00",
+                },
+                {"app_name": "new", "path": "/apps/new"},
+            ],
+        )
+
+        apps = _fresh_manager(ctx_mgr).list_apps()
+        assert [a.app_name for a in apps] == ["renamed", "new"]
+
+    def test_removed_apps_are_not_reimported(self, ctx_mgr):
+        """Test that unregistered apps stay removed although apps.json has them."""
+        _write_legacy_apps(
+            ctx_mgr,
+            [
+                {
+                    "app_name": "legacy",
+                    "path": "/apps/legacy",
+                    "updated_at": "2024-01-01T00:00:00",
+                }
+            ],
+        )
+        assert ctx_mgr.unregister_app("legacy").success is True
+
+        # an older version saves apps.json again, still listing the app
+        ctx_mgr.add_service_profile("mulesoft", "other", {})
+
+        assert _fresh_manager(ctx_mgr).list_apps() == []
+
+
+def _write_legacy_apps(ctx_mgr, apps):
+    ctx_mgr.global_context_file.parent.mkdir(parents=True, exist_ok=True)
+    ctx_mgr.global_context_file.write_text(
+        json.dumps(
+            {"applications": apps, "service_profiles": {"mulesoft": {"default": {}}}}
+        )
+    )
+
+
+def _fresh_manager(ctx_mgr):
+    other = ContextManager()
+    other.global_context_file = ctx_mgr.global_context_file
+    other.apps_db_file = ctx_mgr.apps_db_file
+    return other
+
+
+class _FakePlatform(BasePlatform):
+    """Provider recording the context each command receives."""
+
+    def __init__(self):
+        self.contexts = []
+
+    def _record(self, context, **kwargs):
+        self.contexts.append(context)
+        return BaseResponse(success=True)
+
+    init = deploy = delete = logs = status = open = _record
+
+
+@pytest.fixture
+def fake_app(tmp_path):
+    """App context with two fake platform environments in a temp directory."""
+    try:
+        previous_cwd = os.getcwd()
+    except FileNotFoundError:
+        previous_cwd = str(tmp_path.parent)
+    os.chdir(tmp_path)
+    clear_context_cache()
+    provider = _FakePlatform()
+    PLATFORM_REGISTRY.register("fake", provider)
+
+    mgr = ContextManager()
+    mgr.update_platform("fake", {"region": "us"}, "staging", app_name="demo")
+    mgr.update_platform("fake", {"region": "eu"}, "default")
+    yield provider
+    PLATFORM_REGISTRY._instances.pop("fake", None)
+    clear_context_cache()
+    os.chdir(previous_cwd)
+
+
+@pytest.fixture
+def count_io(monkeypatch):
+    """Count context file reads and writes."""
+    io = {"reads": 0, "writes": 0}
+    load_json, save_json = ContextManager._load_json, ContextManager._save_json
+
+    def _load(self, file):
+        io["reads"] += 1
+        return load_json(self, file)
+
+    def _save(self, file, data):
+        io["writes"] += 1
+        return save_json(self, file, data)
+
+    monkeypatch.setattr(ContextManager, "_load_json", _load)
+    monkeypatch.setattr(ContextManager, "_save_json", _save)
+    clear_context_cache()
+    return io
+
+
+class TestPlatformResolution:
+    """Test cases for resolving the platform environment of app commands."""
+
+    @pytest.mark.parametrize("command", [status, logs, delete, deploy])
+    def test_active_environment_reads_once(self, fake_app, count_io, command):
+        """Test that commands on the active environment read once, write never."""
+        result = command()
+
+        assert result.success is True
+        assert result.environment == "default"
+        assert fake_app.contexts[-1]["region"] == "eu"
+        assert count_io == {"reads": 1, "writes": 0}
+
+    def test_switch_writes_once(self, fake_app, count_io):
+        """Test that switching environments costs one read-modify-write."""
+        result = status(platform="fake", environment="staging")
+
+        assert result.success is True
+        assert fake_app.contexts[-1]["region"] == "us"
+        assert fake_app.contexts[-1]["active_environment"] == "staging"
+        assert count_io["writes"] == 1
+        assert count_io["reads"] <= 2
+
+        data = json.loads(Path(".sfai/context.json").read_text())
+        assert data["active_environment"] == "staging"
+
+    def test_switch_does_not_copy_context_keys(self, fake_app):
+        """Test that switching leaves the environment data untouched."""
+        assert switch("fake", "staging").success is True
+
+        data = json.loads(Path(".sfai/context.json").read_text())
+        assert data["platform"]["fake"]["staging"] == {"region": "us"}
+
+    def test_platform_keeps_active_environment_name(self, fake_app):
+        """Test that naming only the platform keeps the environment name."""
+        switch("fake", "staging")
+        result = determine_platform_and_environment(platform="fake")
+
+        assert result.environment == "staging"
+        assert result.context["region"] == "us"
+
+    def test_unknown_environment(self, fake_app, count_io):
+        """Test that unknown environments fail without writing."""
+        result = status(environment="production")
+
+        assert result.success is False
+        assert "Environment 'production' not found" in result.error
+        assert "sfai platform init --platform fake" in result.error
+        assert count_io["writes"] == 0
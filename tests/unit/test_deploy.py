@@ -0,0 +1,215 @@
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from sfai.app import deploy as deploy_module
+from sfai.app.deploy import deploy_targets, parse_targets
+from sfai.context.manager import ContextManager, clear_context_cache
+from sfai.core.base import BasePlatform
+from sfai.core.response_models import BaseResponse
+from sfai.main import app
+from sfai.platform.registry import PLATFORM_REGISTRY
+from sfai.platform.streaming import run_command
+
+
+class _SlowPlatform(BasePlatform):
+    """Provider whose deploys take a while and record their environment."""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.deploys = []
+        # active platform of the app seen by each deploy
+        self.active = []
+        self._lock = threading.Lock()
+
+    def deploy(self, context, path, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            environment = context["active_environment"]
+            if environment == "broken":
+                raise RuntimeError("release failed")
+            print(f"releasing {environment}")
+            run_command([sys.executable, "-c", "print('released')"], check=True)
+            ContextManager().update_platform(
+                "slow",
+                {"released": kwargs["fingerprint"]},
+                environment,
+                activate=kwargs.get("activate", True),
+            )
+            data = json.loads(Path(".sfai/context.json").read_text())
+            self.active.append(data["active_platform"])
+            self.deploys.append((environment, context["region"], kwargs))
+            return BaseResponse(success=True, public_url=f"https://{environment}")
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    init = delete = logs = status = open = None
+
+
+@pytest.fixture
+def slow_app(tmp_path):
+    """App context with three environments on a slow platform in a temp dir."""
+    try:
+        previous_cwd = os.getcwd()
+    except FileNotFoundError:
+        previous_cwd = str(tmp_path.parent)
+    os.chdir(tmp_path)
+    clear_context_cache()
+    provider = _SlowPlatform()
+    PLATFORM_REGISTRY.register("slow", provider)
+
+    mgr = ContextManager()
+    # the active environment, which deploying the targets must not change
+    mgr.update_platform("other", {}, "default", app_name="demo")
+    for environment, region in [("staging", "us"), ("perf", "eu"), ("prod", "ap")]:
+        mgr.update_platform("slow", {"region": region}, environment)
+    mgr.set_active_environment("other", "default")
+    yield provider
+    PLATFORM_REGISTRY._instances.pop("slow", None)
+    clear_context_cache()
+    os.chdir(previous_cwd)
+
+
+class TestDeployTargets:
+    """Test cases for deploying to several platform environments at once."""
+
+    def test_parse_targets(self):
+        """Test that targets are split, defaulted and deduplicated."""
+        pairs = parse_targets(["heroku:staging,eks:prod", "local", "eks:prod"])
+
+        assert pairs == [("heroku", "staging"), ("eks", "prod"), ("local", "default")]
+
+    @pytest.mark.parametrize("target", [":prod", "eks:"])
+    def test_parse_invalid_target(self, target):
+        """Test that targets missing a name are rejected."""
+        with pytest.raises(ValueError, match="Invalid target"):
+            parse_targets([target])
+
+    def test_targets_deploy_concurrently(self, slow_app):
+        """Test that targets deploy at the same time with their own context."""
+        targets = [("slow", "staging"), ("slow", "perf"), ("slow", "prod")]
+        result = deploy_targets(targets, concurrency=3)
+
+        assert result.success is True
+        assert result.message == "Deployed to 3 of 3 targets"
+        assert slow_app.max_in_flight == 3
+        regions = {environment: region for environment, region, _ in slow_app.deploys}
+        assert regions == {"staging": "us", "perf": "eu", "prod": "ap"}
+        assert [r["target"] for r in result.results] == [
+            "slow:staging",
+            "slow:perf",
+            "slow:prod",
+        ]
+        assert result.results[2]["public_url"] == "https://prod"
+
+    def test_concurrency_limit(self, slow_app):
+        """Test that no more targets than the concurrency deploy at once."""
+        targets = [("slow", "staging"), ("slow", "perf"), ("slow", "prod")]
+        assert deploy_targets(targets, concurrency=1).success is True
+
+        assert slow_app.max_in_flight == 1
+
+    def test_fingerprint_computed_once(self, slow_app, monkeypatch):
+        """Test that every target gets the fingerprint computed once."""
+        calls = []
+
+        def _fingerprint(path):
+            calls.append(path)
+            return "abc123"
+
+        monkeypatch.setattr(deploy_module, "build_fingerprint", _fingerprint)
+        result = deploy_targets([("slow", "staging"), ("slow", "prod")])
+
+        assert result.success is True
+        assert len(calls) == 1
+        assert {kwargs["fingerprint"] for _, _, kwargs in slow_app.deploys} == {
+            "abc123"
+        }
+        data = json.loads(Path(".sfai/context.json").read_text())
+        assert data["platform"]["slow"]["staging"]["released"] == "abc123"
+        assert data["platform"]["slow"]["prod"]["released"] == "abc123"
+
+    def test_active_environment_unchanged(self, slow_app):
+        """Test that no target becomes the active environment, even briefly."""
+        deploy_targets([("slow", "staging"), ("slow", "prod")])
+
+        data = json.loads(Path(".sfai/context.json").read_text())
+        assert data["active_platform"] == "other"
+        assert data["active_environment"] == "default"
+        assert slow_app.active == ["other", "other"]
+
+    def test_output_is_prefixed_per_target(self, slow_app, capsys):
+        """Test that each line printed by a target, or its commands, is prefixed."""
+        stdout = sys.stdout
+        deploy_targets([("slow", "staging"), ("slow", "prod")], concurrency=2)
+
+        assert sys.stdout is stdout
+        assert sorted(capsys.readouterr().out.splitlines()) == [
+            "[slow:prod] released",
+            "[slow:prod] releasing prod",
+            "[slow:staging] released",
+            "[slow:staging] releasing staging",
+        ]
+
+    def test_failures_are_reported_per_target(self, slow_app):
+        """Test that failed and unknown targets don't stop the others."""
+        ContextManager().update_platform("slow", {"region": "x"}, "broken")
+        done = []
+        result = deploy_targets(
+            [("slow", "staging"), ("slow", "broken"), ("slow", "missing")],
+            on_done=done.append,
+        )
+
+        assert result.success is False
+        assert result.message == "Deployed to 1 of 3 targets"
+        by_target = {r["target"]: r for r in result.results}
+        assert by_target["slow:staging"]["success"] is True
+        assert by_target["slow:broken"]["error"] == "release failed"
+        assert "Environment 'missing' not found" in by_target["slow:missing"]["error"]
+        assert sorted(r["target"] for r in done) == sorted(by_target)
+
+
+class TestDeployTargetsCli:
+    """Test cases for `sfai app deploy --targets`."""
+
+    def test_reports_every_target(self, slow_app):
+        """Test that the CLI prints each target and a summary."""
+        result = CliRunner().invoke(
+            app, ["app", "deploy", "--targets", "slow:staging,slow:prod"]
+        )
+
+        assert result.exit_code == 0
+        assert "slow:staging deployed" in result.stdout
+        assert "slow:prod deployed" in result.stdout
+        assert "Deployed to 2 of 2 targets" in result.stdout
+
+    def test_failed_target_exits_nonzero(self, slow_app):
+        """Test that a failed target makes the command fail."""
+        result = CliRunner().invoke(
+            app,
+            ["app", "deploy", "--targets", "slow:staging", "--targets", "slow:qa"],
+        )
+
+        assert result.exit_code == 1
+        assert "slow:qa failed" in result.stdout
+        assert "Deployed to 1 of 2 targets" in result.stdout
+
+    def test_invalid_target(self, slow_app):
+        """Test that malformed targets are rejected before deploying."""
+        result = CliRunner().invoke(app, ["app", "deploy", "--targets", "slow:"])
+
+        assert result.exit_code == 1
+        assert "Invalid target" in result.stdout
+        assert slow_app.deploys == []
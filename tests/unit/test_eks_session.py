@@ -0,0 +1,222 @@
+from datetime import datetime, timedelta, timezone
+from typing import ClassVar, List
+
+import pytest
+from botocore.exceptions import ClientError
+
+from sfai.core.response_models import BaseResponse
+from sfai.platform.providers.eks import platform as eks_module
+from sfai.platform.providers.eks.platform import EKSPlatform
+from sfai.platform.providers.eks.utils import session as session_module
+from sfai.platform.providers.eks.utils.session import (
+    call_with_fresh_credentials,
+    get_client,
+    get_session,
+    verify_credentials,
+)
+
+
+def _client_error(code):
+    return ClientError({"Error": {"Code": code, "Message": code}}, "Operation")
+
+
+class _FakeClient:
+    def __init__(self, session, service):
+        self.session = session
+        self.service = service
+
+    def get_caller_identity(self):
+        self.session.calls.append("sts")
+        if self.session.sts_error:
+            raise _client_error(self.session.sts_error)
+        return {"Account": "123"}
+
+
+class _FakeSession:
+    """Stand-in for boto3.Session recording every instance."""
+
+    instances: ClassVar[List["_FakeSession"]] = []
+    sts_error = None
+    expiry = None
+
+    def __init__(self, profile_name=None, region_name=None):
+        self.profile_name = profile_name
+        self.region_name = region_name
+        self.calls = []
+        _FakeSession.instances.append(self)
+
+    def client(self, service):
+        return _FakeClient(self, service)
+
+    def get_credentials(self):
+        credentials = type("Credentials", (), {})()
+        if _FakeSession.expiry is not None:
+            credentials._expiry_time = _FakeSession.expiry
+        return credentials
+
+
+@pytest.fixture(autouse=True)
+def fake_boto3(monkeypatch):
+    """Replace boto3 sessions and start every test with empty caches."""
+    _FakeSession.instances = []
+    _FakeSession.sts_error = None
+    _FakeSession.expiry = None
+    monkeypatch.setattr(session_module.boto3, "Session", _FakeSession)
+    for cache in ("_sessions", "_clients", "_verified_until"):
+        monkeypatch.setattr(session_module, cache, {})
+    return _FakeSession
+
+
+def _sts_calls():
+    return sum(session.calls.count("sts") for session in _FakeSession.instances)
+
+
+class TestEksSession:
+    """Test cases for memoized AWS sessions and credential checks."""
+
+    def test_sessions_and_clients_are_memoized(self):
+        """Test that one session and client exist per profile and region."""
+        assert get_session("dev", "us-east-1") is get_session("dev", "us-east-1")
+        assert get_session("dev", "us-east-1") is not get_session("dev", "eu-west-1")
+        assert get_client("ecr", "dev", "us-east-1") is get_client(
+            "ecr", "dev", "us-east-1"
+        )
+        assert len(_FakeSession.instances) == 2
+
+    def test_successful_check_is_cached(self):
+        """Test that credentials are verified through STS only once."""
+        assert verify_credentials("dev") is True
+        assert verify_credentials("dev") is True
+        assert _sts_calls() == 1
+
+        assert verify_credentials("dev", force=True) is True
+        assert _sts_calls() == 2
+
+    def test_failed_check_is_not_cached(self):
+        """Test that failures are re-checked on the next call."""
+        _FakeSession.sts_error = "InvalidClientTokenId"
+        assert verify_credentials("dev") is False
+        assert verify_credentials("dev") is False
+        assert _sts_calls() == 2
+
+    def test_ttl_follows_credential_expiry(self):
+        """Test that the check is not trusted past the credential expiry."""
+        _FakeSession.expiry = datetime.now(timezone.utc) + timedelta(seconds=30)
+        verify_credentials("dev")
+        verify_credentials("dev")
+
+        # expiring within the safety margin, every call re-checks
+        assert _sts_calls() == 2
+
+        _FakeSession.expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+        verify_credentials("dev", force=True)
+        verify_credentials("dev")
+        assert _sts_calls() == 3
+
+    def test_expired_token_rechecks_once(self):
+        """Test that an expired token invalidates the session and retries."""
+        attempts = []
+
+        def _call():
+            attempts.append(get_session("dev"))
+            if len(attempts) == 1:
+                raise _client_error("ExpiredTokenException")
+            return "ok"
+
+        assert call_with_fresh_credentials("dev", _call) == "ok"
+        assert len(attempts) == 2
+        # the retry runs on a new session
+        assert attempts[0] is not attempts[1]
+        assert _sts_calls() == 1
+
+    def test_expired_token_with_invalid_credentials(self):
+        """Test that the original error is raised when the re-check fails."""
+        _FakeSession.sts_error = "ExpiredTokenException"
+
+        def _call():
+            raise _client_error("ExpiredTokenException")
+
+        with pytest.raises(ClientError):
+            call_with_fresh_credentials("dev", _call)
+
+    def test_other_errors_are_not_retried(self):
+        """Test that unrelated errors propagate without a re-check."""
+        attempts = []
+
+        def _call():
+            attempts.append(True)
+            raise _client_error("AccessDenied")
+
+        with pytest.raises(ClientError):
+            call_with_fresh_credentials("dev", _call)
+        assert attempts == [True]
+        assert _sts_calls() == 0
+
+
+@pytest.fixture
+def eks_deploy(monkeypatch):
+    """EKS platform whose AWS, image and helm steps are recorded fakes."""
+    calls = {"lookups": 0, "pushes": []}
+    state = {"pushed": False}
+
+    def _find_image(self, ecr_repo, image_tag, region, profile):
+        calls["lookups"] += 1
+        return BaseResponse(success=True, image_exists=state["pushed"])
+
+    def _push(path, ecr_repo_uri, region, **kwargs):
+        calls["pushes"].append(kwargs)
+        return kwargs["image_tag"]
+
+    monkeypatch.setattr(EKSPlatform, "_find_image", _find_image)
+    monkeypatch.setattr(eks_module, "_build_and_push_image", _push)
+    monkeypatch.setattr(eks_module, "_verify_aws_credentials", lambda profile: True)
+    monkeypatch.setattr(eks_module, "_kube_context_exists", lambda name: True)
+    monkeypatch.setattr(eks_module, "get_public_url", lambda *args: None)
+    monkeypatch.setattr(eks_module.ctx_mgr, "update_platform", lambda **kw: None)
+    provider = EKSPlatform()
+    monkeypatch.setattr(
+        provider.k8s, "deploy", lambda **kwargs: BaseResponse(success=True)
+    )
+
+    def _deploy(pushed, **kwargs):
+        state["pushed"] = pushed
+        context = {
+            "app_name": "demo",
+            "cluster_name": "cluster",
+            "ecr_repo": "demo",
+            "ecr_repo_uri": "123.dkr.ecr/demo",
+            "region": "us-east-1",
+            "version": "1.0.0",
+            "build_fingerprint": "0123456789abcdef",
+        }
+        result = provider.deploy(
+            context=context, path=".", fingerprint="0123456789abcdef", **kwargs
+        )
+        assert result.success is True
+        return calls
+
+    return _deploy
+
+
+class TestEksDeployImage:
+    """Test cases for pushing the app image before an EKS deploy."""
+
+    def test_unchanged_source_checks_ecr(self, eks_deploy):
+        """Test that an unchanged image is still looked up, not pushed."""
+        calls = eks_deploy(pushed=True)
+
+        assert calls["lookups"] == 1
+        assert calls["pushes"] == []
+
+    def test_expired_tag_is_pushed_again(self, eks_deploy):
+        """Test that a tag missing from ECR is pushed despite the fingerprint."""
+        calls = eks_deploy(pushed=False)
+
+        assert len(calls["pushes"]) == 1
+
+    def test_no_cache_rebuilds(self, eks_deploy):
+        """Test that --no-cache rebuilds and pushes even unchanged sources."""
+        calls = eks_deploy(pushed=True, no_cache=True)
+
+        assert calls["lookups"] == 0
+        assert calls["pushes"][0]["no_cache"] is True
@@ -0,0 +1,180 @@
+import threading
+from types import SimpleNamespace as NS
+
+import pytest
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from sfai.platform.providers.eks.platform import EKSPlatform
+from sfai.platform.providers.eks.utils import checks as eks_checks
+from sfai.platform.providers.kubernetes.platform import K8sPlatform
+from sfai.platform.providers.kubernetes.utils import api
+from sfai.platform.providers.kubernetes.utils.api import collect_status, image_tag
+
+
+def _container_status(ready, restarts, image):
+    return NS(ready=ready, restart_count=restarts, image=image)
+
+
+def _pod(name, statuses):
+    return NS(
+        metadata=NS(name=name),
+        status=NS(phase="Running", container_statuses=statuses),
+        spec=NS(node_name="node-1"),
+    )
+
+
+class _FakeCluster:
+    """Stand-in for the Kubernetes API, recording the calling threads."""
+
+    def __init__(self, with_service=True, fail_status=None):
+        self.with_service = with_service
+        self.fail_status = fail_status
+        self.threads = set()
+        self.barrier = threading.Barrier(3, timeout=5)
+
+    def _call(self):
+        self.threads.add(threading.get_ident())
+        # all three requests must be in flight at the same time
+        self.barrier.wait()
+        if self.fail_status:
+            raise ApiException(status=self.fail_status, reason="Unauthorized")
+
+    def list_namespaced_pod(self, namespace, label_selector, **kwargs):
+        self._call()
+        assert label_selector == "app=demo"
+        return NS(
+            items=[
+                _pod("demo-1", [_container_status(True, 2, "repo/demo:1.0.1")]),
+                _pod("demo-2", [_container_status(False, 0, "repo/demo:1.0.1")]),
+            ]
+        )
+
+    def read_namespaced_service(self, name, namespace, **kwargs):
+        self._call()
+        if not self.with_service:
+            raise ApiException(status=404, reason="Not Found")
+        return NS(
+            metadata=NS(name=name),
+            spec=NS(
+                type="LoadBalancer",
+                cluster_ip="10.0.0.1",
+                ports=[NS(port=80, node_port=None, protocol="TCP")],
+            ),
+            status=NS(load_balancer=NS(ingress=[NS(hostname="lb.example", ip=None)])),
+        )
+
+    def read_namespaced_deployment(self, name, namespace, **kwargs):
+        self._call()
+        return NS(
+            metadata=NS(name=name),
+            spec=NS(
+                replicas=2,
+                template=NS(
+                    spec=NS(containers=[NS(image="123.dkr.ecr/repo/demo:1.0.1")])
+                ),
+            ),
+            status=NS(ready_replicas=1, updated_replicas=2, available_replicas=1),
+        )
+
+
+@pytest.fixture
+def fake_cluster(monkeypatch):
+    """Route the Kubernetes API classes to a fake cluster."""
+    cluster = _FakeCluster()
+    monkeypatch.setattr(api, "get_api_client", object)
+    monkeypatch.setattr(client, "CoreV1Api", lambda api_client: cluster)
+    monkeypatch.setattr(client, "AppsV1Api", lambda api_client: cluster)
+    return cluster
+
+
+class TestK8sStatus:
+    """Test cases for API based Kubernetes status collection."""
+
+    def test_collects_structured_status(self, fake_cluster):
+        """Test that deployment, service and pods are summarized."""
+        data = collect_status("demo", "apps")
+
+        assert data["deployment"] == {
+            "name": "demo",
+            "replicas": 2,
+            "ready_replicas": 1,
+            "updated_replicas": 2,
+            "available_replicas": 1,
+            "image": "123.dkr.ecr/repo/demo:1.0.1",
+            "image_tag": "1.0.1",
+        }
+        assert data["service"]["external"] == ["lb.example"]
+        assert data["service"]["ports"] == ["80/TCP"]
+        assert [pod["ready"] for pod in data["pods"]] == ["1/1", "0/1"]
+        assert data["pods"][0]["restarts"] == 2
+
+    def test_requests_run_concurrently(self, fake_cluster):
+        """Test that the three requests are issued in parallel."""
+        collect_status("demo", "apps")
+        assert len(fake_cluster.threads) == 3
+
+    def test_missing_service(self, fake_cluster):
+        """Test that a missing resource is reported as None."""
+        fake_cluster.with_service = False
+        assert collect_status("demo")["service"] is None
+
+    def test_platform_status_response(self, fake_cluster):
+        """Test that the provider returns the structured status."""
+        result = K8sPlatform().status(context={"app_name": "demo"})
+
+        assert result.success is True
+        assert result.deployment["image_tag"] == "1.0.1"
+        assert len(result.pods) == 2
+
+    def test_unauthorized_reloads_client_once(self, fake_cluster, monkeypatch):
+        """Test that rejected credentials reload the client and then fail."""
+        resets = []
+        monkeypatch.setattr(
+            "sfai.platform.providers.kubernetes.platform.reset_api_client",
+            lambda: resets.append(True),
+        )
+        fake_cluster.fail_status = 401
+
+        result = K8sPlatform().status(context={"app_name": "demo"})
+
+        assert result.success is False
+        assert result.status_code == 401
+        assert resets == [True]
+
+    def test_eks_status_skips_sts(self, fake_cluster, monkeypatch):
+        """Test that EKS status does not verify credentials through STS."""
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("STS should not be called")
+
+        monkeypatch.setattr(eks_checks, "_verify_aws_credentials", _fail)
+        monkeypatch.setattr(
+            "sfai.platform.providers.eks.platform._verify_aws_credentials", _fail
+        )
+
+        result = EKSPlatform().status(context={"app_name": "demo"})
+        assert result.success is True
+
+    def test_eks_expired_credentials(self, fake_cluster):
+        """Test that a 401 from the cluster is reported as expired credentials."""
+        fake_cluster.fail_status = 401
+
+        result = EKSPlatform().status(context={"app_name": "demo"})
+
+        assert result.success is False
+        assert "credentials not found or expired" in result.error
+
+    @pytest.mark.parametrize(
+        "image, tag",
+        [
+            ("demo:1.2.3", "1.2.3"),
+            ("registry:5000/team/demo", "latest"),
+            ("registry:5000/team/demo:fp-abc", "fp-abc"),
+            ("demo:1.0@sha256:abcd", "1.0"),
+            (None, None),
+        ],
+    )
+    def test_image_tag(self, image, tag):
+        """Test image tag extraction."""
+        assert image_tag(image) == tag
@@ -0,0 +1,117 @@
+import io
+import sys
+
+import pytest
+
+from sfai.core.response_models import BaseResponse
+from sfai.platform.providers.heroku import platform as heroku_module
+from sfai.platform.providers.kubernetes import platform as k8s_module
+from sfai.platform.providers.local import platform as local_module
+from sfai.platform.streaming import stream_command
+
+
+class TestStreamCommand:
+    """Test cases for line by line command output streaming."""
+
+    def test_streams_lines(self):
+        """Test that stdout and stderr lines are forwarded in order."""
+        output = io.StringIO()
+        code = (
+            "import sys\n"
+            "for i in range(3):\n"
+            "    print(f'line {i}', flush=True)\n"
+            "print('oops', file=sys.stderr)\n"
+        )
+
+        result = stream_command([sys.executable, "-c", code], "logs", output)
+
+        assert result.success is True
+        assert output.getvalue().splitlines() == ["line 0", "line 1", "line 2", "oops"]
+
+    def test_failed_command(self):
+        """Test that a non-zero exit status is reported as an error."""
+        result = stream_command(
+            [sys.executable, "-c", "raise SystemExit(3)"], "logs", io.StringIO()
+        )
+
+        assert result.success is False
+        assert "exit code 3" in result.error
+
+    def test_missing_binary(self):
+        """Test that a missing CLI is reported instead of raising."""
+        result = stream_command(["sfai-no-such-binary"], "logs", io.StringIO())
+
+        assert result.success is False
+        assert "sfai-no-such-binary is not installed" in result.error
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    """Capture the commands the providers would stream."""
+    commands = []
+
+    def _fake_stream(cmd, description, output=None):
+        commands.append(cmd)
+        return BaseResponse(success=True)
+
+    for module in (local_module, k8s_module, heroku_module):
+        monkeypatch.setattr(module, "stream_command", _fake_stream)
+    return commands
+
+
+class TestProviderLogs:
+    """Test cases for the log commands built by each provider."""
+
+    def test_local(self, captured):
+        """Test docker log options."""
+        local_module.LocalPlatform().logs(
+            context={"app_name": "demo"}, follow=True, since="10m", tail=5
+        )
+
+        assert captured[-1] == [
+            "docker",
+            "logs",
+            "--follow",
+            "--since",
+            "10m",
+            "--tail",
+            "5",
+            "demo",
+        ]
+
+    def test_kubernetes_streams_all_pods(self, captured):
+        """Test that every pod of the app is streamed with a pod prefix."""
+        k8s_module.K8sPlatform().logs(
+            context={"app_name": "demo", "namespace": "apps"}, follow=True
+        )
+
+        cmd = captured[-1]
+        assert cmd[:6] == ["kubectl", "logs", "-l", "app=demo", "-n", "apps"]
+        assert "--prefix" in cmd
+        assert "--follow" in cmd
+        assert "--tail=-1" in cmd
+
+    def test_kubernetes_since_and_tail(self, captured):
+        """Test kubectl since and tail options."""
+        k8s_module.K8sPlatform().logs(context={"app_name": "demo"}, since="1h", tail=20)
+
+        cmd = captured[-1]
+        assert "--since=1h" in cmd
+        assert "--tail=20" in cmd
+        assert "--follow" not in cmd
+
+    def test_heroku(self, captured):
+        """Test heroku log options."""
+        heroku_module.HerokuPlatform().logs(
+            context={"heroku_app_name": "demo-app"}, follow=True, tail=100
+        )
+
+        assert captured[-1] == [
+            "heroku",
+            "logs",
+            "--app",
+            "demo-app",
+            "--tail",
+            "--num",
+            "100",
+        ]
@@ -0,0 +1,178 @@
+import json
+import stat
+import time
+
+import pytest
+import requests
+
+from sfai.integrations.mulesoft import core
+from sfai.integrations.mulesoft.core import MulesoftAPI
+
+
+def _client(profile="dev", client_id="client"):
+    return MulesoftAPI(
+        org_id="org",
+        environment_id="env",
+        client_id=client_id,
+        client_secret="secret",
+        profile=profile,
+    )
+
+
+class TestMulesoftClient:
+    """Test cases for the pooled, retrying MuleSoft HTTP client."""
+
+    def test_token_reused_across_clients(self, anypoint, tmp_path):
+        """Test that a profile's token is fetched once and cached on disk."""
+        _client().list_published_apis()
+        _client().list_published_apis()
+
+        assert anypoint.tokens_issued == 1
+        token_file = tmp_path / "tokens" / "dev.json"
+        assert stat.S_IMODE(token_file.stat().st_mode) == 0o600
+        assert json.loads(token_file.read_text())["access_token"] == "token-1"
+
+    def test_token_not_shared(self, anypoint):
+        """Test that profiles and connected apps get their own tokens."""
+        _client(profile="dev")
+        _client(profile="prod")
+        _client(profile="dev", client_id="other")
+        _client(profile=None)
+
+        assert anypoint.tokens_issued == 4
+
+    def test_expired_token_is_refetched(self, anypoint, tmp_path):
+        """Test that a cached token is not used past its expiry."""
+        _client()
+        token_file = tmp_path / "tokens" / "dev.json"
+        cached = json.loads(token_file.read_text())
+        cached["expires_at"] = time.time() + 10
+        token_file.write_text(json.dumps(cached))
+
+        _client()
+        assert anypoint.tokens_issued == 2
+
+    def test_unauthorized_refreshes_token(self, anypoint):
+        """Test that a revoked token is refreshed and the call retried once."""
+        client = _client()
+        anypoint.valid_tokens.clear()
+
+        assert client.get_exchange_asset("demo")["path"].endswith("/demo/asset")
+        assert anypoint.tokens_issued == 2
+        assert len(anypoint.api_calls()) == 2
+
+    def test_transient_errors_are_retried(self, anypoint):
+        """Test that 503 and 429 answers are retried, even for POST."""
+        client = _client()
+        path = "/apimanager/api/v1/organizations/org/environments/env/apis"
+        anypoint.failures[path] = [503, 429]
+
+        client._make_api_call(path.lstrip("/"), "post", body={})
+        assert anypoint.api_calls() == [("POST", path)] * 3
+
+    def test_gateway_errors_not_repeated_for_post(self, anypoint):
+        """Test that a 502 is not replayed for non-idempotent requests."""
+        client = _client()
+        path = "/apimanager/api/v1/organizations/org/environments/env/apis"
+        anypoint.failures[path] = [502]
+
+        with pytest.raises(requests.HTTPError):
+            client._make_api_call(path.lstrip("/"), "post", body={})
+
+        anypoint.failures[path] = [502, 504]
+        assert client.list_published_apis()["path"] == path
+
+    def test_connections_are_pooled(self, anypoint):
+        """Test that clients share keep-alive connections."""
+        for _ in range(3):
+            _client().list_published_apis()
+
+        assert len(anypoint.connections) == 1
+
+
+APIS = "/apimanager/api/v1/organizations/org/environments/env/apis"
+
+
+def _listing(instances, name="weather"):
+    def route(method, query, body):
+        if method == "POST":
+            return {"id": 99, **body}
+        assets = [
+            {"assetId": "other", "apis": [{"id": 1}]},
+            {"assetId": name, "exchangeAssetName": name, "apis": instances},
+        ]
+        if "assetId" in query:
+            assets = [a for a in assets if a["assetId"] in query["assetId"]]
+        return {"assets": assets}
+
+    return route
+
+
+class TestFindExistingApi:
+    """Test cases for looking up an existing API instance."""
+
+    def test_filters_by_asset(self, anypoint):
+        """Test that the listing is filtered by asset server side."""
+        anypoint.routes[APIS] = _listing([])
+
+        assert _client()._find_existing_api("weather", "weather") is None
+        assert anypoint.api_calls() == [("GET", f"{APIS}?assetId=weather")]
+
+    def test_proxy_uri_in_listing(self, anypoint):
+        """Test that listed proxy URIs are matched without extra lookups."""
+        instances = [
+            {"id": i, "endpoint": {"proxyUri": f"http://localhost:8081/api-{i}"}}
+            for i in range(20)
+        ]
+        anypoint.routes[APIS] = _listing(instances)
+        anypoint.routes[f"{APIS}/7"] = {"id": 7, "status": "active"}
+
+        api = _client()._find_existing_api("weather", "api-7")
+
+        assert api == {"id": 7, "status": "active"}
+        assert len(anypoint.api_calls()) == 2
+
+    def test_details_fetched_concurrently(self, anypoint):
+        """Test that instances without a proxy URI are fetched in parallel."""
+        anypoint.routes[APIS] = _listing([{"id": i} for i in range(12)])
+        for i in range(12):
+            anypoint.routes[f"{APIS}/{i}"] = {
+                "id": i,
+                "endpoint": {"proxyUri": f"http://localhost:8081/api-{i}"},
+            }
+        anypoint.delay = 0.05
+
+        api = _client()._find_existing_api("weather", "api-11")
+
+        assert api["id"] == 11
+        assert len(anypoint.api_calls()) == 13
+        assert 1 < anypoint.max_in_flight <= core.MAX_LOOKUP_WORKERS
+
+    def test_lookup_is_memoized(self, anypoint):
+        """Test that one client looks each API up once, including misses."""
+        anypoint.routes[APIS] = _listing([{"id": 1}])
+        anypoint.routes[f"{APIS}/1"] = {
+            "id": 1,
+            "endpoint": {"proxyUri": "http://localhost:8081/weather"},
+        }
+        client = _client()
+
+        client._find_existing_api("weather", "weather")
+        client._find_existing_api("weather", "weather")
+        client._find_existing_api("weather", "forecast")
+        client._find_existing_api("weather", "forecast")
+
+        assert len(anypoint.api_calls()) == 3
+
+    def test_publish_remembers_created_api(self, anypoint):
+        """Test that a created API is found without asking Anypoint again."""
+        anypoint.routes[APIS] = _listing([])
+        client = _client()
+
+        created = client.publish_api(
+            "weather", "1.0.0", "http://impl", "http://gateway", "weather"
+        )
+
+        assert created["id"] == 99
+        assert client._find_existing_api("weather", "weather") == created
+        assert [method for method, _ in anypoint.api_calls()] == ["GET", "POST"]
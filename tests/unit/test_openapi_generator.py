@@ -0,0 +1,463 @@
+import inspect
+import json
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import yaml
+
+import agentforce_sample_app
+from sfai.core.agentforce import generator
+from sfai.core.agentforce.generator import (
+    SchemaInliner,
+    custom_openapi,
+    remove_inline_refs,
+)
+from sfai.core.response_models import BaseResponse
+from sfai.integrations.mulesoft import agentforce_utils, spec_extraction
+from sfai.integrations.mulesoft.agentforce_utils import (
+    _NoAliasDumper,
+    app_source_hash,
+    detect_agentforce_usage,
+    find_agentforce_usages,
+    generate_openapi_from_app,
+    validate_generated_openapi,
+    write_openapi_spec,
+)
+
+# spec extraction writes to the OpenAPI cache
+pytestmark = pytest.mark.usefixtures("openapi_cache")
+
+REF = "#/components/schemas/"
+
+
+def _ref(name):
+    return {"$ref": REF + name}
+
+
+SCHEMAS = {
+    "Address": {
+        "type": "object",
+        "title": "Address",
+        "properties": {"city": {"type": "string"}},
+    },
+    "Person": {
+        "type": "object",
+        "title": "Person",
+        "properties": {
+            "home": _ref("Address"),
+            "work": {"anyOf": [_ref("Address"), {"type": "null"}]},
+        },
+    },
+}
+
+
+class TestSchemaInliner:
+    """Test cases for inlining $ref pointers in the OpenAPI generator."""
+
+    def test_inlines_nested_references(self):
+        """Test that references are replaced by the schemas they point to."""
+        result = remove_inline_refs(_ref("Person"), SCHEMAS)
+
+        assert result["title"] == "Person"
+        assert result["properties"]["home"] == SCHEMAS["Address"]
+        assert result["properties"]["work"]["anyOf"][0] == SCHEMAS["Address"]
+        assert "$ref" not in repr(result)
+
+    def test_components_resolved_once(self):
+        """Test that a component is expanded once however often it is used."""
+        visits = []
+
+        class CountingSchemas(dict):
+            def __getitem__(self, name):
+                visits.append(name)
+                return super().__getitem__(name)
+
+        inliner = SchemaInliner(CountingSchemas(SCHEMAS))
+        for _ in range(5):
+            inliner.inline(_ref("Person"))
+            inliner.inline({"type": "array", "items": _ref("Address")})
+
+        assert sorted(visits) == ["Address", "Person"]
+
+    def test_results_can_be_changed(self):
+        """Test that changing a result's schema and properties stays local."""
+        inliner = SchemaInliner(SCHEMAS)
+        first = inliner.inline(_ref("Person"))
+        first.pop("title")
+        first["properties"]["home"]["description"] = "Home of the action"
+
+        second = inliner.inline(_ref("Person"))
+        assert second["title"] == "Person"
+        assert "description" not in second["properties"]["home"]
+        assert "description" not in SCHEMAS["Address"]
+
+    def test_recursive_schema_is_bounded(self):
+        """Test that a self-referencing model expands a bounded number of times."""
+        schemas = {
+            "Node": {
+                "type": "object",
+                "properties": {
+                    "children": {"type": "array", "items": _ref("Node")},
+                },
+            }
+        }
+
+        result = remove_inline_refs(_ref("Node"), schemas)
+
+        child = result["properties"]["children"]["items"]
+        grandchild = child["properties"]["children"]["items"]
+        assert grandchild == {
+            "type": "object",
+            "description": "Recursive reference to Node",
+        }
+
+    def test_mutually_recursive_schemas(self):
+        """Test that cycles through several models are cut as well."""
+        schemas = {
+            "Employee": {"properties": {"team": _ref("Team")}},
+            "Team": {"properties": {"lead": _ref("Employee")}},
+        }
+        inliner = SchemaInliner(schemas)
+
+        team = inliner.inline(_ref("Team"))
+        employee = inliner.inline(_ref("Employee"))
+
+        assert "Recursive reference to Team" in repr(team)
+        # expansions cut short are not reused from another starting point
+        assert employee["properties"]["team"]["properties"]["lead"]["properties"]
+
+    def test_deep_nesting_without_recursion(self):
+        """Test that nesting deeper than the recursion limit is inlined."""
+        depth = sys.getrecursionlimit() * 2
+        schemas = {f"Level{i}": {"items": _ref(f"Level{i + 1}")} for i in range(depth)}
+        schemas[f"Level{depth}"] = {"type": "string"}
+
+        result = SchemaInliner(schemas).inline(_ref("Level0"))
+
+        for _ in range(depth):
+            result = result["items"]
+        assert result == {"type": "string"}
+
+    def test_shared_components_dump_without_aliases(self):
+        """Test that the generated YAML repeats shared schemas in full."""
+        inliner = SchemaInliner(SCHEMAS)
+        spec = {name: inliner.inline(_ref("Person")) for name in ("a", "b")}
+
+        text = yaml.dump(spec, Dumper=_NoAliasDumper)
+        assert "&id" not in text
+        assert text.count("city") == 4
+
+
+GOLDEN = Path(__file__).parent / "golden" / "agentforce_openapi.yaml"
+
+
+@pytest.fixture
+def sample_app():
+    """The AgentForce sample app with no cached spec."""
+    agentforce_sample_app.app.openapi_schema = None
+    yield agentforce_sample_app.app
+    agentforce_sample_app.app.openapi_schema = None
+
+
+class TestCustomOpenapi:
+    """Test cases for the AgentForce OpenAPI generator."""
+
+    def test_matches_golden_spec(self, sample_app):
+        """Test the generated spec against the reviewed golden file."""
+        spec = custom_openapi(sample_app)
+
+        assert json.loads(json.dumps(spec)) == yaml.safe_load(GOLDEN.read_text())
+
+    def test_signature_read_once_per_endpoint(self, sample_app, monkeypatch):
+        """Test that endpoint signatures are inspected once, not per operation."""
+        endpoint = agentforce_sample_app.rename_team
+        sample_app.add_api_route("/teams/{team_id}/copy", endpoint, methods=["POST"])
+        calls = []
+
+        def counting_signature(fn):
+            calls.append(fn)
+            return inspect.signature(fn)
+
+        monkeypatch.setattr(
+            generator, "inspect", SimpleNamespace(signature=counting_signature)
+        )
+        try:
+            spec = custom_openapi(sample_app)
+        finally:
+            sample_app.router.routes.pop()
+
+        assert "/teams/{team_id}/copy" in spec["paths"]
+        assert calls.count(endpoint) == 1
+        assert len(calls) == len(set(calls))
+
+
+APP_SOURCE = """
+from fastapi import FastAPI
+from sfai.core.agentforce.generator import agentforce_action
+from helpers import greeting
+
+app = FastAPI(title="Greeter")
+
+
+@app.get("/hello")
+@agentforce_action
+def hello() -> str:
+    return greeting()
+"""
+
+
+@pytest.fixture
+def greeter(tmp_path):
+    """An AgentForce app importing a local helper module."""
+    (tmp_path / "app.py").write_text(APP_SOURCE)
+    (tmp_path / "helpers.py").write_text("def greeting():\n    return 'hi'\n")
+    (tmp_path / "README.md").write_text("not imported")
+    return tmp_path
+
+
+class TestSpecRegeneration:
+    """Test cases for regenerating openapi.yaml only when the app changed."""
+
+    def test_unchanged_app_is_not_regenerated(self, greeter, monkeypatch):
+        """Test that an up to date spec is kept without importing the app."""
+        app_file = str(greeter / "app.py")
+        assert generate_openapi_from_app(app_file).data["regenerated"]
+        assert (greeter / "openapi.yaml.source-hash").exists()
+
+        monkeypatch.setattr(agentforce_utils, "extract_openapi", None)
+        result = generate_openapi_from_app(app_file)
+
+        assert result.success
+        assert not result.data["regenerated"]
+
+    def test_local_imports_are_hashed(self, greeter):
+        """Test that changing an imported local module invalidates the spec."""
+        app_file = str(greeter / "app.py")
+        before = app_source_hash(app_file)
+
+        (greeter / "README.md").write_text("changed")
+        assert app_source_hash(app_file) == before
+
+        (greeter / "helpers.py").write_text("def greeting():\n    return 'hey'\n")
+        assert app_source_hash(app_file) != before
+
+    def test_changed_app_is_regenerated(self, greeter):
+        """Test that a new route shows up in the regenerated spec."""
+        app_file = str(greeter / "app.py")
+        generate_openapi_from_app(app_file)
+        with open(app_file, "a") as f:
+            f.write('\n\n@app.get("/bye")\n@agentforce_action\ndef bye() -> str:\n')
+            f.write('    return "bye"\n')
+
+        result = generate_openapi_from_app(app_file)
+
+        assert result.data["regenerated"]
+        assert "/bye" in yaml.safe_load((greeter / "openapi.yaml").read_text())["paths"]
+
+
+class TestSpecExtraction:
+    """Test cases for extracting the OpenAPI schema in a child process."""
+
+    def test_app_is_imported_in_a_subprocess(self, greeter):
+        """Test that the app sees the extraction flag and this process doesn't."""
+        app_file = greeter / "app.py"
+        app_file.write_text(
+            "from sfai.core.agentforce import is_spec_extraction\n"
+            "if not is_spec_extraction():\n"
+            "    raise RuntimeError('loading model weights')\n" + APP_SOURCE
+        )
+
+        result = generate_openapi_from_app(str(app_file))
+
+        assert result.success, result.error
+        assert (
+            "/hello" in yaml.safe_load((greeter / "openapi.yaml").read_text())["paths"]
+        )
+        assert not os.environ.get("SFAI_SPEC_EXTRACTION")
+
+    def test_cached_schema_is_not_reimported(self, greeter, openapi_cache, monkeypatch):
+        """Test that a schema extracted once is reused for the same sources."""
+        app_file = str(greeter / "app.py")
+        generate_openapi_from_app(app_file)
+        (greeter / "openapi.yaml").unlink()
+        assert [f.suffix for f in openapi_cache.iterdir()] == [".json"]
+
+        monkeypatch.setattr(spec_extraction, "_run_extraction", None)
+        result = generate_openapi_from_app(app_file)
+
+        assert result.success
+        assert (greeter / "openapi.yaml").exists()
+
+    def test_cache_is_keyed_by_generator_versions(self, openapi_cache, monkeypatch):
+        """Test that upgrading sfai or FastAPI doesn't reuse cached schemas."""
+        monkeypatch.setattr(spec_extraction, "_run_extraction", _fake_extraction)
+        extract = spec_extraction.extract_openapi
+
+        monkeypatch.setattr(spec_extraction, "_generator_versions", lambda: "old")
+        assert not extract("app.py", "hash").data["cached"]
+        assert extract("app.py", "hash").data["cached"]
+
+        monkeypatch.setattr(spec_extraction, "_generator_versions", lambda: "new")
+        assert not extract("app.py", "hash").data["cached"]
+        assert sorted(f.name for f in openapi_cache.iterdir()) == [
+            "hash-new.json",
+            "hash-old.json",
+        ]
+
+    def test_import_failure_is_reported(self, greeter, openapi_cache):
+        """Test that a failing import is reported and nothing is cached."""
+        app_file = greeter / "app.py"
+        app_file.write_text("raise RuntimeError('no database')\n" + APP_SOURCE)
+
+        result = generate_openapi_from_app(str(app_file))
+
+        assert not result.success
+        assert "Could not import FastAPI app" in result.error
+        assert list(openapi_cache.iterdir()) == []
+        assert not (greeter / "openapi.yaml").exists()
+
+
+def _fake_extraction(app_file, output_file):
+    Path(output_file).write_text('{"openapi": "3.1.0"}')
+    return BaseResponse(success=True)
+
+
+class TestSpecOutput:
+    """Test cases for writing generated specs as YAML or JSON."""
+
+    def test_json_output(self, greeter):
+        """Test that the JSON spec holds the same document as the YAML one."""
+        app_file = str(greeter / "app.py")
+
+        yaml_result = generate_openapi_from_app(app_file)
+        json_result = generate_openapi_from_app(app_file, spec_format="json")
+
+        assert json_result.data["openapi_file"].endswith("openapi.json")
+        assert json_result.data["regenerated"]
+        spec = json.loads((greeter / "openapi.json").read_text())
+        assert spec == yaml.safe_load(
+            Path(yaml_result.data["openapi_file"]).read_text()
+        )
+        assert validate_generated_openapi(str(greeter / "openapi.json")).success
+
+    def test_unsupported_format(self, greeter):
+        """Test that only YAML and JSON are written."""
+        result = generate_openapi_from_app(str(greeter / "app.py"), spec_format="xml")
+
+        assert not result.success
+        assert "Unsupported spec format xml" in result.error
+
+    def test_shared_subtrees_written_in_full(self, tmp_path):
+        """Test that shared schemas are written out instead of aliased."""
+        shared = {"type": "string", "description": "Name of the person"}
+        spec = {"paths": {"/a": {"schema": shared}, "/b": {"schema": shared}}}
+        output_file = tmp_path / "openapi.yaml"
+
+        write_openapi_spec(spec, str(output_file))
+
+        assert "&id" not in output_file.read_text()
+        assert yaml.safe_load(output_file.read_text()) == spec
+
+
+class TestAgentForceDetection:
+    """Test cases for finding AgentForce usages without importing the app."""
+
+    def test_usages_with_routes(self):
+        """Test that decorated routes and metadata are reported by location."""
+        usages = find_agentforce_usages(agentforce_sample_app.__file__)
+
+        actions = [usage for usage in usages if usage["kind"] == "action"]
+        assert [(usage["function"], usage["route"]) for usage in actions] == [
+            ("forecast", "POST /forecast"),
+            ("add_person", "POST /people"),
+            ("city", "GET /cities/{name}"),
+        ]
+        metadata = [usage for usage in usages if usage["kind"] == "metadata"]
+        assert {usage["function"] for usage in metadata} == {
+            "forecast",
+            "city",
+            "rename_team",
+        }
+
+    def test_mentions_are_not_usages(self, tmp_path):
+        """Test that comments, strings and unused imports don't count."""
+        app_file = tmp_path / "app.py"
+        app_file.write_text(
+            "from fastapi import FastAPI\n"
+            "from sfai.core.agentforce import agentforce_action\n"
+            "# TODO: add @agentforce_action\n"
+            'NOTE = "AgentForceMetadata"\n'
+            "app = FastAPI()\n"
+        )
+
+        assert not detect_agentforce_usage(str(app_file))
+
+    def test_routers_in_local_modules(self, tmp_path):
+        """Test that actions on a router in an imported module are found."""
+        (tmp_path / "api").mkdir()
+        (tmp_path / "api" / "__init__.py").write_text("")
+        (tmp_path / "api" / "routes.py").write_text(
+            "from fastapi import APIRouter\n"
+            "import sfai.core.agentforce as af\n"
+            "router = APIRouter()\n"
+            '@router.post("/orders")\n'
+            "@af.agentforce_action(is_pii=True)\n"
+            "def create_order():\n"
+            "    pass\n"
+        )
+        app_file = tmp_path / "app.py"
+        app_file.write_text(
+            "from fastapi import FastAPI\n"
+            "from api.routes import router\n"
+            "app = FastAPI()\n"
+            "app.include_router(router)\n"
+        )
+
+        assert find_agentforce_usages(str(app_file)) == [
+            {
+                "file": "api/routes.py",
+                "line": 5,
+                "kind": "action",
+                "function": "create_order",
+                "route": "POST /orders",
+            }
+        ]
+
+    def test_parsed_once_per_change(self, greeter, monkeypatch):
+        """Test that unchanged modules are not parsed again."""
+        parsed = []
+        parse = agentforce_utils._agentforce_usages
+        monkeypatch.setattr(
+            agentforce_utils,
+            "_agentforce_usages",
+            lambda tree: parsed.append(tree) or parse(tree),
+        )
+        app_file = greeter / "app.py"
+
+        assert detect_agentforce_usage(str(app_file))
+        app_source_hash(str(app_file))
+        assert detect_agentforce_usage(str(app_file))
+        assert len(parsed) == 2
+
+        app_file.write_text(APP_SOURCE.replace("@agentforce_action\n", ""))
+        assert not detect_agentforce_usage(str(app_file))
+        assert len(parsed) == 3
+
+    def test_unparsable_module_falls_back_to_text(self, tmp_path):
+        """Test that a module with a syntax error is searched as text."""
+        app_file = tmp_path / "app.py"
+        app_file.write_text(
+            "from sfai.core.agentforce import agentforce_action\n"
+            "@agentforce_action\n"
+            "def broken(:\n"
+        )
+
+        usages = find_agentforce_usages(str(app_file))
+
+        assert [(usage["line"], usage["kind"]) for usage in usages] == [
+            (1, "text"),
+            (2, "text"),
+        ]
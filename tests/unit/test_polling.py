@@ -0,0 +1,182 @@
+import asyncio
+
+import pytest
+
+from sfai.core.polling import (
+    PollTimeoutError,
+    backoff_intervals,
+    poll,
+    poll_async,
+)
+from sfai.integrations.mulesoft.core import MulesoftAPI
+
+
+class _FakeClock:
+    """Clock advanced only by the fake sleep."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _states(*values):
+    states = list(values)
+    return lambda: states.pop(0) if len(states) > 1 else states[0]
+
+
+class TestPoll:
+    """Test cases for the deadline-bounded poller."""
+
+    def test_returns_without_sleeping(self):
+        """Test that a finished operation is returned right away."""
+        clock = _FakeClock()
+        result = poll(
+            lambda: "done", lambda r: r == "done", sleep=clock.sleep, clock=clock
+        )
+
+        assert result == "done"
+        assert clock.sleeps == []
+
+    def test_backoff_grows_to_maximum(self):
+        """Test that intervals grow exponentially and are capped."""
+        clock = _FakeClock()
+        poll(
+            _states(*["running"] * 6, "done"),
+            lambda r: r == "done",
+            initial_interval=0.25,
+            max_interval=2,
+            sleep=clock.sleep,
+            clock=clock,
+        )
+
+        expected = [0.25, 0.5, 1, 2, 2, 2]
+        assert clock.sleeps == pytest.approx(expected, rel=0.11)
+
+    def test_deadline(self):
+        """Test that a hanging operation raises a structured timeout."""
+        clock = _FakeClock()
+        with pytest.raises(PollTimeoutError) as error:
+            poll(
+                lambda: {"status": "running"},
+                lambda r: r["status"] != "running",
+                description="publication",
+                timeout=10,
+                sleep=clock.sleep,
+                clock=clock,
+            )
+
+        assert isinstance(error.value, TimeoutError)
+        assert error.value.last_result == {"status": "running"}
+        assert error.value.attempts == len(clock.sleeps) + 1
+        assert error.value.elapsed == pytest.approx(10)
+        assert "publication" in str(error.value)
+        # the last sleep is cut short to end on the deadline
+        assert sum(clock.sleeps) == pytest.approx(10)
+
+    def test_jitter_bounds(self):
+        """Test that jitter stays within the requested fraction."""
+        intervals = backoff_intervals(initial=1, maximum=1, jitter=0.2)
+        values = [next(intervals) for _ in range(200)]
+
+        assert all(0.8 <= value <= 1.2 for value in values)
+        assert len(set(values)) > 1
+
+    def test_async_with_coroutine(self):
+        """Test polling a coroutine function from an event loop."""
+        states = ["running", "running", "done"]
+
+        async def check():
+            return states.pop(0)
+
+        result = asyncio.run(
+            poll_async(check, lambda r: r == "done", initial_interval=0.001)
+        )
+        assert result == "done"
+
+    def test_async_runs_blocking_checks_in_threads(self):
+        """Test that plain functions do not block the event loop."""
+        ticks = []
+
+        async def ticker():
+            for _ in range(3):
+                ticks.append(True)
+                await asyncio.sleep(0)
+
+        async def main():
+            task = asyncio.create_task(ticker())
+            result = await poll_async(
+                _states("running", "done"),
+                lambda r: r == "done",
+                initial_interval=0.001,
+            )
+            await task
+            return result
+
+        assert asyncio.run(main()) == "done"
+        assert len(ticks) == 3
+
+    def test_async_deadline(self):
+        """Test that the async poller raises the same timeout error."""
+        with pytest.raises(PollTimeoutError):
+            asyncio.run(
+                poll_async(
+                    lambda: "running",
+                    lambda r: r == "done",
+                    timeout=0.05,
+                    initial_interval=0.01,
+                )
+            )
+
+
+class TestMulesoftPolling:
+    """Test cases for the MuleSoft status polling."""
+
+    def test_publication_status(self, anypoint, tmp_path):
+        """Test that publication polls until it is no longer running."""
+        statuses = ["running", "running", "completed"]
+        status_path = "/exchange/api/v2/publications/1"
+        anypoint.routes[
+            "/exchange/api/v2/organizations/org/assets/org/weather/1.0.0"
+        ] = {"publicationStatusLink": f"{MulesoftAPI.base_url}{status_path}"}
+        anypoint.routes[status_path] = lambda *args: {"status": statuses.pop(0)}
+        oas_file = tmp_path / "openapi.yaml"
+        oas_file.write_text("openapi: 3.0.0\n")
+
+        client = MulesoftAPI("org", "env", "client", "secret")
+        result = client.publish_exchange_asset("weather", "1.0.0", str(oas_file))
+
+        assert result == {"status": "completed"}
+        assert statuses == []
+
+    def test_publication_timeout(self, anypoint, tmp_path):
+        """Test that a hanging publication raises instead of looping forever."""
+        status_path = "/exchange/api/v2/publications/1"
+        anypoint.routes[
+            "/exchange/api/v2/organizations/org/assets/org/weather/1.0.0"
+        ] = {"publicationStatusLink": f"{MulesoftAPI.base_url}{status_path}"}
+        anypoint.routes[status_path] = {"status": "running"}
+        oas_file = tmp_path / "openapi.yaml"
+        oas_file.write_text("openapi: 3.0.0\n")
+
+        client = MulesoftAPI("org", "env", "client", "secret")
+        with pytest.raises(PollTimeoutError):
+            client.publish_exchange_asset(
+                "weather", "1.0.0", str(oas_file), timeout=0.3
+            )
+
+    def test_wait_for_deployment(self, anypoint):
+        """Test that deployment polling waits for the API to become active."""
+        statuses = ["unregistered", "active"]
+        anypoint.routes[
+            "/apimanager/api/v1/organizations/org/environments/env/apis/7"
+        ] = lambda *args: {"id": 7, "status": statuses.pop(0)}
+
+        client = MulesoftAPI("org", "env", "client", "secret")
+        assert client.wait_for_deployment(7)["status"] == "active"
@@ -0,0 +1,378 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from sfai.context.manager import ContextManager, clear_context_cache
+from sfai.integrations.mulesoft import publish as publish_module
+from sfai.integrations.mulesoft.core import MulesoftAPI
+from sfai.integrations.mulesoft.pipeline import (
+    Stage,
+    StageError,
+    run_stages,
+    run_stages_async,
+)
+from sfai.integrations.mulesoft.publish import MuleSoftIntegration
+
+# spec extraction writes to the OpenAPI cache
+pytestmark = pytest.mark.usefixtures("openapi_cache")
+
+
+def _sleeper(seconds, value=None):
+    def run(results):
+        time.sleep(seconds)
+        return value
+
+    return run
+
+
+def _fail(results):
+    raise StageError("boom")
+
+
+class TestPipeline:
+    """Test cases for the publish stage pipeline."""
+
+    def test_independent_stages_overlap(self):
+        """Test that stages without dependencies run at the same time."""
+        result = run_stages([Stage("a", _sleeper(0.2)), Stage("b", _sleeper(0.2))])
+
+        assert result.success
+        assert result.elapsed < 0.35
+        assert result.timings["b"]["start"] < result.timings["a"]["duration"]
+
+    def test_dependencies_run_in_order(self):
+        """Test that a stage sees the results of the stages it runs after."""
+        seen = {}
+
+        def last(results):
+            seen.update(results)
+            return results["first"] + results["second"]
+
+        result = run_stages(
+            [
+                Stage("last", last, after=["first", "second"]),
+                Stage("first", _sleeper(0.05, 1)),
+                Stage("second", _sleeper(0, 2), after=["first"]),
+            ]
+        )
+
+        assert result.results["last"] == 3
+        assert seen == {"first": 1, "second": 2}
+        assert result.timings["second"]["start"] >= result.timings["first"]["duration"]
+
+    def test_failure_skips_dependents_only(self):
+        """Test that independent stages still finish when one stage fails."""
+        result = run_stages(
+            [
+                Stage("upload", _sleeper(0.1, "uploaded")),
+                Stage("lookup", _fail),
+                Stage("create", _sleeper(0), after=["upload", "lookup"]),
+            ]
+        )
+
+        assert not result.success
+        assert result.failed_stage == "lookup"
+        assert str(result.error) == "boom"
+        assert result.results == {"upload": "uploaded"}
+        assert result.skipped == ["create"]
+
+    def test_stage_cancelled_before_it_ran(self):
+        """Test that a stage cancelled while waiting is reported without timings."""
+
+        async def cancel_next(results):
+            for task in asyncio.all_tasks():
+                if task.get_name() == "stage:next":
+                    task.cancel()
+            return "done"
+
+        result = asyncio.run(
+            run_stages_async(
+                [
+                    Stage("first", cancel_next),
+                    Stage("next", _sleeper(0), after=["first"]),
+                    Stage("last", _sleeper(0), after=["next"]),
+                ]
+            )
+        )
+
+        assert result.failed_stage == "next"
+        assert isinstance(result.error, asyncio.CancelledError)
+        assert result.results == {"first": "done"}
+        assert list(result.timings) == ["first"]
+        assert result.skipped == ["last"]
+
+    def test_coroutine_stages(self):
+        """Test that coroutine functions are awaited on the event loop."""
+        loop_threads = []
+
+        async def stage(results):
+            loop_threads.append(threading.current_thread())
+            await asyncio.sleep(0)
+            return "done"
+
+        result = asyncio.run(run_stages_async([Stage("a", stage)]))
+
+        assert result.results == {"a": "done"}
+        assert loop_threads == [threading.main_thread()]
+
+    @pytest.mark.parametrize(
+        "stages",
+        [
+            [Stage("a", _fail, after=["missing"])],
+            [Stage("a", _fail, after=["b"]), Stage("b", _fail, after=["a"])],
+            [Stage("a", _fail), Stage("a", _fail)],
+        ],
+    )
+    def test_invalid_graph(self, stages):
+        """Test that unknown, cyclic and duplicate stages are rejected."""
+        with pytest.raises(ValueError):
+            run_stages(stages)
+
+    def test_inside_running_loop(self):
+        """Test that the pipeline can be started from async code."""
+
+        async def main():
+            return run_stages([Stage("a", _sleeper(0, "done"))])
+
+        assert asyncio.run(main()).results == {"a": "done"}
+
+
+class _FakeContextManager:
+    def __init__(self):
+        self.updates = []
+
+    def list_service_profiles(self, service):
+        return ["dev"]
+
+    def get_service_profile(self, service, name):
+        return {"org_id": "org"}
+
+    def transaction(self):
+        return _NullTransaction()
+
+    def update_platform(self, platform, values, environment=None):
+        self.updates.append(values["mulesoft"])
+
+
+class _NullTransaction:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class _SlowClient(MulesoftAPI):
+    """MuleSoft client whose calls each take a fixed time."""
+
+    def __init__(self, delay, fail_lookup=False):
+        self.delay = delay
+        self.fail_lookup = fail_lookup
+        self.auth_error = None
+        self.published = []
+        self.uploaded = []
+
+    def publish_exchange_asset(self, **kwargs):
+        time.sleep(self.delay)
+        self.uploaded.append(kwargs["version"])
+        return {"status": "completed"}
+
+    def _find_existing_api(self, name, endpoint_path):
+        time.sleep(self.delay)
+        if self.fail_lookup:
+            raise RuntimeError("lookup failed")
+        return {"id": 7}
+
+    def list_deployments(self, api_id):
+        time.sleep(self.delay)
+        return []
+
+    def publish_api(self, **kwargs):
+        time.sleep(self.delay)
+        self.published.append(kwargs["name"])
+        return {"id": 7}
+
+    def deploy_api(self, **kwargs):
+        time.sleep(self.delay)
+        return {"id": 1}
+
+
+@pytest.fixture
+def publish_env(monkeypatch, tmp_path):
+    ctx_mgr = _FakeContextManager()
+    monkeypatch.setattr(publish_module, "ctx_mgr", ctx_mgr)
+    oas_file = tmp_path / "openapi.yaml"
+    oas_file.write_text("openapi: 3.0.0\n")
+
+    def publish(client, mulesoft=None, **kwargs):
+        monkeypatch.setattr(
+            publish_module, "_get_mulesoft_client", lambda profile: client
+        )
+        ctx = {"app_name": "weather", "active_platform": "local"}
+        if mulesoft:
+            ctx["mulesoft"] = mulesoft
+        return MuleSoftIntegration().publish(
+            ctx=ctx,
+            oas_file=str(oas_file),
+            implementation_uri="http://impl",
+            endpoint_uri="http://gateway",
+            gateway_id="gw",
+            gateway_version="1.0",
+            **kwargs,
+        )
+
+    return ctx_mgr, publish
+
+
+class TestPublishPipeline:
+    """Test cases for publishing to MuleSoft through the stage pipeline."""
+
+    def test_lookups_overlap_upload(self, publish_env):
+        """Test that the API lookups run while the asset is uploaded."""
+        ctx_mgr, publish = publish_env
+
+        result = publish(_SlowClient(delay=0.1))
+
+        assert result.success
+        assert result.api_id == 7
+        timings = result.stage_timings
+        exchange = timings["exchange"]
+        assert timings["find_api"]["start"] < exchange["start"] + exchange["duration"]
+        api = timings["api"]
+        assert timings["deployments"]["start"] < api["start"] + api["duration"]
+        # three calls long instead of five
+        assert result.elapsed < 0.45
+        assert [list(update) for update in ctx_mgr.updates] == [
+            ["profile", "asset"],
+            ["profile", "api"],
+        ]
+
+    def test_published_asset_kept_on_failure(self, publish_env):
+        """Test that a failed lookup still records the uploaded asset."""
+        ctx_mgr, publish = publish_env
+
+        result = publish(_SlowClient(delay=0, fail_lookup=True))
+
+        assert not result.success
+        assert result.error == "Failed to publish API: lookup failed"
+        assert result.failed_stage == "find_api"
+        assert "exchange" in result.stage_timings
+        assert [list(update) for update in ctx_mgr.updates] == [["profile", "asset"]]
+
+    def test_unchanged_spec_is_not_uploaded(self, publish_env):
+        """Test that an unchanged spec reuses the last published version."""
+        ctx_mgr, publish = publish_env
+        client = _SlowClient(delay=0)
+        first = publish(client)
+        asset = ctx_mgr.updates[0]["asset"]
+
+        result = publish(client, mulesoft={"profile": "dev", "asset": asset})
+
+        assert first.success and result.success
+        assert result.asset_unchanged
+        assert client.uploaded == ["1.0.0"]
+        assert ctx_mgr.updates[-2]["asset"] == asset
+
+    @pytest.mark.parametrize(
+        "kwargs, uploaded",
+        [
+            ({"force_upload": True}, "1.0.1"),
+            ({"description": "Weather forecasts"}, "1.0.1"),
+            ({"version": "2.0.0"}, "2.0.0"),
+        ],
+    )
+    def test_changed_asset_is_uploaded(self, publish_env, kwargs, uploaded):
+        """Test that forcing or changing the asset uploads a new version."""
+        ctx_mgr, publish = publish_env
+        client = _SlowClient(delay=0)
+        publish(client)
+        asset = ctx_mgr.updates[0]["asset"]
+
+        result = publish(client, mulesoft={"profile": "dev", "asset": asset}, **kwargs)
+
+        assert result.success
+        assert not result.asset_unchanged
+        assert client.uploaded == ["1.0.0", uploaded]
+
+
+@pytest.fixture
+def registry(monkeypatch, tmp_path):
+    """Global registry and MuleSoft profile in a temporary home directory."""
+    clear_context_cache()
+    mgr = ContextManager()
+    mgr.global_context_file = tmp_path / "home" / "apps.json"
+    mgr.apps_db_file = tmp_path / "home" / "apps.db"
+    mgr.add_service_profile("mulesoft", "dev", {"org_id": "org"})
+    monkeypatch.setattr(publish_module, "ctx_mgr", mgr)
+
+    def add_app(name, **mulesoft):
+        path = tmp_path / name
+        (path / "openapi.yaml").parent.mkdir()
+        (path / "openapi.yaml").write_text("openapi: 3.0.0\n")
+        api = {
+            "implementation_uri": f"http://{name}",
+            "endpoint_uri": "http://gateway",
+            "gateway_id": "gw",
+            "gateway_version": "1.0",
+        }
+        ContextManager(str(path)).update_platform(
+            "local", {"mulesoft": {"api": api, **mulesoft}}, app_name=name
+        )
+        mgr.register_app(name, str(path))
+        return path
+
+    yield add_app
+    clear_context_cache()
+
+
+class TestPublishAll:
+    """Test cases for publishing every registered app."""
+
+    def test_publishes_registered_apps(self, registry, monkeypatch):
+        """Test that apps are published concurrently with one client per profile."""
+        paths = [registry(f"app-{i}") for i in range(4)]
+        client = _SlowClient(delay=0.05)
+        created = []
+
+        def get_client(profile):
+            created.append(profile)
+            return client
+
+        monkeypatch.setattr(publish_module, "_get_mulesoft_client", get_client)
+        start = time.monotonic()
+        result = MuleSoftIntegration().publish_all(concurrency=4)
+
+        assert result.success
+        assert result.message == "Published 4 of 4 apps"
+        assert created == ["dev"]
+        assert sorted(client.published) == [f"app-{i}" for i in range(4)]
+        # five sequential calls per app, the apps overlap
+        assert time.monotonic() - start < 4 * 5 * 0.05
+        for path in paths:
+            context = ContextManager(str(path)).read_context()
+            assert context["mulesoft"]["api"]["api_id"] == 7
+            assert context["mulesoft"]["asset"]["oas_file"] == "openapi.yaml"
+
+    def test_reports_each_app(self, registry, monkeypatch):
+        """Test that failing and unknown apps are listed without stopping others."""
+        registry("good")
+        registry("broken", profile="missing")
+        monkeypatch.setattr(
+            publish_module,
+            "_get_mulesoft_client",
+            lambda profile: (
+                _SlowClient(delay=0)
+                if profile == "dev"
+                else {"success": False, "message": "Missing MuleSoft configuration"}
+            ),
+        )
+
+        result = MuleSoftIntegration().publish_all(apps=["good", "broken", "gone"])
+
+        assert not result.success
+        by_app = {app["app_name"]: app for app in result.results}
+        assert by_app["good"]["success"]
+        assert by_app["broken"]["error"] == "Missing MuleSoft configuration"
+        assert by_app["gone"]["error"] == "App 'gone' is not registered"
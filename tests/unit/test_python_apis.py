@@ -1,10 +1,10 @@
 import os
 import tempfile
 import yaml
+import pytest
 
 from pathlib import Path
 
-
 # Import the APIs to test
 from sfai.app import init as app_init
 from sfai.app import get_context, delete_context, publish
@@ -647,6 +647,7 @@ class TestPlatformEnvironmentIntegration:
             assert "No app context found" in result.error
 
 
+@pytest.mark.usefixtures("openapi_cache")
 class TestOpenAPIAutoGeneration:
     """Test cases for OpenAPI auto-generation feature."""
 
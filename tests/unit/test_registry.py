@@ -0,0 +1,97 @@
+import subprocess
+import sys
+
+import pytest
+
+from sfai.core.base import BasePlatform
+from sfai.core.registry import LazyRegistry
+from sfai.platform.registry import PLATFORM_REGISTRY, available_platforms
+
+
+class TestLazyPlatformRegistry:
+    """Test cases for on-demand platform provider loading."""
+
+    def test_available_platforms_lists_entry_points(self):
+        """Test that the bundled providers are listed by name."""
+        names = available_platforms()
+        for name in ["eks", "heroku", "local", "minikube"]:
+            assert name in names
+
+    def test_listing_does_not_import_providers(self):
+        """Test that listing platforms never imports provider modules."""
+        code = (
+            "import sys\n"
+            "from sfai.platform.registry import available_platforms\n"
+            "assert 'local' in available_platforms()\n"
+            "heavy = [m for m in ('boto3', 'botocore', 'kubernetes') "
+            "if m in sys.modules]\n"
+            "assert not heavy, heavy\n"
+            "assert not any(m.startswith('sfai.platform.providers') "
+            "for m in sys.modules)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=False
+        )
+        assert result.returncode == 0, result.stderr
+
+    def test_lookup_loads_only_requested_provider(self):
+        """Test that looking up one provider does not import the others."""
+        code = (
+            "import sys\n"
+            "from sfai.platform.registry import PLATFORM_REGISTRY\n"
+            "provider = PLATFORM_REGISTRY.get('local')\n"
+            "assert type(provider).__name__ == 'LocalPlatform'\n"
+            "assert PLATFORM_REGISTRY.is_loaded('local')\n"
+            "assert not PLATFORM_REGISTRY.is_loaded('eks')\n"
+            "assert 'boto3' not in sys.modules\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=False
+        )
+        assert result.returncode == 0, result.stderr
+
+    def test_lookup_returns_cached_instance(self):
+        """Test that a provider is instantiated once per process."""
+        first = PLATFORM_REGISTRY.get("local")
+        assert isinstance(first, BasePlatform)
+        assert PLATFORM_REGISTRY.get("local") is first
+        assert PLATFORM_REGISTRY["local"] is first
+
+    def test_unknown_platform(self):
+        """Test that unknown platforms behave like missing dictionary keys."""
+        assert PLATFORM_REGISTRY.get("does-not-exist") is None
+        assert "does-not-exist" not in PLATFORM_REGISTRY
+
+    def test_invalid_plugin_is_skipped(self, capsys):
+        """Test that plugins not inheriting from the base class are rejected."""
+        registry = LazyRegistry(
+            "sfai.platforms", kind="platform", base_cls=BasePlatform
+        )
+        registry._entry_points = {"broken": _FakeEntryPoint("broken", object)}
+
+        assert registry.get("broken") is None
+        assert "must inherit from BasePlatform" in capsys.readouterr().out
+        # the failure is remembered and not reported twice
+        assert registry.get("broken") is None
+        assert capsys.readouterr().out == ""
+
+    def test_failed_plugin_is_not_contained(self, capsys):
+        """Test that a plugin that failed to load is reported as missing."""
+        registry = LazyRegistry(
+            "sfai.platforms", kind="platform", base_cls=BasePlatform
+        )
+        registry._entry_points = {"broken": _FakeEntryPoint("broken", object)}
+
+        assert "broken" in registry
+        with pytest.raises(KeyError):
+            registry["broken"]
+        assert "broken" not in registry
+
+
+class _FakeEntryPoint:
+    def __init__(self, name, cls):
+        self.name = name
+        self._cls = cls
+
+    def load(self):
+        return self._cls